@@ -3,30 +3,37 @@ eventlet.monkey_patch()
 import os
 import re
 import uuid
+import json
 import logging
 import unicodedata
+from io import BytesIO
+from itertools import chain, islice
 from threading import Lock
-from flask import Flask, render_template, request, send_file, jsonify, abort
+from urllib.parse import urlparse
+from flask import Flask, Response, render_template, request, send_file, jsonify, abort, session, stream_with_context
 from werkzeug.utils import secure_filename
-from deep_translator import GoogleTranslator
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room
 from config import Config
+from eventlet.greenpool import GreenPool
+from csv_engine import infer_columns, iter_windows, unique_cells, apply_translations
+from translation_memory import TranslationMemory
+from translation_executor import AdaptiveController, TranslationExecutor, ordered_imap
+from translation_providers import ProviderStats, create_provider, provider_options, max_request_chars
+from job_queue import JobScheduler
+from message_queue import message_queue_options
+from checkpoint import TranslationCheckpoint, file_fingerprint
+from text_pipeline import ParagraphReader, iter_aligned_chunks, iter_chunks
+from srt_engine import SubtitleDocument
+from segment_index import SegmentIndex
+from batch_translate import translate_each, translate_unique
+from progress import ProgressReporter, owner_room
+from content_store import ContentStore, link_or_copy
+from file_index import FileIndex, UPLOAD, CHECKPOINT, OUTPUT
+from revision_store import RevisionStore, segment_hash
+from metrics import MetricsRegistry, StageTimer
+from zip_stream import iter_zip
+from handlers import HandlerRegistry
 import csv
-from PyPDF2 import PdfReader, PdfWriter
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from io import BytesIO
-from pdfminer.high_level import extract_pages
-from pdfminer.layout import LTTextBox, LTChar, LTAnno
-from reportlab.lib.colors import red, black
-import glob
-from nltk.tokenize import sent_tokenize
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, Frame
-import nltk
-# nltk.download('punkt_tab')
 
 # Flask 애플리케이션 초기화 및 설정
 app = Flask(__name__)
@@ -34,25 +41,135 @@ app.config.from_object(Config)
 logging.basicConfig(filename='logs/app.log', level=logging.INFO,
                     format='%(asctime)s %(levelname)s: %(message)s')
 
-app.config['SESSION_COOKIE_SECURE'] = True  # HTTPS 사용 시
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 
-# SocketIO 초기화
-socketio = SocketIO(app, async_mode='eventlet')
+# SocketIO 초기화 (메시지 큐를 설정하면 작업 프로세스가 보낸 이벤트도 전달)
+socketio = SocketIO(app, async_mode='eventlet', **message_queue_options(app.config['MESSAGE_QUEUE']))
 thread_lock = Lock()
 
 # 설정 값 불러오기
 UPLOAD_FOLDER = app.config['UPLOAD_FOLDER']
 PROCESSED_FOLDER = app.config['PROCESSED_FOLDER']
+CHECKPOINT_FOLDER = app.config['CHECKPOINT_FOLDER']
 ALLOWED_EXTENSIONS = app.config['ALLOWED_EXTENSIONS']
-MAX_CHARS = app.config['MAX_CHARS']
-KOREAN_FONT_PATH = app.config['KOREAN_FONT_PATH']
-JAPANESE_FONT_PATH = app.config['JAPANESE_FONT_PATH']
-DEFAULT_FONT_PATH = app.config['DEFAULT_FONT_PATH']
+TRANSLATION_PROVIDER = app.config['TRANSLATION_PROVIDER']
+PROVIDER_OPTIONS = provider_options(TRANSLATION_PROVIDER, app.config)
+# 한 번의 번역 요청 크기는 제공자의 요청당 글자 수 제한을 넘지 않도록 맞춤
+MAX_CHARS = min(app.config['MAX_CHARS'], max_request_chars(TRANSLATION_PROVIDER, PROVIDER_OPTIONS))
+PDF_PAGES_PER_TASK = app.config['PDF_PAGES_PER_TASK']
+JOB_RUNNER = app.config['JOB_RUNNER']
+CSV_WINDOW_ROWS = app.config['CSV_WINDOW_ROWS']
+CSV_SAMPLE_ROWS = app.config['CSV_SAMPLE_ROWS']
 
 # 필요한 폴더 생성
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(PROCESSED_FOLDER, exist_ok=True)
+os.makedirs(CHECKPOINT_FOLDER, exist_ok=True)
+
+# 업로드 원본과 번역 결과를 내용 해시로 한 번만 보관하는 저장소
+content_store = ContentStore(app.config['BLOB_FOLDER'], app.config['CONTENT_STORE_DB_PATH'])
+
+# file_id별 업로드/체크포인트/결과 파일 색인 (삭제, 다운로드, 정리를 폴더 검색 없이 처리)
+file_index = FileIndex(app.config['FILE_INDEX_DB_PATH'])
+
+# 파일별 구간 번역문 (새 판을 이전 판의 수정본으로 번역할 때 바뀌지 않은 구간을 재사용)
+revision_store = RevisionStore(app.config['REVISION_DB_PATH'])
+
+# 웹 페이지 번역용 HTTP 세션 (연결을 재사용하고 호스트별 연결 수를 제한, 처음 URL을 번역할 때 만듦)
+_web_session = None
+
+def get_web_session():
+    global _web_session
+    from webToPdf import create_session
+    with thread_lock:
+        if _web_session is None:
+            _web_session = create_session(app.config['WEB_FETCH_PER_HOST'])
+    return _web_session
+
+# 모든 파일 처리기가 공유하는 번역 메모리
+translation_memory = TranslationMemory(
+    app.config['TRANSLATION_MEMORY_PATH'],
+    max_bytes=app.config['TRANSLATION_MEMORY_MAX_BYTES'],
+    max_age=app.config['TRANSLATION_MEMORY_MAX_AGE'],
+    lru_size=app.config['TRANSLATION_MEMORY_LRU_SIZE'],
+)
+
+# 번역 요청을 동시에 실행하는 실행기 (제공자별 속도 제한 공유)
+# 요청마다 마감 시간을 두고, 자동 조정을 켜면 요청 크기 조정, 느린 요청 헤지, 실패한 요청 분할 재시도를 함께 사용
+TRANSLATION_ADAPTIVE = app.config['TRANSLATION_ADAPTIVE']
+translation_executor = TranslationExecutor(
+    app.config['TRANSLATION_CONCURRENCY'],
+    rate_limits={TRANSLATION_PROVIDER: (app.config['TRANSLATION_RATE_LIMIT'], app.config['TRANSLATION_RATE_BURST'])},
+    max_retries=app.config['TRANSLATION_MAX_RETRIES'],
+    base_delay=app.config['TRANSLATION_RETRY_BASE_DELAY'],
+    max_delay=app.config['TRANSLATION_RETRY_MAX_DELAY'],
+    provider=TRANSLATION_PROVIDER,
+    call_timeout=app.config['TRANSLATION_CALL_TIMEOUT'] or None,
+    controller=AdaptiveController(app.config['TRANSLATION_TARGET_LATENCY'],
+                                  app.config['TRANSLATION_MIN_CHARS']) if TRANSLATION_ADAPTIVE else None,
+    hedge=TRANSLATION_ADAPTIVE,
+    split_failed=TRANSLATION_ADAPTIVE,
+)
+
+# 처리 단계, 번역 요청, 작업 큐, Socket.IO 전송 지표 (/metrics에서 Prometheus 형식으로 제공)
+metrics_registry = MetricsRegistry()
+stage_seconds = metrics_registry.histogram(
+    'translation_stage_seconds', 'Time spent in each processing stage per job.',
+    ('stage', 'file_type', 'target_language'))
+translator_request_seconds = metrics_registry.histogram(
+    'translator_request_seconds', 'Latency of translation provider requests.', ('provider',))
+translator_requests = metrics_registry.counter(
+    'translator_requests_total', 'Translation provider requests.', ('provider', 'outcome'))
+translator_chars = metrics_registry.counter(
+    'translator_chars_total', 'Characters sent to the translation provider.', ('provider',))
+socketio_emits = metrics_registry.counter(
+    'socketio_emits_total', 'Socket.IO events emitted.', ('event',))
+
+def record_translator_request(chars, latency, failed):
+    translator_request_seconds.observe(latency, provider=TRANSLATION_PROVIDER)
+    translator_requests.inc(provider=TRANSLATION_PROVIDER, outcome='error' if failed else 'ok')
+    translator_chars.inc(chars, provider=TRANSLATION_PROVIDER)
+
+# 설정된 번역 제공자의 요청 통계 (요청 수, 글자 수, 지연 시간)
+provider_stats = ProviderStats(on_record=record_translator_request)
+
+def create_translator(target_language):
+    # 설정(TRANSLATION_PROVIDER)으로 선택한 번역 제공자를 대상 언어에 맞게 생성
+    return create_provider(TRANSLATION_PROVIDER, target_language, stats=provider_stats, **PROVIDER_OPTIONS)
+
+def segment_memory(file_id, filename, target_language, revision_of=None, options=None):
+    # 이 파일의 구간 번역문을 기록하고 (revision_of가 있으면) 이전 판에서 바뀌지 않은 구간의 번역문을 재사용하는 번역 메모리
+    # (업로드 기록이 없는 파일은 번역 메모리만 사용, options는 처리기 버전에 포함할 처리기 설정)
+    memory = translation_memory.bind(TRANSLATION_PROVIDER, target_language)
+    content_hash = content_store.content_hash(file_id)
+    if not content_hash:
+        return memory
+    previous_hash = content_store.content_hash(revision_of) if revision_of else None
+    return revision_store.bind(content_hash, previous_hash, handler_version(filename, options), target_language,
+                               memory)
+
+def log_revision(memory, filename, target_language):
+    if getattr(memory, 'previous_hash', None):
+        logging.info(f"Revision {filename} ({target_language}): reused {memory.reused} unchanged segments "
+                     f"from the previous version")
+
+def emit_to_room(event, data, room):
+    socketio_emits.inc(event=event)
+    socketio.emit(event, data, to=room)
+
+def emit_progress(event, data, room):
+    emit_to_room(event, data, room)
+    if JOB_RUNNER == 'worker':
+        # 웹 프로세스와 작업 프로세스가 진행 상황을 나눠 보내므로 재접속 시 조회할 수 있도록 마지막 상태를 저장
+        job_scheduler.save_progress(data['job_id'], progress_reporter.state(data['job_id']))
+
+# 진행 상황은 작업 소유자의 방으로만 전송하고 작업별 초당 전송 횟수를 제한
+progress_reporter = ProgressReporter(
+    emit_progress,
+    eventlet.spawn_after,
+    app.config['PROGRESS_UPDATES_PER_SECOND'],
+    include_timings=app.config['PROGRESS_STAGE_TIMINGS'],
+)
 
 # 지원하는 언어 목록
 LANGUAGES = {
@@ -100,6 +217,8 @@ def allowed_file(filename):
 def index():
     # 허용된 파일 확장자 목록 생성
     allowed_extensions = ','.join(['.' + ext for ext in app.config['ALLOWED_EXTENSIONS']])
+    # Socket.IO 연결보다 먼저 세션 쿠키에 작업 소유자 ID를 발급
+    get_owner_id()
     return render_template('index.html', languages=LANGUAGES, allowed_extensions=allowed_extensions)
 
 @app.route('/upload', methods=['POST'])
@@ -116,7 +235,9 @@ def upload_file():
             filename = sanitize_filename(file.filename)
             file_id = str(uuid.uuid4())
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{file_id}_{filename}")
-            file.save(filepath)
+            # 해시를 계산하며 저장하고 같은 내용이 이미 있으면 그 파일에 연결
+            content_store.save_upload(file.stream, file_id, filename, filepath)
+            file_index.add(file_id, UPLOAD, filepath)
             uploaded_files.append({'id': file_id, 'name': filename})
         else:
             return jsonify({'error': f'Disallowed file type: {file.filename}'}), 400
@@ -127,12 +248,12 @@ def upload_file():
 def delete_file(file_id):
     # 파일 삭제 처리
     try:
-        deleted_files = []
-        for folder in [UPLOAD_FOLDER, PROCESSED_FOLDER]:
-            pattern = os.path.join(folder, f"{file_id}*")
-            for file_path in glob.glob(pattern):
-                os.remove(file_path)
-                deleted_files.append(os.path.basename(file_path))
+        # 색인에 기록된 업로드, 체크포인트, 결과 파일을 삭제
+        deleted_files = file_index.remove(file_id)
+        # 다른 업로드가 참조하지 않는 원본 내용과 그 구간 번역문도 삭제
+        released_hash = content_store.release(file_id)
+        if released_hash:
+            revision_store.remove(released_hash)
 
         if deleted_files:
             logging.info(f"Deleted files: {', '.join(deleted_files)}")
@@ -146,19 +267,60 @@ def delete_file(file_id):
 def delete_file_route(file_id):
     return delete_file(file_id)
 
+def requested_languages(data):
+    # 여러 대상 언어(target_languages)를 한 작업으로 번역 (이전 형식인 target_language 하나도 허용)
+    target_languages = data.get('target_languages') or [data.get('target_language')]
+    return list(dict.fromkeys(language for language in target_languages if language))
+
+def unsupported_language(target_languages):
+    # 지원하지 않는 언어가 있으면 오류 응답을 반환
+    for target_language in target_languages:
+        if target_language not in LANGUAGES:
+            return jsonify({'error': f'Unsupported language. Please choose one of the supported languages: {", ".join(LANGUAGES.keys())}'}), 400
+    return None
+
+def unknown_revision(revision_of, name):
+    # 이전 판으로 지정한 파일이 없으면 오류 응답을 반환
+    if revision_of is None:
+        return None
+    if not isinstance(revision_of, str) or not content_store.content_hash(revision_of):
+        return jsonify({'error': f'Previous version not found for {name}.'}), 404
+    return None
+
+def submit_translation(owner, file_id, filename, filepath, target_languages, options, jobs, reused):
+    # 같은 파일을 같은 언어로 이미 번역했다면 그 언어는 작업 없이 바로 결과를 반환 (reused에 추가)
+    # 남은 언어들은 원본을 한 번만 읽고 분할하는 하나의 작업으로 처리 (jobs에 추가, 언어 목록은 쉼표로 구분해 저장)
+    file_index.touch(file_id)
+    pending_languages = []
+    for target_language in target_languages:
+        translated_filename = reuse_artifact(file_id, filename, target_language, options)
+        if translated_filename:
+            reused.append({'file_id': file_id, 'target_language': target_language, 'percentage': 100,
+                           'status': 'Translation complete!', 'download_filename': translated_filename})
+        else:
+            pending_languages.append(target_language)
+    if not pending_languages:
+        return
+
+    job = job_scheduler.submit(owner, file_id, filename, filepath, ','.join(pending_languages),
+                               json.dumps(options) if options else None)
+    jobs.append({'id': job['id'], 'file_id': file_id, 'target_languages': pending_languages})
+    progress_reporter.job(job).update(0, 'Queued')
+
 @app.route('/start_translation', methods=['POST'])
 def start_translation():
     # 번역 시작 처리
     data = request.json
     files = data.get('files', [])
-    target_language = data.get('target_language')
+    target_languages = requested_languages(data)
 
-    if not files or not target_language:
+    if not files or not target_languages:
         return jsonify({'error': 'Files or target language missing.'}), 400
 
     # 지원하는 언어인지 확인
-    if target_language not in LANGUAGES:
-        return jsonify({'error': f'Unsupported language. Please choose one of the supported languages: {", ".join(LANGUAGES.keys())}'}), 400
+    error = unsupported_language(target_languages)
+    if error:
+        return error
 
     for file in files:
         file_id = file['id']
@@ -166,380 +328,636 @@ def start_translation():
         filepath = os.path.join(UPLOAD_FOLDER, f"{file_id}_{filename}")
         if not os.path.exists(filepath):
             return jsonify({'error': f'File not found: {filename}'}), 404
-
+        # CSV는 번역할 열 번호 목록(columns)을 지정할 수 있음 (없으면 열 종류를 추론하여 선택)
+        columns = file.get('columns')
+        if columns is not None and not (isinstance(columns, list) and
+                                        all(isinstance(column, int) and column >= 0 for column in columns)):
+            return jsonify({'error': f'Invalid columns for {filename}.'}), 400
+        # 이전 판의 수정본이면 이전 판의 file_id(revision_of)를 지정 (바뀌지 않은 구간은 이전 판의 번역문을 재사용)
+        error = unknown_revision(file.get('revision_of'), filename)
+        if error:
+            return error
+
+    owner = get_owner_id()
+    jobs = []
+    reused = []
     for file in files:
         file_id = file['id']
         filename = file['name']
         filepath = os.path.join(UPLOAD_FOLDER, f"{file_id}_{filename}")
-        socketio.start_background_task(target=process_file, filepath=filepath, filename=filename, target_language=target_language, file_id=file_id)
+        options = {}
+        if file.get('columns') is not None:
+            options['columns'] = sorted(set(file['columns']))
+        if file.get('revision_of'):
+            options['revision_of'] = file['revision_of']
+        submit_translation(owner, file_id, filename, filepath, target_languages, options or None, jobs, reused)
+
+    return jsonify({'message': 'Translation started.', 'jobs': jobs, 'reused': reused}), 200
+
+@app.route('/translate_url', methods=['POST'])
+def translate_url():
+    # 웹 페이지 번역: 페이지를 가져와 업로드 파일(.html)로 저장하고 번역 작업을 시작
+    # (본문 블록을 바로 번역하여 PDF로 한 번만 렌더링하므로 PDF로 저장해 올리는 것보다 빠르고 레이아웃이 보존됨)
+    data = request.json
+    url = (data.get('url') or '').strip()
+    target_languages = requested_languages(data)
 
-    return jsonify({'message': 'Translation started.'}), 200
+    if not url or not target_languages:
+        return jsonify({'error': 'URL or target language missing.'}), 400
+    if urlparse(url).scheme not in ('http', 'https') or not urlparse(url).netloc:
+        return jsonify({'error': 'Only http(s) URLs can be translated.'}), 400
 
-def split_text(text, max_length):
-    # 텍스트를 최대 길이에 맞춰 분할
-    parts = []
-    current_part = ""
+    error = unsupported_language(target_languages) or unknown_revision(data.get('revision_of'), url)
+    if error:
+        return error
 
-    for paragraph in text.split('\n\n'):
-        if len(current_part) + len(paragraph) + 2 < max_length:
-            current_part += paragraph + '\n\n'
-        else:
-            if current_part:
-                parts.append(current_part.strip())
-            current_part = paragraph + '\n\n'
+    from webToPdf import UnsafeUrlError, fetch, page_name
+    try:
+        html, _ = fetch(get_web_session(), url, max_bytes=app.config['WEB_FETCH_MAX_BYTES'])
+    except UnsafeUrlError as e:
+        logging.warning(f"Rejected URL {url}: {e}")
+        return jsonify({'error': f'This URL cannot be translated: {e}'}), 400
+    except Exception as e:
+        logging.error(f"Could not fetch {url}: {e}")
+        return jsonify({'error': f'Could not fetch the page: {e}'}), 502
+
+    file_id = str(uuid.uuid4())
+    filename = sanitize_filename(f'{page_name(url)}.html')
+    filepath = os.path.join(UPLOAD_FOLDER, f"{file_id}_{filename}")
+    # 같은 내용의 페이지는 업로드와 같이 한 번만 보관하고 이전 번역 결과를 재사용
+    content_store.save_upload(BytesIO(html.encode('utf-8')), file_id, filename, filepath)
+    file_index.add(file_id, UPLOAD, filepath)
+
+    jobs = []
+    reused = []
+    options = {'url': url}
+    if data.get('revision_of'):
+        options['revision_of'] = data['revision_of']
+    submit_translation(get_owner_id(), file_id, filename, filepath, target_languages, options, jobs, reused)
+    return jsonify({'message': 'Translation started.', 'file': {'id': file_id, 'name': filename},
+                    'jobs': jobs, 'reused': reused}), 200
+
+@app.route('/csv_columns/<file_id>', methods=['GET'])
+def csv_columns(file_id):
+    # 업로드한 CSV의 열 목록과 표본으로 추론한 열 종류 (번역할 열 선택용)
+    entry = file_index.get(file_id, UPLOAD)
+    if not entry or not entry['name'].lower().endswith('.csv') or not os.path.isfile(entry['path']):
+        return jsonify({'error': 'CSV file not found.'}), 404
+    try:
+        with open(entry['path'], 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            sample = list(islice(reader, CSV_SAMPLE_ROWS))
+    except (UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': f'Could not read CSV file: {e}'}), 400
+    return jsonify({'columns': infer_columns(header, sample), 'sample_rows': len(sample)}), 200
+
+def get_owner_id():
+    # 작업 소유자 식별: 서버가 발급하여 서명된 세션 쿠키에 저장한 임의의 ID (클라이언트가 다른 소유자로 바꿀 수 없음)
+    if 'owner_id' not in session:
+        session['owner_id'] = uuid.uuid4().hex
+        session.permanent = True
+    return session['owner_id']
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    # 접속한 브라우저를 자신의 작업 진행 상황만 받는 방에 참여시킴
+    # (소유자 ID는 페이지를 열 때 발급한 세션 쿠키에서 가져오며 쿠키가 없으면 연결을 거부)
+    if 'owner_id' not in session:
+        return False
+    join_room(owner_room(session['owner_id']))
+
+def job_response(job):
+    # 응답에서 서버 경로를 빼고 가장 최근 진행 상황을 포함
+    job.pop('filepath', None)
+    if JOB_RUNNER == 'worker':
+        job['progress'] = job_scheduler.saved_progress(job)
+    else:
+        job['progress'] = progress_reporter.state(job['id'])
+    job.pop('heartbeat_at', None)
+    return job
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    # 재접속한 클라이언트가 자신의 작업 상태를 다시 가져올 때 사용
+    jobs = job_scheduler.list_jobs(get_owner_id())
+    return jsonify({'jobs': [job_response(job) for job in jobs]}), 200
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_scheduler.get(job_id)
+    # 다른 소유자의 작업은 없는 작업처럼 응답
+    if not job or job['owner'] != get_owner_id():
+        return jsonify({'error': 'Job not found.'}), 404
+    return jsonify(job_response(job)), 200
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_scheduler.get(job_id)
+    # 작업을 시작한 소유자만 취소할 수 있음
+    if not job or job['owner'] != get_owner_id():
+        return jsonify({'error': 'Job not found.'}), 404
+    if not job_scheduler.cancel(job_id):
+        return jsonify({'success': False, 'message': f"Job is already {job['status']}."}), 409
+    progress_reporter.job(job).finish(0, 'Cancelled')
+    return jsonify({'success': True, 'message': 'Job cancelled.'}), 200
+
+def translate_languages(progress, target_languages, translate_language, error_status):
+    # 대상 언어별 번역(translate_language(target_language, language_progress))을 동시에 실행
+    # 한 언어가 실패해도 나머지 언어는 계속 진행하며 ({언어: 결과 파일 이름}, {언어: 오류 메시지})를 반환
+    # (언어별 translate, render, write 단계 시간은 language_progress.stage()로 언어별로 측정)
+    outputs = {}
+    errors = {}
+
+    def run(target_language):
+        language_progress = progress.language(target_language)
+        try:
+            outputs[target_language] = translate_language(target_language, language_progress)
+        except Exception as e:
+            logging.error(f"Translation to {target_language} failed: {e}")
+            errors[target_language] = str(e)
+            language_progress.finish(0, error_status.format(e))
+
+    pool = GreenPool(len(target_languages))
+    try:
+        for target_language in target_languages:
+            pool.spawn(run, target_language)
+        pool.waitall()
+    except BaseException:
+        # 작업이 취소되면 언어별 번역도 함께 중단
+        for thread in list(pool.coroutines_running):
+            thread.kill()
+        raise
+    return outputs, errors
+
+def process_csv_file(filepath, filename, target_languages, file_id, progress, columns=None, revision_of=None):
+    # 행을 CSV_WINDOW_ROWS개씩 읽어 번역하고 바로 기록 (파일 크기와 관계없이 메모리 사용량 일정)
+    # columns: 번역할 열 번호 목록 (None이면 표본으로 추론한 텍스트 열)
+    # revision_of: 이전 판의 file_id (바뀌지 않은 셀은 이전 판의 번역문을 사용)
+    base_filename = os.path.splitext(filename)[0]
+    translated_filenames = {
+        target_language: sanitize_filename(f'{base_filename}_{file_id}_{target_language}.csv')
+        for target_language in target_languages
+    }
+    partial_filepaths = {target_language: os.path.join(PROCESSED_FOLDER, translated_filename) + '.partial'
+                         for target_language, translated_filename in translated_filenames.items()}
+    # 이전 판의 구간은 같은 열 설정으로 번역한 결과만 재사용 (추론한 열이 아니라 작업에 저장된 설정을 키로 사용)
+    options = {'columns': columns}
+    files = {}
+
+    try:
+        total_bytes = max(os.path.getsize(filepath), 1)
+        with open(filepath, 'r', encoding='utf-8', newline='') as source:
+            reader = csv.reader(source)
+            with progress.stage('read'):
+                header = next(reader, None)
+                if header is None:
+                    raise ValueError('CSV file is empty.')
+                sample = list(islice(reader, CSV_SAMPLE_ROWS))
+
+            # 표본으로 열 종류를 추론하고 번역할 열을 정함 (숫자, 날짜, URL, 코드 셀은 번역하지 않음)
+            if columns is None:
+                columns = [column['index'] for column in infer_columns(header, sample) if column['translatable']]
+            progress.update(10, f'Translating {len(columns)} of {len(header)} columns...')
+            eventlet.sleep(0)
 
-    if current_part:
-        parts.append(current_part.strip())
+            translators = {target_language: create_translator(target_language)
+                           for target_language in target_languages}
+            memories = {target_language: segment_memory(file_id, filename, target_language, revision_of, options)
+                        for target_language in target_languages}
+            writers = {}
+            for target_language, partial_filepath in partial_filepaths.items():
+                files[target_language] = open(partial_filepath, 'w', encoding='utf-8', newline='')
+                writers[target_language] = csv.writer(files[target_language])
+
+            # 머리글과 표본 행부터 이어서 창 단위로 처리 (고유 셀은 창마다 한 번 모아 모든 언어가 공유)
+            active_languages = list(target_languages)
+            errors = {}
+            rows_done = 0
+            windows = iter_windows(chain([header], sample, reader), CSV_WINDOW_ROWS)
+            for rows in progress.timed_iter('read', windows):
+                # 첫 창의 첫 행은 머리글 (머리글은 번역하지 않는 열의 이름도 번역)
+                header_window = not rows_done
+                with progress.stage('split'):
+                    cells = unique_cells(rows, columns, header_window)
+
+                def translate_window(target_language, language_progress):
+                    with language_progress.stage('translate'):
+                        translations = translate_unique(translators[target_language], cells, MAX_CHARS,
+                                                        None, memories[target_language], translation_executor)
+                    with language_progress.stage('write'):
+                        translated_rows = apply_translations(rows, translations, columns, header_window)
+                        writers[target_language].writerows(translated_rows)
+
+                _, window_errors = translate_languages(progress, active_languages, translate_window,
+                                                       'Error occurred: {}')
+                # 실패한 언어는 이후 창에서 제외하고 나머지 언어는 계속 진행
+                errors.update(window_errors)
+                active_languages = [language for language in active_languages if language not in errors]
+                if not active_languages:
+                    break
+
+                rows_done += len(rows)
+                percentage = int((source.buffer.tell() / total_bytes) * 80) + 10  # 10% ~ 90%
+                for target_language in active_languages:
+                    progress.language(target_language).update(percentage, f'Translated {rows_done} rows...')
+                eventlet.sleep(0)
 
-    return parts
+        outputs = {}
+        for target_language in active_languages:
+            files.pop(target_language).close()
+            translated_filename = translated_filenames[target_language]
+            translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+            os.replace(partial_filepaths[target_language], translated_filepath)
+            logging.info(f"Translated CSV file saved: {translated_filepath} ({rows_done} rows, columns {columns})")
+            log_revision(memories[target_language], filename, target_language)
+            progress.language(target_language).finish(100, 'Translation complete!', download_filename=translated_filename)
+            outputs[target_language] = translated_filename
+        logging.info(f"Translation memory stats: {translation_memory.stats()}")
+        return outputs, errors
 
-def process_csv_file(filepath, filename, target_language, file_id):
+    except Exception as e:
+        logging.error(f"CSV file processing error ({filename}): {e}")
+        progress.finish(0, f'Error occurred: {str(e)}')
+        raise
+    finally:
+        # 실패하거나 중단된 언어의 기록 중이던 결과 파일 삭제
+        for f in files.values():
+            f.close()
+        for partial_filepath in partial_filepaths.values():
+            if os.path.exists(partial_filepath):
+                os.remove(partial_filepath)
+
+def process_srt_file(filepath, filename, target_languages, file_id, progress, revision_of=None):
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            csv_reader = csv.reader(f)
-            headers = next(csv_reader)
-            rows = list(csv_reader)
+        # 줄바꿈 문자를 그대로 보존하기 위해 newline=''로 읽음
+        with progress.stage('read'), open(filepath, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
 
-        translator = GoogleTranslator(source='auto', target=target_language)
+        progress.update(10, 'Parsing subtitles...')
+        eventlet.sleep(0)
 
-        # 헤더 번역
-        translated_headers = [translator.translate(header) for header in headers]
+        # 자막 구조 분석은 모든 대상 언어가 공유 (번호와 타임코드는 원본 그대로 유지)
+        with progress.stage('split'):
+            document = SubtitleDocument.parse(text)
+            dialogue = document.cue_texts()
+        base_filename = os.path.splitext(filename)[0]
 
-        # 진행 상황 업데이트
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 10, 'status': 'Translating headers...'})
-        eventlet.sleep(0)
+        def translate_language(target_language, language_progress):
+            translator = create_translator(target_language)
+            memory = segment_memory(file_id, filename, target_language, revision_of)
 
-        # 데이터 번역
-        translated_rows = []
-        total_rows = len(rows)
-        for i, row in enumerate(rows):
-            translated_row = [translator.translate(cell) for cell in row]
-            translated_rows.append(translated_row)
+            def report_progress(done_cues, total_cues):
+                percentage = int((done_cues / total_cues) * 80) + 10
+                language_progress.update(percentage, f'Translated {done_cues}/{total_cues} cues...')
+                eventlet.sleep(0)
 
-            progress = int((i / total_rows) * 80) + 10
-            socketio.emit('file_progress', {'file_id': file_id, 'percentage': progress, 'status': f'Translating row {i+1}/{total_rows}...'})
-            eventlet.sleep(0)
+            # 큐별 대사만 중복 없이 배치로 번역 (여러 줄 대사는 큐 단위로 번역하고 큐마다 번호 표시 줄로 구분)
+            with language_progress.stage('translate'):
+                translations = translate_unique(translator, dialogue, MAX_CHARS, report_progress, memory,
+                                                translation_executor, marked=True)
 
-        # 번역된 CSV 파일 저장
-        base_filename = os.path.splitext(filename)[0]
-        translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}.csv')
-        translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+            translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}.srt')
+            translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
 
-        with open(translated_filepath, 'w', encoding='utf-8', newline='') as f:
-            csv_writer = csv.writer(f)
-            csv_writer.writerow(translated_headers)
-            csv_writer.writerows(translated_rows)
+            with language_progress.stage('write'), open(translated_filepath, 'w', encoding='utf-8', newline='') as f:
+                f.write(document.render(translations))
 
-        logging.info(f"Translated CSV file saved: {translated_filepath}")
+            logging.info(f"Translated SRT file saved: {translated_filepath} ({len(translations)} unique of {len(dialogue)} cues)")
+            log_revision(memory, filename, target_language)
+            language_progress.finish(100, 'Translation complete!', download_filename=translated_filename)
+            return translated_filename
 
-        socketio.emit('file_progress', {
-            'file_id': file_id,
-            'percentage': 100,
-            'status': 'Translation complete!',
-            'download_filename': translated_filename
-        })
+        results = translate_languages(progress, target_languages, translate_language, 'Error occurred: {}')
+        logging.info(f"Translation memory stats: {translation_memory.stats()}")
+        return results
 
     except Exception as e:
-        logging.error(f"CSV file processing error ({filename}): {e}")
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 0, 'status': f'Error occurred: {str(e)}'})
+        logging.error(f"SRT file processing error ({filename}): {e}")
+        progress.finish(0, f'Error occurred: {str(e)}')
+        raise
 
-def process_pdf_file(filepath, filename, target_language, file_id):
+def process_pdf_file(filepath, filename, target_languages, file_id, progress, revision_of=None):
+    import pdf_engine
+    pdf_worker_pool = get_pdf_worker_pool()
     try:
-        pdf_reader = PdfReader(filepath)
-        pdf_writer = PdfWriter()
-
-        # 대상 언어에 따른 폰트 설정
-        font_path = get_font_path(target_language)
-        pdfmetrics.registerFont(TTFont('target_font', font_path))
-
-        translator = GoogleTranslator(source='auto', target=target_language)
-        
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 10, 'status': 'PDF에서 텍스트 추출 중...'})
+        progress.update(10, 'PDF에서 텍스트 추출 중...')
         eventlet.sleep(0)
 
-        total_pages = len(pdf_reader.pages)
-        for page_num, layout in enumerate(extract_pages(filepath)):
-            logging.info(f"페이지 {page_num + 1} 처리 시작")
-            # 새 페이지 생성
-            packet = BytesIO()
-            can = canvas.Canvas(packet)
-
-            # 원본 페이지의 크기 유지
-            page = pdf_reader.pages[page_num]
-            width = float(page.mediabox.width)
-            height = float(page.mediabox.height)
-            can.setPageSize((width, height))
-
-            # 비텍스트 요소 복사
-            for element in layout:
-                if isinstance(element, (LTImage, LTFigure)):
-                    # 이미지나 그래픽 요소의 위치와 크기 정보를 사용하여 원본에서 복사
-                    x, y, w, h = element.bbox
-                    can.saveState()
-                    can.translate(x, height - y - h)
-                    can.scale(1, -1)
-                    can.doForm('page[%d]' % page_num)
-                    can.restoreState()
-
-            # 텍스트 번역 및 그리기
-            for element in layout:
-                if isinstance(element, LTTextBox):
-                    text = element.get_text().strip()
-                    if text:
-                        translated_text = translator.translate(text)
-                        bbox = element.bbox
-                        x, y, _, _ = bbox
-                        font_size = get_average_font_size(element)
-                        
-                        can.setFont('target_font', font_size)
-                        can.setFillColor(red)
-                        
-                        # 텍스트를 여러 줄로 나누어 그리기
-                        lines = wrap_text(translated_text, can, width - x)
-                        for i, line in enumerate(lines):
-                            can.drawString(x, height - y - i*font_size*1.2, line)
-
-            can.save()
-            packet.seek(0)
-            new_page = PdfReader(packet).pages[0]
-            
-            pdf_writer.add_page(new_page)
-
-            progress = int((page_num + 1) / total_pages * 80) + 10
-            socketio.emit('file_progress', {'file_id': file_id, 'percentage': progress, 'status': f'페이지 {page_num + 1}/{total_pages} 처리 중...'})
-            eventlet.sleep(0)
-            logging.info(f"페이지 {page_num + 1} 처리 완료")
-
-        # 번역된 PDF 저장
+        # 페이지 범위별 레이아웃 분석을 작업 프로세스들에서 병렬로 한 번만 수행 (모든 대상 언어가 공유)
+        with progress.stage('extract'):
+            total_pages = pdf_engine.count_pages(filepath)
+            pages = pdf_engine.extract_document(pdf_worker_pool, filepath, total_pages, PDF_PAGES_PER_TASK)
+
+        # 머리글, 바닥글, 쪽 번호 줄처럼 반복되는 상자는 한 구간으로 묶어 작업마다 한 번만 번역
+        with progress.stage('split'):
+            segments = SegmentIndex(pages)
+            texts = segments.texts()
+        segment_stats = segments.stats()
+        total_texts = len(texts)
         base_filename = os.path.splitext(filename)[0]
-        translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}.pdf')
-        translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
-
-        with open(translated_filepath, 'wb') as f:
-            pdf_writer.write(f)
-
-        logging.info(f"번역된 PDF 파일 저장됨: {translated_filepath}")
-
-        socketio.emit('file_progress', {
-            'file_id': file_id,
-            'percentage': 100,
-            'status': '번역 완료!',
-            'download_filename': translated_filename
-        })
-
-    except Exception as e:
-        logging.error(f"PDF 파일 처리 오류 ({filename}): {e}")
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 0, 'status': f'오류 발생: {str(e)}'})
 
-    try:
-        pdf_reader = PdfReader(filepath)
-        pdf_writer = PdfWriter()
+        def translate_language(target_language, language_progress):
+            memory = segment_memory(file_id, filename, target_language, revision_of)
+            translator = create_translator(target_language)
 
-        # 대상 언어에 따른 폰트 설정
-        font_path = get_font_path(target_language)
-        pdfmetrics.registerFont(TTFont('target_font', font_path))
+            def report_progress(i):
+                percentage = int((i / total_texts) * 60) + 20  # 20% ~ 80%
+                language_progress.update(percentage, f'텍스트 {i}/{total_texts} 번역 중...')
+                eventlet.sleep(0)
 
-        translator = GoogleTranslator(source='auto', target=target_language)
-        
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 10, 'status': 'PDF에서 텍스트 추출 중...'})
-        eventlet.sleep(0)
+            def translate_many(items):
+                return translate_each(translator, items, memory, translation_executor)
 
-        total_pages = len(pdf_reader.pages)
-        for page_num, layout in enumerate(extract_pages(filepath)):
-            logging.info(f"페이지 {page_num + 1} 처리 시작")
-            # 새 페이지 생성
-            packet = BytesIO()
-            can = canvas.Canvas(packet)
-
-            # 원본 페이지의 크기 유지
-            page = pdf_reader.pages[page_num]
-            width = float(page.mediabox.width)
-            height = float(page.mediabox.height)
-            can.setPageSize((width, height))
-
-            for element in layout:
-                if isinstance(element, LTTextBox):
-                    text = element.get_text().strip()
-                    if text:
-                        translated_text = translator.translate(text)
-                        bbox = element.bbox
-                        x, y, _, _ = bbox
-                        font_size = get_average_font_size(element)
-                        
-                        can.setFont('target_font', font_size)
-                        can.setFillColor(red)
-                        
-                        # 텍스트를 여러 줄로 나누어 그리기
-                        lines = wrap_text(translated_text, can, width - x)
-                        for i, line in enumerate(lines):
-                            can.drawString(x, height - y - i*font_size*1.2, line)
-
-            can.save()
-            packet.seek(0)
-            new_page = PdfReader(packet).pages[0]
-            
-            # 원본 페이지와 번역된 페이지 병합
-            page.merge_page(new_page)
-            pdf_writer.add_page(page)
-
-            progress = int((page_num + 1) / total_pages * 80) + 10
-            socketio.emit('file_progress', {'file_id': file_id, 'percentage': progress, 'status': f'페이지 {page_num + 1}/{total_pages} 처리 중...'})
+            # 모든 페이지의 고유 구간을 동시에 번역하고 모든 상자에 펼침
+            language_progress.update(20, f'{total_pages}페이지 번역 중...')
             eventlet.sleep(0)
-            logging.info(f"페이지 {page_num + 1} 처리 완료")
+            with language_progress.stage('translate'):
+                translated_texts = translate_each(translator, texts, memory, translation_executor, report_progress)
+                translations = segments.expand(translated_texts, translate_many)
 
-        # 번역된 PDF 저장
-        base_filename = os.path.splitext(filename)[0]
-        translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}.pdf')
-        translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+            # 번역문 오버레이를 페이지별로 병렬 렌더링
+            language_progress.update(80, '번역된 페이지 생성 중...')
+            eventlet.sleep(0)
+            with language_progress.stage('render'):
+                overlays = pdf_engine.render_document(pdf_worker_pool, pages, translations, target_language, PDF_PAGES_PER_TASK)
 
-        with open(translated_filepath, 'wb') as f:
-            pdf_writer.write(f)
+            # 원본 페이지와 오버레이를 순서대로 병합하여 저장
+            translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}.pdf')
+            translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+            with language_progress.stage('write'):
+                pdf_engine.merge_overlays(filepath, overlays, translated_filepath)
 
-        logging.info(f"번역된 PDF 파일 저장됨: {translated_filepath}")
+            logging.info(f"번역된 PDF 파일 저장됨: {translated_filepath} ({total_pages}페이지, 텍스트 상자 {segment_stats['boxes']}개, "
+                         f"번역한 구간 {segment_stats['segments']}개)")
+            log_revision(memory, filename, target_language)
+            language_progress.finish(100, '번역 완료!', download_filename=translated_filename)
+            return translated_filename
 
-        socketio.emit('file_progress', {
-            'file_id': file_id,
-            'percentage': 100,
-            'status': '번역 완료!',
-            'download_filename': translated_filename
-        })
+        results = translate_languages(progress, target_languages, translate_language, '오류 발생: {}')
+        logging.info(f"Translation memory stats: {translation_memory.stats()}")
+        return results
 
     except Exception as e:
         logging.error(f"PDF 파일 처리 오류 ({filename}): {e}")
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 0, 'status': f'오류 발생: {str(e)}'})
-
-def get_average_font_size(textbox):
-    sizes = [char.size for char in textbox if isinstance(char, LTChar)]
-    return sum(sizes) / len(sizes) if sizes else 12
-
-def wrap_text(text, canvas, max_width):
-    words = text.split()
-    lines = []
-    current_line = []
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        width = canvas.stringWidth(test_line)
-        if width <= max_width:
-            current_line.append(word)
-        else:
-            lines.append(' '.join(current_line))
-            current_line = [word]
-    lines.append(' '.join(current_line))
-    return lines
-
-def get_font_path(target_language):
-    # 대상 언어에 따른 폰트 경로 반환
-    if target_language == 'ko':
-        return KOREAN_FONT_PATH
-    elif target_language == 'ja':
-        return JAPANESE_FONT_PATH
-    # 다른 언어에 대한 처리 추가
-    else:
-        return DEFAULT_FONT_PATH  # 기본 폰트 경로
-
-def process_file(filepath, filename, target_language, file_id):
+        progress.finish(0, f'오류 발생: {str(e)}')
+        raise
+
+def process_web_file(filepath, filename, target_languages, file_id, progress, url=None, revision_of=None):
+    # 웹 페이지(HTML)의 본문 블록을 배치로 번역하고 대상 언어별로 PDF를 한 번 렌더링
+    # url: 상대 경로 이미지와 링크의 기준 주소 (URL로 제출한 페이지)
+    # revision_of: 이전 판의 file_id (바뀌지 않은 블록은 이전 판의 번역문을 사용)
+    import pdf_engine
+    from web_engine import WebDocument
+    pdf_worker_pool = get_pdf_worker_pool()
     try:
-        if filename.lower().endswith('.csv'):
-            process_csv_file(filepath, filename, target_language, file_id)
-        elif filename.lower().endswith('.pdf'):
-            process_pdf_file(filepath, filename, target_language, file_id)
-        else:
-            # 기존의 텍스트 파일 처리 로직
-            with open(filepath, 'r', encoding='utf-8') as f:
-                text = f.read()
-
-            text_parts = split_text(text, MAX_CHARS)
-            total_parts = len(text_parts)
-
-            socketio.emit('file_progress', {'file_id': file_id, 'percentage': 10, 'status': 'Splitting file...'})
-            eventlet.sleep(0)
+        with progress.stage('read'), open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
 
-            base_filename = os.path.splitext(filename)[0]
-            original_extension = os.path.splitext(filename)[1]
-            split_filenames = []
-
-            for i, part in enumerate(text_parts, 1):
-                split_filename = f'{base_filename}_part{i}.txt'
-                split_filepath = os.path.join(PROCESSED_FOLDER, split_filename)
+        progress.update(10, 'Extracting page text...')
+        eventlet.sleep(0)
 
-                with open(split_filepath, 'w', encoding='utf-8') as f:
-                    f.write(part)
+        # 본문 블록 추출은 모든 대상 언어가 공유
+        with progress.stage('split'):
+            document = WebDocument.parse(html)
+            blocks = document.blocks()
+        base_filename = os.path.splitext(filename)[0]
 
-                split_filenames.append(split_filename)
+        def translate_language(target_language, language_progress):
+            translator = create_translator(target_language)
+            memory = segment_memory(file_id, filename, target_language, revision_of)
 
-                progress = int((i / total_parts) * 30) + 10  # 10% ~ 40%
-                socketio.emit('file_progress', {'file_id': file_id, 'percentage': progress, 'status': f'Saving part {i}/{total_parts}...'})
+            def report_progress(done_blocks, total_blocks):
+                percentage = int((done_blocks / total_blocks) * 70) + 10  # 10% ~ 80%
+                language_progress.update(percentage, f'Translated {done_blocks}/{total_blocks} blocks...')
                 eventlet.sleep(0)
 
-            socketio.emit('file_progress', {'file_id': file_id, 'percentage': 40, 'status': 'Starting translation...'})
-            eventlet.sleep(0)
-
-            translator = GoogleTranslator(source='auto', target=target_language)
-            all_translated_text = []
+            # 블록 텍스트만 중복 없이 배치로 번역
+            with language_progress.stage('translate'):
+                translations = translate_unique(translator, blocks, MAX_CHARS, report_progress, memory, translation_executor)
 
-            for i, split_filename in enumerate(split_filenames, 1):
-                split_filepath = os.path.join(PROCESSED_FOLDER, split_filename)
-                with open(split_filepath, 'r', encoding='utf-8') as f:
-                    part_text = f.read()
+            language_progress.update(80, 'Rendering PDF...')
+            eventlet.sleep(0)
+            translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}.pdf')
+            translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+            with language_progress.stage('render'):
+                pdf_engine.render_web_page(pdf_worker_pool, document.render(translations, target_language),
+                                           translated_filepath, url, target_language)
 
-                translated_text = translator.translate(part_text)
-                all_translated_text.append(translated_text)
+            logging.info(f"Translated web page saved: {translated_filepath} ({len(translations)} unique of {len(blocks)} blocks)")
+            log_revision(memory, filename, target_language)
+            language_progress.finish(100, 'Translation complete!', download_filename=translated_filename)
+            return translated_filename
 
-                progress = int((i / total_parts) * 50) + 40  # 40% ~ 90%
-                socketio.emit('file_progress', {'file_id': file_id, 'percentage': progress, 'status': f'Translating part {i}/{total_parts}...'})
-                eventlet.sleep(0)
-
-            # 파일 이름에 file_id 포함
-            translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}{original_extension}')
-            translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+        results = translate_languages(progress, target_languages, translate_language, 'Error occurred: {}')
+        logging.info(f"Translation memory stats: {translation_memory.stats()}")
+        return results
 
-            with open(translated_filepath, 'w', encoding='utf-8') as f:
-                f.write("\n\n".join(all_translated_text))
+    except Exception as e:
+        logging.error(f"Web page processing error ({filename}): {e}")
+        progress.finish(0, f'Error occurred: {str(e)}')
+        raise
+
+def process_text_file(filepath, filename, target_languages, file_id, progress, revision_of=None):
+    # revision_of: 이전 판의 file_id (이전 판과 같은 문단 묶음은 같은 청크로 묶어 이전 판의 번역문을 사용)
+    base_filename = os.path.splitext(filename)[0]
+    original_extension = os.path.splitext(filename)[1]
+
+    # 대상 언어별 결과 파일 (파일 이름에 file_id 포함)
+    translated_filenames = {
+        target_language: sanitize_filename(f'{base_filename}_{file_id}_{target_language}{original_extension}')
+        for target_language in target_languages
+    }
+    translated_filepaths = {target_language: os.path.join(PROCESSED_FOLDER, translated_filename)
+                            for target_language, translated_filename in translated_filenames.items()}
+    partial_filepaths = {target_language: translated_filepath + '.partial'
+                         for target_language, translated_filepath in translated_filepaths.items()}
 
-            logging.info(f"Translated file saved: {translated_filepath}")
+    try:
+        # 파일을 문단 단위로 조금씩 읽어 청크로 묶음 (전체 파일을 메모리에 올리지 않고 모든 대상 언어가 공유)
+        reader = ParagraphReader(filepath, MAX_CHARS)
+        memories = {target_language: segment_memory(file_id, filename, target_language, revision_of)
+                    for target_language in target_languages}
+        previous_hash = revision_of and content_store.content_hash(revision_of)
+
+        # 이전 시도에서 번역이 끝난 파트는 대상 언어별 체크포인트에서 가져옴
+        # (청크 경계는 이전 판에 따라 달라지므로 이전 판도 지문에 포함)
+        fingerprint = file_fingerprint(filepath, MAX_CHARS, *([previous_hash] if previous_hash else []))
+        checkpoints = {target_language: TranslationCheckpoint(CHECKPOINT_FOLDER, file_id, target_language, fingerprint)
+                       for target_language in target_languages}
+        # 청크 크기는 작업을 시작할 때 최근 요청 지연 시간에 맞춰 정하고 작업 내내 유지
+        # (이전 시도의 체크포인트가 있으면 파트 번호가 같은 청크를 가리키도록 그때의 크기를 사용)
+        saved_sizes = [checkpoint.saved_chunk_chars() for checkpoint in checkpoints.values()]
+        chunk_chars = next((size for size in saved_sizes if size), None) or translation_executor.chunk_chars(MAX_CHARS)
+        completed_parts = {}
+        for target_language, checkpoint in checkpoints.items():
+            checkpoint.chunk_chars = chunk_chars
+            completed_parts[target_language] = checkpoint.load()
+            file_index.add(file_id, CHECKPOINT, checkpoint.path, target_language)
+
+        # 문단은 항상 MAX_CHARS로 잘라서 이전 판과 같은 문단이 되게 하고 묶는 크기만 chunk_chars를 사용
+        if previous_hash:
+            # 수정본은 이전 판의 청크 경계에 맞춰 묶음 (추가/수정된 문단만 새 청크가 됨)
+            anchors, previous_chunks = revision_store.chunk_index(previous_hash, handler_version(filename))
+            chunks = iter_aligned_chunks(reader, chunk_chars, anchors, previous_chunks, segment_hash)
+        else:
+            chunks = iter_chunks(reader, chunk_chars)
+        # (읽기와 분할은 번역과 겹쳐서 진행되므로 청크를 꺼내는 데 걸린 시간만 read로 측정)
+        chunks = progress.timed_iter('read', chunks)
+        resumed_parts = sum(len(parts) for parts in completed_parts.values())
+        if resumed_parts:
+            logging.info(f"Resuming {filename} from checkpoint: {resumed_parts} parts done")
+            status = f'Resuming translation ({resumed_parts} parts done)...'
+        else:
+            status = 'Starting translation...'
+        progress.update(10, status)
+        eventlet.sleep(0)
 
-            socketio.emit('file_progress', {
-                'file_id': file_id,
-                'percentage': 100,
-                'status': 'Translation complete!',
-                'download_filename': translated_filename
-            })
+        translators = {target_language: create_translator(target_language) for target_language in target_languages}
+        language_progress = {target_language: progress.language(target_language)
+                             for target_language in target_languages}
+
+        def language_tasks():
+            # 청크를 한 번 읽어 모든 대상 언어의 번역 작업으로 펼침
+            for index, chunk in enumerate(chunks):
+                for target_language in target_languages:
+                    yield index, chunk, target_language
+
+        def translate_part(task):
+            # 체크포인트와 번역 메모리는 실행기 밖에서 조회/기록하고 실제 번역 요청(청크 문자열)만 실행기로 보냄
+            # (실행기가 실패한 청크를 나누고, 헤지한 요청이 체크포인트에 두 번 기록되지 않으며, 요청 없이 끝난 파트가
+            #  지연 시간 통계에 섞이지 않음)
+            index, chunk, target_language = task
+            memory = memories[target_language]
+            if index in completed_parts[target_language]:
+                translated_text = completed_parts[target_language].pop(index)
+                # 이전 시도에서 번역한 파트도 이 판의 구간으로 기록
+                memory.put_many({chunk: translated_text})
+                return target_language, translated_text
+            translated_text = memory.get_many([chunk]).get(chunk)
+            if translated_text is None:
+                translated_text = translation_executor.call_split(translators[target_language].translate, chunk)
+                memory.put_many({chunk: translated_text})
+            checkpoints[target_language].record(index, translated_text)
+            return target_language, translated_text
+
+        # 청크를 모든 언어로 동시에 번역하고 문서 순서대로 언어별 결과 파일에 바로 기록
+        # (동시 요청 수는 실행기가 프로세스 전체에서 제한)
+        translated_parts = ordered_imap(translate_part, language_tasks(), translation_executor.concurrency)
+        files = {}
+        try:
+            for target_language, partial_filepath in partial_filepaths.items():
+                files[target_language] = open(partial_filepath, 'w', encoding='utf-8')
+            written_parts = dict.fromkeys(target_languages, 0)
+            # (모든 언어의 청크를 함께 번역하므로 translate는 작업 단계로, write는 언어별로 측정)
+            for target_language, translated_text in progress.timed_iter('translate', translated_parts):
+                written_parts[target_language] += 1
+                with language_progress[target_language].stage('write'):
+                    if written_parts[target_language] > 1:
+                        files[target_language].write("\n\n")
+                    files[target_language].write(translated_text)
+
+                percentage = int((reader.bytes_read / max(reader.total_bytes, 1)) * 80) + 10  # 10% ~ 90%
+                language_progress[target_language].update(
+                    percentage, f'Translating part {written_parts[target_language]}...')
+                eventlet.sleep(0)
+        finally:
+            # 작업이 취소되거나 실패하면 진행 중인 번역 요청을 중단하고 원본 파일을 닫음
+            translated_parts.close()
+            chunks.close()
+            for f in files.values():
+                f.close()
+
+        for target_language in target_languages:
+            with language_progress[target_language].stage('write'):
+                os.replace(partial_filepaths[target_language], translated_filepaths[target_language])
+            checkpoints[target_language].remove()
+            file_index.remove(file_id, CHECKPOINT, target_language)
+            logging.info(f"Translated file saved: {translated_filepaths[target_language]}")
+            log_revision(memories[target_language], filename, target_language)
+            language_progress[target_language].finish(
+                100, 'Translation complete!', download_filename=translated_filenames[target_language])
+        logging.info(f"Translation memory stats: {translation_memory.stats()}")
+
+        return translated_filenames, {}
 
     except Exception as e:
         logging.error(f"File processing error ({filename}): {e}")
-        socketio.emit('file_progress', {'file_id': file_id, 'percentage': 0, 'status': f'Error occurred: {str(e)}'})
+        progress.finish(0, f'Error occurred: {str(e)}')
+        raise
+    finally:
+        # 중단된 경우 기록 중이던 결과 파일 삭제 (번역된 파트는 체크포인트에 남아 있음)
+        for partial_filepath in partial_filepaths.values():
+            if os.path.exists(partial_filepath):
+                os.remove(partial_filepath)
+
+# 확장자별 파일 처리기 (PDF와 웹 페이지 처리기의 무거운 모듈은 처음 처리할 때 불러옴)
+# version: 처리기 결과 형식 버전 (결과 파일의 내용이 달라지도록 처리기를 바꾸면 올려서 이전 결과를 재사용하지 않게 함)
+# options: 작업 설정 중 처리기에 넘길 항목 (CSV는 번역할 열 번호 목록 columns, 웹 페이지는 원래 주소 url,
+#          모든 형식은 이전 판의 file_id revision_of)
+handler_registry = HandlerRegistry()
+handler_registry.register('csv', ['.csv'], 3, process_csv_file, options=['columns', 'revision_of'])
+handler_registry.register('html', ['.html', '.htm'], 1, process_web_file,
+                          modules=['pdf_engine', 'web_engine'], options=['url', 'revision_of'])
+handler_registry.register('pdf', ['.pdf'], 2, process_pdf_file, modules=['pdf_engine'],
+                          options=['revision_of'])
+handler_registry.register('srt', ['.srt'], 2, process_srt_file, options=['revision_of'])
+handler_registry.register('text', ['.txt'], 1, process_text_file, options=['revision_of'], default=True)
+
+def process_file(filepath, filename, target_languages, file_id, progress, options=None):
+    # 파일 형식에 맞는 처리기로 분기 (원본 읽기와 분할은 한 번만 하고 대상 언어별로 번역)
+    # 처리가 끝나면 ({언어: 결과 파일 이름(PROCESSED_FOLDER 기준)}, {언어: 오류 메시지})를 반환
+    # (일부 언어만 실패하면 오류 목록에 담고, 원본 처리 자체가 실패하면 예외를 그대로 전달)
+    try:
+        return handler_registry.get(filename)(filepath, filename, target_languages, file_id, progress, options)
     finally:
-        # 분할된 파일 삭제 (CSV 파일과 PDF 파일 처리 시에는 해당 없음)
-        if not filename.lower().endswith(('.csv', '.pdf')):
-            for split_filename in split_filenames:
-                try:
-                    os.remove(os.path.join(PROCESSED_FOLDER, split_filename))
-                except Exception as e:
-                    logging.error(f"Error deleting split file ({split_filename}): {e}")
+        # 작업 중에 모은 구간 번역문을 한 트랜잭션으로 기록 (실패한 작업도 번역된 구간은 남김)
+        content_hash = content_store.content_hash(file_id)
+        if content_hash:
+            revision_store.flush(content_hash)
+
+def handler_name(filename):
+    # 파일을 처리하는 처리기 이름 (csv, html, pdf, srt, 그 외는 text)
+    return handler_registry.get(filename).name
+
+def handler_version(filename, options=None):
+    # 결과 재사용 키에 쓰는 처리기 버전 (번역 제공자와 처리기 설정이 바뀌어도 결과가 달라지므로 함께 포함)
+    handler = handler_registry.get(filename)
+    version = f'{handler.name}-v{handler.version}-{TRANSLATION_PROVIDER}'
+    columns = (options or {}).get('columns')
+    if columns is not None:
+        version += '-cols' + ','.join(str(column) for column in columns)
+    return version
+
+def download_name(secure_name):
+    # 결과 파일 이름에서 file_id를 뺀 다운로드 이름 ({원래 이름}_{대상 언어}.{확장자})
+    base_filename, ext = os.path.splitext(secure_name)
+    parts = base_filename.rsplit('_', 2)
+    if len(parts) >= 3:
+        return f"{parts[0]}_{parts[2]}{ext}"
+    return secure_name
 
 @app.route('/download/<filename>')
 def download_file(filename):
     # 파일 다운로드 처리
     try:
         secure_name = secure_filename(filename)
-        file_path = os.path.join(PROCESSED_FOLDER, secure_name)
-
-        # 경로 검증
-        if not os.path.abspath(file_path).startswith(os.path.abspath(PROCESSED_FOLDER)) or '..' in filename:
+        if '..' in filename:
             abort(404)
 
-        if os.path.exists(file_path) and os.path.isfile(file_path):
+        # 색인에서 결과 파일을 찾음 (색인에 없는 파일은 제공하지 않음)
+        entry = file_index.find(secure_name, OUTPUT)
+        file_path = entry['path'] if entry else os.path.join(PROCESSED_FOLDER, secure_name)
+
+        if entry and os.path.isfile(file_path):
             logging.info(f"Starting file download: {file_path}")
-            
-            # 파일 이름에서 file_id 제거
-            base_filename, ext = os.path.splitext(secure_name)
-            parts = base_filename.rsplit('_', 2)
-            if len(parts) >= 3:
-                download_name = f"{parts[0]}_{parts[2]}{ext}"
-            else:
-                download_name = secure_name
-            
-            return send_file(file_path, as_attachment=True, download_name=download_name)
+            # ETag(수정 시각, 크기 기반)와 조건부/범위 요청을 지원하여 끊긴 다운로드는 이어 받고 다시 받을 때는 304로 확인만 함
+            # (같은 이름으로 다시 번역하면 결과 파일이 바뀌므로 캐시는 매번 ETag로 재검증)
+            response = send_file(file_path, as_attachment=True, download_name=download_name(secure_name),
+                                 conditional=True, etag=True, max_age=0)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
         else:
             logging.error(f"File not found: {file_path}")
             return jsonify({'error': 'File not found.'}), 404
@@ -547,5 +965,149 @@ def download_file(filename):
         logging.error(f"Error during file download: {e}")
         return jsonify({'error': 'An error occurred during file download.'}), 500
 
+@app.route('/download_bundle', methods=['GET', 'POST'])
+def download_bundle():
+    # 여러 결과 파일을 하나의 ZIP으로 내려받음 (ZIP은 디스크나 메모리에 만들지 않고 압축하면서 바로 전송)
+    # files: 결과 파일 이름 목록, file_ids: 모든 결과 파일을 포함할 file_id 목록 (폼 또는 쿼리 문자열)
+    entries = []
+    seen = set()
+    for name in request.values.getlist('files'):
+        entry = file_index.find(secure_filename(name), OUTPUT)
+        if entry and entry['path'] not in seen and os.path.isfile(entry['path']):
+            seen.add(entry['path'])
+            entries.append((download_name(entry['name']), entry['path']))
+    for file_id in request.values.getlist('file_ids'):
+        file_index.touch(file_id)
+        for entry in file_index.outputs(file_id):
+            if entry['path'] not in seen and os.path.isfile(entry['path']):
+                seen.add(entry['path'])
+                entries.append((download_name(entry['name']), entry['path']))
+    if not entries:
+        return jsonify({'error': 'No completed files to download.'}), 404
+
+    logging.info(f"Starting bundle download: {len(entries)} files")
+    return Response(stream_with_context(iter_zip(entries)), mimetype='application/zip',
+                    headers={'Content-Disposition': 'attachment; filename="translations.zip"'})
+
+def remove_processed(file_id, target_language):
+    # 이전 결과 파일 삭제 (보관된 결과와 하드 링크로 연결되어 있을 수 있으므로 덮어쓰지 않고 먼저 삭제)
+    file_index.remove(file_id, OUTPUT, target_language)
+
+def job_languages(job):
+    # 작업의 대상 언어 목록 (쉼표로 구분해 저장)
+    return job['target_language'].split(',')
+
+def job_options(job):
+    # 작업의 처리기별 추가 설정 (JSON으로 저장)
+    return json.loads(job.get('options') or '{}')
+
+def run_job(job):
+    target_languages = job_languages(job)
+    options = job_options(job)
+    timer = StageTimer(stage_seconds, handler_name(job['filename']))
+    progress = progress_reporter.job(job, timer)
+    for target_language in target_languages:
+        remove_processed(job['file_id'], target_language)
+    try:
+        outputs, errors = process_file(job['filepath'], job['filename'], target_languages, job['file_id'], progress,
+                                       options)
+    finally:
+        timer.observe()
+
+    content_hash = content_store.content_hash(job['file_id'])
+    for target_language, translated_filename in outputs.items():
+        translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+        file_index.add(job['file_id'], OUTPUT, translated_filepath, target_language)
+
+        # 같은 내용의 파일을 같은 언어로 다시 번역할 때 재사용할 수 있도록 결과를 보관
+        if content_hash:
+            content_store.save_artifact(content_hash, target_language, handler_version(job['filename'], options),
+                                        translated_filepath)
+
+    # 일부 언어가 실패하면 성공한 언어의 결과는 남기고 작업은 실패로 기록
+    if errors:
+        message = '; '.join(f'{target_language}: {error}' for target_language, error in errors.items())
+        progress.finish(0, f'Error occurred: {message}')
+        raise RuntimeError(message)
+    progress.finish(100, 'Translation complete!')
+
+def reuse_artifact(file_id, filename, target_language, options=None):
+    # 같은 내용, 언어, 처리기 버전의 결과가 이미 있으면 이 파일의 결과로 연결하고 결과 파일 이름을 반환
+    content_hash = content_store.content_hash(file_id)
+    artifact_path = content_hash and content_store.find_artifact(content_hash, target_language,
+                                                                 handler_version(filename, options))
+    if not artifact_path:
+        return None
+    base_filename, extension = os.path.splitext(filename)
+    translated_filename = sanitize_filename(f'{base_filename}_{file_id}_{target_language}{os.path.splitext(artifact_path)[1] or extension}')
+    remove_processed(file_id, target_language)
+    translated_filepath = os.path.join(PROCESSED_FOLDER, translated_filename)
+    link_or_copy(artifact_path, translated_filepath)
+    file_index.add(file_id, OUTPUT, translated_filepath, target_language)
+    logging.info(f"Reused translation of {content_hash[:12]} ({target_language}) for {filename}")
+    return translated_filename
+
+# PDF 레이아웃 분석과 렌더링을 담당하는 작업 프로세스 풀 (PDF, 웹 페이지 처리기가 처음 쓸 때 만들고 시작)
+_pdf_worker_pool = None
+
+def get_pdf_worker_pool():
+    global _pdf_worker_pool
+    import pdf_engine
+    with thread_lock:
+        if _pdf_worker_pool is None:
+            _pdf_worker_pool = pdf_engine.create_pool(app.config['PDF_WORKERS'])
+    return _pdf_worker_pool
+
+# 작업 스케줄러: 재시작 시 끝나지 않은 작업을 다시 큐에 넣고 실행
+# (JOB_RUNNER가 worker이면 웹 프로세스는 작업을 큐에 넣기만 하고 worker.py 프로세스들이 실행)
+job_scheduler = JobScheduler(
+    app.config['JOB_DB_PATH'],
+    runner=run_job,
+    spawn=eventlet.spawn,
+    max_concurrent=app.config['MAX_CONCURRENT_JOBS'],
+    max_per_owner=app.config['MAX_JOBS_PER_USER'],
+    stale_after=app.config['JOB_STALE_AFTER'],
+)
+if JOB_RUNNER == 'web':
+    job_scheduler.start()
+
+metrics_registry.gauge('jobs_active', 'Jobs currently running.', func=job_scheduler.active_count)
+metrics_registry.gauge('jobs_queued', 'Jobs waiting in the queue.', func=job_scheduler.queue_depth)
+metrics_registry.counter('progress_updates_coalesced_total', 'Progress updates merged into a later frame.',
+                         func=lambda: progress_reporter.stats()['coalesced'])
+metrics_registry.counter('translation_memory_hits_total', 'Translation memory lookups served from cache.',
+                         func=lambda: translation_memory.hits + translation_memory.disk_hits)
+metrics_registry.counter('translation_memory_misses_total', 'Translation memory lookups that missed.',
+                         func=lambda: translation_memory.misses)
+metrics_registry.counter('translator_hedged_requests_total', 'Duplicate requests sent for calls slower than p95.',
+                         func=lambda: translation_executor.hedged)
+metrics_registry.counter('translator_split_retries_total', 'Failed requests retried in two parts.',
+                         func=lambda: translation_executor.splits)
+metrics_registry.gauge('translator_request_chars', 'Current adaptive request size in characters.',
+                       func=lambda: translation_executor.chunk_chars(MAX_CHARS))
+
+@app.route('/metrics')
+def metrics():
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+def sweep_files():
+    # 오래 사용되지 않았거나 용량 한도를 넘은 파일을 주기적으로 정리 (대기/실행 중인 작업의 파일은 제외)
+    while True:
+        eventlet.sleep(app.config['FILE_SWEEP_INTERVAL'])
+        try:
+            busy_file_ids = job_scheduler.active_file_ids()
+            for file_id in file_index.sweep(app.config['FILE_TTL'], app.config['STORAGE_QUOTA_BYTES'],
+                                            busy_file_ids.__contains__):
+                released_hash = content_store.release(file_id)
+                if released_hash:
+                    revision_store.remove(released_hash)
+            content_store.expire_artifacts(app.config['FILE_TTL'])
+        except Exception as e:
+            logging.error(f"File sweep error: {e}")
+
+# 정리 작업은 웹 프로세스에서만 실행 (작업 프로세스는 worker.py에서 끔)
+if app.config['FILE_SWEEPER']:
+    eventlet.spawn(sweep_files)
+
 if __name__ == "__main__":
     socketio.run(app, debug=True)
@@ -0,0 +1,198 @@
+# 여러 개의 짧은 텍스트를 묶어서 한 번의 요청으로 번역하는 유틸리티
+import re
+from collections import deque
+from functools import partial
+
+# 배치 내 항목 구분자 (번역기가 줄바꿈을 보존하는 성질을 이용)
+BATCH_SEPARATOR = '\n'
+# 여러 줄 텍스트(자막 큐 등)를 묶을 때 항목마다 앞에 두는 번호 표시 줄 (번역기가 글자 없는 줄은 그대로 두는 성질을 이용)
+ITEM_MARKER = '[[{}]]'
+ITEM_MARKER_PATTERN = re.compile(r'^\s*\[\[\s*(\d+)\s*\]\]\s*$')
+
+
+def is_translatable(text):
+    # 비어 있거나 공백뿐인 텍스트는 번역하지 않음
+    return bool(text) and not text.isspace()
+
+
+def split_whitespace(text):
+    # 텍스트를 (앞 공백, 내용, 뒤 공백)으로 나눔
+    content = text.strip()
+    start = text.find(content) if content else len(text)
+    return text[:start], content, text[start + len(content):]
+
+
+def keep_whitespace(source, translated):
+    # 번역문의 앞뒤 공백을 원문의 앞뒤 공백으로 맞춤 (번역기와 배치 분할이 지운 들여쓰기, 끝 공백 복원)
+    leading, _, trailing = split_whitespace(source)
+    return leading + translated.strip() + trailing
+
+
+def unique_texts(texts):
+    # 번역 대상 텍스트를 중복 없이 처음 등장한 순서대로 반환
+    seen = set()
+    unique = []
+    for text in texts:
+        if is_translatable(text) and text not in seen:
+            seen.add(text)
+            unique.append(text)
+    return unique
+
+
+def has_marker(text):
+    # 번호 표시 줄과 구별할 수 없는 줄이 있는지
+    return any(ITEM_MARKER_PATTERN.match(line) for line in text.splitlines())
+
+
+def pack_batches(texts, max_chars, marked=False):
+    # 구분자로 이어 붙인 길이가 max_chars를 넘지 않도록 텍스트를 배치로 묶음
+    # max_chars가 함수이면 배치를 시작할 때마다 호출하여 그때의 최대 글자 수를 사용 (요청 크기 자동 조정)
+    # marked: 항목마다 번호 표시 줄을 붙여 묶음 (줄바꿈이 있는 텍스트도 묶을 수 있음, translate_marked_batch로 번역)
+    current_limit = max_chars if callable(max_chars) else (lambda: max_chars)
+    limit = current_limit()
+    batch = []
+    batch_size = 0
+    for text in texts:
+        # 구분자를 포함하거나 그 자체로 긴 텍스트는 단독으로 번역
+        if (has_marker(text) if marked else '\n' in text or '\r' in text) or len(text) >= limit:
+            yield [text]
+            continue
+
+        added = len(text) + (len(BATCH_SEPARATOR) if batch else 0)
+        if marked:
+            added += len(ITEM_MARKER.format(len(batch))) + len(BATCH_SEPARATOR)
+        if batch and batch_size + added > limit:
+            yield batch
+            limit = current_limit()
+            batch = []
+            batch_size = 0
+            added = len(text) + (len(ITEM_MARKER.format(0)) + len(BATCH_SEPARATOR) if marked else 0)
+
+        batch.append(text)
+        batch_size += added
+
+    if batch:
+        yield batch
+
+
+def translate_batch(translator, batch):
+    # 배치를 한 번의 요청으로 번역하고 항목별 결과로 다시 나눔
+    if len(batch) == 1:
+        return [translator.translate(batch[0])]
+
+    translated = translator.translate(BATCH_SEPARATOR.join(batch))
+    parts = translated.split(BATCH_SEPARATOR) if translated else []
+    if len(parts) != len(batch):
+        # 번역 결과에서 구분자가 보존되지 않은 경우 항목별 번역으로 대체
+        return [translator.translate(text) for text in batch]
+    return [keep_whitespace(text, part) for text, part in zip(batch, parts)]
+
+
+def split_marked(translated, count):
+    # 번호 표시 줄을 기준으로 번역문을 항목별로 나눔 (표시 줄이 0부터 차례로 모두 있고 항목이 비지 않았을 때만)
+    parts = []
+    for line in translated.split('\n'):
+        match = ITEM_MARKER_PATTERN.match(line)
+        if match:
+            if int(match.group(1)) != len(parts):
+                return None
+            parts.append([])
+        elif parts:
+            parts[-1].append(line)
+        elif line.strip():
+            return None
+    parts = ['\n'.join(lines).strip() for lines in parts]
+    if len(parts) != count or not all(parts):
+        return None
+    return parts
+
+
+def translate_marked_batch(translator, batch):
+    # 항목마다 번호 표시 줄을 앞에 붙여 한 번의 요청으로 번역하고 표시 줄을 기준으로 항목별 결과로 다시 나눔
+    # (항목 안의 줄바꿈은 그대로 번역되며, 표시 줄이 어긋난 배치만 항목별 번역으로 대체)
+    if len(batch) == 1:
+        return [translator.translate(batch[0])]
+
+    translated = translator.translate(BATCH_SEPARATOR.join(f'{ITEM_MARKER.format(i)}{BATCH_SEPARATOR}{text}'
+                                                           for i, text in enumerate(batch)))
+    parts = split_marked(translated or '', len(batch))
+    if parts is None:
+        return [translator.translate(text) for text in batch]
+    return [keep_whitespace(text, part) for text, part in zip(batch, parts)]
+
+
+def translate_each(translator, texts, memory, executor, progress_callback=None):
+    # 텍스트마다 한 요청으로 번역하여 texts와 같은 순서의 번역문 목록을 반환 (PDF 구간처럼 배치로 묶지 않는 텍스트)
+    # 번역 메모리는 실행기 밖에서 먼저 조회하고 없는 텍스트만 실행기로 보냄
+    # (메모리에서 찾은 텍스트가 속도 제한 토큰과 동시 실행 자리를 쓰거나 지연 시간 통계를 낮추지 않게 함)
+    # progress_callback(번역이 끝난 고유 텍스트 수)
+    unique = list(dict.fromkeys(texts))
+    translations = memory.get_many(unique) if unique else {}
+    missing = [text for text in unique if text not in translations]
+    done_texts = len(unique) - len(missing)
+    results = executor.imap(translator.translate, missing)
+    try:
+        for text, translated in zip(missing, results):
+            translations[text] = translated
+            memory.put_many({text: translated})
+            done_texts += 1
+            if progress_callback:
+                progress_callback(done_texts)
+    finally:
+        # 작업이 취소되거나 실패하면 남은 요청도 중단
+        results.close()
+    return [translations[text] for text in texts]
+
+
+def translate_unique(translator, texts, max_chars, progress_callback=None, memory=None, executor=None, marked=False):
+    # 고유 텍스트만 배치 단위로 번역하여 {원문: 번역문} 딕셔너리로 반환
+    # memory(번역 메모리)가 주어지면 캐시에 없는 텍스트만 번역기로 보냄
+    # executor(번역 실행기)가 주어지면 배치들을 동시에 번역하고, 배치 크기는 실행기가 최근 요청에 맞춰 정함
+    # marked: 여러 줄 텍스트를 번호 표시 줄로 구분하여 묶음 (자막 큐처럼 줄바꿈이 있는 텍스트)
+    # progress_callback(번역한 텍스트 수, 전체 텍스트 수)
+    # 앞뒤 공백만 다른 텍스트는 내용만 한 번 번역하고 (번역 메모리 키도 내용) 결과에 원문마다의 앞뒤 공백을 붙임
+    contents = {text: split_whitespace(text)[1] for text in unique_texts(texts)}
+    pending = list(dict.fromkeys(contents.values()))
+    translations = {}
+    if memory is not None and pending:
+        translations.update(memory.get_many(pending))
+        pending = [text for text in pending if text not in translations]
+
+    total_texts = len(pending)
+    done_texts = 0
+    # 배치는 실행기가 요청을 보낼 때마다 하나씩 만들고, 결과는 보낸 순서대로 돌아오므로 보낸 배치를 차례로 보관
+    issued = deque()
+
+    def issue_batches():
+        limit = partial(executor.chunk_chars, max_chars) if executor else max_chars
+        for batch in pack_batches(pending, limit, marked):
+            issued.append(batch)
+            yield batch
+
+    # 번역 제공자는 자체 배치 번역을 사용하고, 그 외 번역기는 줄바꿈으로 이어 붙여 번역
+    if marked:
+        translate = partial(translate_marked_batch, translator)
+    else:
+        translate = getattr(translator, 'translate_batch', None) or partial(translate_batch, translator)
+    results = executor.imap(translate, issue_batches()) if executor else map(translate, issue_batches())
+
+    try:
+        for batch_result in results:
+            batch = issued.popleft()
+            batch_translations = {}
+            for source, translated in zip(batch, batch_result):
+                batch_translations[source] = translated if translated is not None else source
+            translations.update(batch_translations)
+            if memory is not None:
+                memory.put_many(batch_translations)
+
+            done_texts += len(batch)
+            if progress_callback:
+                progress_callback(done_texts, total_texts)
+    finally:
+        # 작업이 취소되거나 실패하면 남은 요청도 중단
+        if executor:
+            results.close()
+
+    return {text: keep_whitespace(text, translations[content])
+            for text, content in contents.items() if content in translations}
@@ -0,0 +1,68 @@
+# CSV 셀 번역 벤치마크: 셀별 번역(기존 방식)과 고유 셀 배치 번역을 비교
+# 사용법: python -m benchmarks.bench_csv --rows 5000 --cols 10 --latency 0.002
+import argparse
+import random
+import time
+
+from benchmarks.stub_translator import StubTranslator
+from csv_engine import translate_rows
+
+STATUSES = ['active', 'inactive', 'pending', 'deleted', 'archived']
+CATEGORIES = ['electronics', 'books', 'clothing', 'home', 'garden', 'toys']
+
+
+def generate_rows(num_rows, num_cols, seed=0):
+    # 실제 내보내기 파일처럼 반복 값과 빈 셀이 많은 격자를 생성
+    rng = random.Random(seed)
+    headers = [f'column {c}' for c in range(num_cols)]
+    rows = [headers]
+    for r in range(num_rows):
+        row = []
+        for c in range(num_cols):
+            kind = c % 4
+            if kind == 0:
+                row.append(rng.choice(STATUSES))
+            elif kind == 1:
+                row.append(rng.choice(CATEGORIES))
+            elif kind == 2:
+                row.append('' if rng.random() < 0.5 else rng.choice(['yes', 'no']))
+            else:
+                row.append(f'description of item {rng.randint(0, num_rows // 10)}')
+        rows.append(row)
+    return rows
+
+
+def translate_per_cell(rows, translator):
+    # 기존 process_csv_file 방식: 셀마다 한 번씩 번역 요청
+    return [[translator.translate(cell) for cell in row] for row in rows]
+
+
+def run(label, func, rows, latency):
+    translator = StubTranslator(latency)
+    start = time.perf_counter()
+    func(rows, translator)
+    elapsed = time.perf_counter() - start
+    print(f'{label:<10} calls={translator.calls:<8} chars={translator.chars:<10} time={elapsed:.3f}s')
+    return translator.calls, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV cell translation strategies.')
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.002, help='per-call latency in seconds')
+    parser.add_argument('--max-chars', type=int, default=4000)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.rows, args.cols)
+    print(f'cells={args.rows * args.cols + args.cols} latency={args.latency}s max_chars={args.max_chars}')
+
+    before_calls, before_time = run('before', translate_per_cell, rows, args.latency)
+    after_calls, after_time = run('after', lambda r, t: translate_rows(r, t, args.max_chars), rows, args.latency)
+
+    print(f'calls reduced {before_calls / max(after_calls, 1):.1f}x, '
+          f'wall time reduced {before_time / max(after_time, 1e-9):.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# 대용량 CSV 벤치마크: 전체 읽기 + 모든 셀 번역(기존 방식)과 창 단위 스트리밍 + 텍스트 열만 번역 비교
+# 사용법: python -m benchmarks.bench_csv_stream --rows 200000
+import argparse
+import csv
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import chain, islice
+
+from batch_translate import translate_unique, unique_texts
+from benchmarks.stub_translator import StubTranslator
+from csv_engine import apply_translations, infer_columns, iter_windows, unique_cells
+from translation_memory import TranslationMemory
+
+MAX_CHARS = 4000
+WINDOW_ROWS = 1000
+SAMPLE_ROWS = 200
+HEADER = ['id', 'sku', 'created_at', 'url', 'email', 'price', 'status', 'description']
+STATUSES = ['active', 'inactive', 'pending', 'deleted', 'archived']
+WORDS = ['soft', 'cotton', 'shirt', 'with', 'long', 'sleeves', 'and', 'blue', 'stripes', 'for', 'summer']
+
+
+def generate_input(path, num_rows, seed=0):
+    # 실제 상품 내보내기처럼 식별자, 날짜, URL, 가격 열과 텍스트 열이 섞인 CSV 생성
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(num_rows):
+            writer.writerow([
+                i,
+                f'SKU-{rng.randint(0, 999999):06d}',
+                f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                f'https://shop.example.com/item/{i}',
+                f'user{rng.randint(0, 9999)}@example.com',
+                f'{rng.uniform(1, 500):.2f}',
+                rng.choice(STATUSES),
+                ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))),
+            ])
+
+
+def create_memory(input_path, mode):
+    # 앱과 같이 번역 메모리를 사용 (스트리밍 방식에서는 앞선 창에서 번역한 셀을 다시 보내지 않음)
+    return TranslationMemory(f'{input_path}.{mode}.sqlite3', max_bytes=512 * 1024 * 1024,
+                             max_age=24 * 3600, lru_size=10000).bind('stub', 'ko')
+
+
+def run_before(input_path, output_path, translator):
+    # 기존 process_csv_file 방식: 모든 행을 읽고 모든 셀을 번역한 격자를 보관한 뒤 한 번에 쓰기
+    with open(input_path, 'r', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    translations = translate_unique(translator, unique_texts(cell for row in rows for cell in row), MAX_CHARS,
+                                    memory=create_memory(input_path, 'before'))
+    translated_rows = [[translations.get(cell, cell) for cell in row] for row in rows]
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(translated_rows)
+
+
+def run_after(input_path, output_path, translator):
+    # 스트리밍 방식: 표본으로 텍스트 열을 고르고 창 단위로 번역하여 바로 기록
+    memory = create_memory(input_path, 'after')
+    with open(input_path, 'r', encoding='utf-8', newline='') as source, \
+            open(output_path, 'w', encoding='utf-8', newline='') as f:
+        reader = csv.reader(source)
+        writer = csv.writer(f)
+        header = next(reader)
+        sample = list(islice(reader, SAMPLE_ROWS))
+        columns = [column['index'] for column in infer_columns(header, sample) if column['translatable']]
+        for i, rows in enumerate(iter_windows(chain([header], sample, reader), WINDOW_ROWS)):
+            translations = translate_unique(translator, unique_cells(rows, columns, i == 0), MAX_CHARS, memory=memory)
+            writer.writerows(apply_translations(rows, translations, columns, i == 0))
+    return columns
+
+
+def run_mode(mode, input_path):
+    # 각 방식을 별도 프로세스에서 실행하여 최대 RSS를 독립적으로 측정
+    output_path = input_path + f'.{mode}.out'
+    translator = StubTranslator()
+    start = time.perf_counter()
+    columns = (run_before if mode == 'before' else run_after)(input_path, output_path, translator)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    selected = 'all' if columns is None else ','.join(HEADER[column] for column in columns)
+    print(f'{mode:<7} peak_rss={peak_mb:8.1f}MB time={elapsed:6.2f}s calls={translator.calls:<7} '
+          f'chars={translator.chars:<10} columns={selected}')
+    os.remove(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory and translator traffic of the CSV pipeline.')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--mode', choices=['before', 'after'], help=argparse.SUPPRESS)
+    parser.add_argument('--input', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.input)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_path = os.path.join(tmpdir, 'input.csv')
+        generate_input(input_path, args.rows)
+        print(f'rows={args.rows} input={os.path.getsize(input_path) / (1024 * 1024):.1f}MB '
+              f'window_rows={WINDOW_ROWS} max_chars={MAX_CHARS}')
+        for mode in ('before', 'after'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_csv_stream', '--mode', mode, '--input', input_path],
+                           check=True)
+
+
+if __name__ == '__main__':
+    main()
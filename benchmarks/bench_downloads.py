@@ -0,0 +1,124 @@
+# 다운로드 벤치마크: 일괄 번역 결과(PDF와 텍스트)를 파일마다 따로 받는 방식, 메모리에 ZIP을 만들어 보내는 방식,
+# 스트리밍 ZIP(/download_bundle)의 요청 수, 첫 바이트까지 시간, 전체 시간, 서버 쪽 최대 메모리(tracemalloc)를 비교하고
+# 끊긴 다운로드 이어 받기(Range)와 재검증(If-None-Match) 응답을 확인
+# 사용법: python -m benchmarks.bench_downloads --files 50 --pdf-mb 2
+import argparse
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+import zipfile
+
+
+def measure(func):
+    # (결과, 첫 바이트까지 시간, 전체 시간, 최대 할당 MB)
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = []
+    result = func(lambda: first_byte or first_byte.append(time.perf_counter() - start))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, (first_byte[0] if first_byte else elapsed), elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch result downloads: per-file, in-memory ZIP, streamed ZIP.')
+    parser.add_argument('--files', type=int, default=50)
+    parser.add_argument('--pdf-mb', type=float, default=2.0, help='size of each translated PDF')
+    parser.add_argument('--text-kb', type=int, default=500, help='size of each translated text file')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_downloads_')
+    # app을 불러오기 전에 임시 DB를 사용하도록 설정
+    os.environ.update({
+        'TRANSLATION_PROVIDER': 'stub',
+        'JOB_DB_PATH': os.path.join(tmpdir, 'jobs.sqlite3'),
+        'CONTENT_STORE_DB_PATH': os.path.join(tmpdir, 'content_store.sqlite3'),
+        'FILE_INDEX_DB_PATH': os.path.join(tmpdir, 'file_index.sqlite3'),
+        'REVISION_DB_PATH': os.path.join(tmpdir, 'revisions.sqlite3'),
+        'MAX_CONCURRENT_JOBS': '0',
+    })
+    import app
+    from file_index import OUTPUT
+
+    # 번역 결과처럼 이름 붙인 파일을 만들어 색인에 등록 (PDF는 압축되지 않는 임의 바이트, 텍스트는 반복 문장)
+    rng = random.Random(0)
+    names = []
+    for i in range(args.files):
+        file_id = str(uuid.uuid4())
+        if i % 2 == 0:
+            name = f'manual{i}_{file_id}_ko.pdf'
+            data = rng.randbytes(int(args.pdf_mb * 1024 * 1024))
+        else:
+            name = f'notes{i}_{file_id}_ko.txt'
+            data = (b'Translated sentence number %d.\n' % i) * (args.text_kb * 1024 // 32)
+        path = os.path.join(tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        app.file_index.add(file_id, OUTPUT, path, 'ko')
+        names.append(name)
+    total_mb = sum(os.path.getsize(os.path.join(tmpdir, name)) for name in names) / (1024 * 1024)
+
+    client = app.app.test_client()
+
+    def per_file(mark):
+        received = 0
+        for name in names:
+            response = client.get(f'/download/{name}', buffered=False)
+            for chunk in response.iter_encoded():
+                mark()
+                received += len(chunk)
+            response.close()
+        return received, len(names)
+
+    def in_memory_zip(mark):
+        # 비교용: ZIP 전체를 메모리에 만든 뒤 보내는 방식
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name in names:
+                archive.write(os.path.join(tmpdir, name), app.download_name(name))
+        data = buffer.getvalue()
+        mark()
+        return len(data), 1
+
+    def streamed_zip(mark):
+        response = client.post('/download_bundle', data={'files': names}, buffered=False)
+        received = 0
+        for chunk in response.iter_encoded():
+            mark()
+            received += len(chunk)
+        response.close()
+        return received, 1
+
+    print(f'files={args.files} total={total_mb:.1f}MB')
+    print(f'{"mode":<10} {"requests":>8} {"bytes_mb":>8} {"ttfb_s":>7} {"time_s":>7} {"peak_mb":>8}')
+    results = {}
+    for mode, func in (('per-file', per_file), ('memory', in_memory_zip), ('stream', streamed_zip)):
+        (received, requests), first_byte, elapsed, peak = measure(func)
+        results[mode] = received
+        print(f'{mode:<10} {requests:>8} {received / (1024 * 1024):>8.1f} {first_byte:>7.2f} {elapsed:>7.2f} {peak:>8.1f}')
+
+    # 이어 받기와 재검증
+    name = names[0]
+    size = os.path.getsize(os.path.join(tmpdir, name))
+    full = client.get(f'/download/{name}')
+    etag = full.headers.get('ETag')
+    resumed = client.get(f'/download/{name}', headers={'Range': f'bytes={size // 2}-', 'If-Range': etag})
+    revalidated = client.get(f'/download/{name}', headers={'If-None-Match': etag})
+    print(f'resume: {resumed.status_code} {len(resumed.data)}/{size} bytes ({resumed.headers.get("Content-Range")}), '
+          f'revalidate: {revalidated.status_code} {len(revalidated.data)} bytes')
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    ok = (resumed.status_code == 206 and len(resumed.data) == size - size // 2 and revalidated.status_code == 304
+          and results['stream'] > 0)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
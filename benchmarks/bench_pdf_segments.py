@@ -0,0 +1,107 @@
+# PDF 반복 구간 벤치마크: 머리글, 바닥글(쪽 번호), 저작권 문구, 표 머리글이 반복되는 긴 설명서에서
+# 모든 텍스트 상자를 번역하는 기존 방식과 반복 구간을 한 번만 번역하는 방식의 요청 수와 시간을 비교
+# 사용법: python -m benchmarks.bench_pdf_segments --pages 300 --latency 0.02
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+WORDS = ['press', 'the', 'button', 'to', 'reset', 'device', 'filter', 'clean', 'water', 'tank', 'power', 'cable',
+         'install', 'bracket', 'screw', 'panel', 'check', 'level', 'before', 'after', 'each', 'use']
+NOTES = ['Warning: disconnect power before servicing.', 'Note: use only original spare parts.',
+         'Caution: surface may be hot.']
+
+
+def sentence(rng, min_words=6, max_words=14):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + '.'
+
+
+def generate_manual(path, num_pages, rng):
+    from reportlab.pdfgen import canvas
+    can = canvas.Canvas(path, pagesize=(612, 792))
+    for page in range(num_pages):
+        can.setFont('Helvetica', 9)
+        can.drawString(72, 760, 'Acme Widget 3000 User Manual')
+        can.drawString(400, 760, f'Chapter {page // 20 + 1}')
+        can.setFont('Helvetica', 10)
+        y = 720
+        if page % 3 == 0:
+            can.drawString(72, y, 'Part number    Description    Quantity')
+            y -= 40
+        for _ in range(rng.randint(8, 14)):
+            can.drawString(72, y, rng.choice(NOTES) if rng.random() < 0.15 else sentence(rng))
+            y -= 40
+        can.setFont('Helvetica', 8)
+        can.drawString(72, 40, '(c) 2024 Acme Corporation. All rights reserved.')
+        can.drawString(480, 40, f'Page {page + 1} of {num_pages}')
+        can.showPage()
+    can.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark repeated-segment translation of a long PDF manual.')
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.02, help='stub provider latency per request (s)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_pdf_segments_')
+    # app을 불러오기 전에 stub 제공자와 임시 DB를 사용하도록 설정
+    os.environ.update({
+        'TRANSLATION_PROVIDER': 'stub',
+        'STUB_PROVIDER_LATENCY': str(args.latency),
+        'TRANSLATION_CONCURRENCY': str(args.concurrency),
+        'TRANSLATION_RATE_LIMIT': '1000000',
+        'JOB_DB_PATH': os.path.join(tmpdir, 'jobs.sqlite3'),
+        'MAX_CONCURRENT_JOBS': '0',
+    })
+    import app
+    import pdf_engine
+    from segment_index import SegmentIndex
+    from batch_translate import translate_each
+    from translation_memory import CachedTranslator, TranslationMemory
+
+    filepath = os.path.join(tmpdir, 'manual.pdf')
+    generate_manual(filepath, args.pages, random.Random(0))
+    pages = pdf_engine.extract_document(pdf_engine.PdfWorkerPool(1), filepath, args.pages, app.PDF_PAGES_PER_TASK)
+    boxes = sum(len(page['boxes']) for page in pages)
+    print(f'pages={args.pages} boxes={boxes} latency={args.latency}s concurrency={args.concurrency}')
+    print(f'{"mode":<9} {"requests":>8} {"chars":>8} {"segments":>8} {"time_s":>7}')
+
+    results = {}
+    for mode in ('before', 'after'):
+        # 모드마다 비어 있는 번역 메모리로 시작
+        memory = TranslationMemory(os.path.join(tmpdir, f'tm-{mode}.sqlite3'), 512 * 1024 * 1024, 24 * 3600, 10000)
+        bound = memory.bind(app.TRANSLATION_PROVIDER, 'ko')
+        translator = CachedTranslator(app.create_translator('ko'), bound)
+        app.provider_stats.reset()
+        start = time.perf_counter()
+        if mode == 'before':
+            # 기존 process_pdf_file: 모든 텍스트 상자를 동시에 번역
+            texts = [box['text'] for page in pages for box in page['boxes']]
+            translated = iter(app.translation_executor.map(translator.translate, texts))
+            results[mode] = [[next(translated) for _ in page['boxes']] for page in pages]
+            segments = len(texts)
+        else:
+            # process_pdf_file: 고유 구간만 번역 메모리를 먼저 조회하고 없는 구간만 실행기로 번역
+            index = SegmentIndex(pages)
+            translator = app.create_translator('ko')
+            translated = translate_each(translator, index.texts(), bound, app.translation_executor)
+            results[mode] = index.expand(translated,
+                                         lambda items: translate_each(translator, items, bound, app.translation_executor))
+            segments = index.stats()['segments']
+        elapsed = time.perf_counter() - start
+        stats = app.provider_stats.snapshot()
+        print(f'{mode:<9} {stats["requests"]:>8} {stats["chars"]:>8} {segments:>8} {elapsed:>7.2f}')
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    if results['before'] != results['after']:
+        print('translations differ between modes', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
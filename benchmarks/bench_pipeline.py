@@ -0,0 +1,145 @@
+# 파이프라인 처리량 벤치마크: 생성한 txt/srt/csv/pdf 파일을 실제 처리기로 stub 제공자를 통해 번역
+# 요청 수, 보낸 글자 수, 요청 지연 시간 p50/p99, 처리량을 형식별로 출력 (네트워크 없이 성능 회귀 확인용)
+# 사용법: python -m benchmarks.bench_pipeline --latency 0.02 --scale 1 --formats txt,srt,csv,pdf
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+WORDS = ['translation', 'document', 'subtitle', 'page', 'layout', 'memory', 'the', 'a', 'of', 'server',
+         'report', 'quarterly', 'revenue', 'customer', 'support', 'release', 'notes', 'version']
+
+
+def sentence(rng, min_words=4, max_words=14):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + '.'
+
+
+def generate_txt(path, scale, rng):
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(400 * scale):
+            f.write(' '.join(sentence(rng) for _ in range(rng.randint(1, 8))) + '\n\n')
+
+
+def generate_srt(path, scale, rng):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(1, 1000 * scale + 1):
+            start = i * 3
+            f.write(f'{i}\n00:{start // 60 % 60:02d}:{start % 60:02d},000 --> 00:{(start + 2) // 60 % 60:02d}:{(start + 2) % 60:02d},500\n')
+            # 자막은 짧은 대사가 반복되는 경우가 많음
+            f.write(rng.choice(['Yes.', 'No.', 'Thank you.', 'What?', sentence(rng, 2, 8)]) + '\n\n')
+
+
+def generate_csv(path, scale, rng):
+    import csv
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'status', 'category', 'description'])
+        for i in range(2000 * scale):
+            writer.writerow([i, rng.choice(['active', 'pending', 'closed']), rng.choice(WORDS),
+                             sentence(rng) if rng.random() < 0.3 else f'item {rng.randint(0, 200)}'])
+
+
+def generate_pdf(path, scale, rng):
+    from reportlab.pdfgen import canvas
+    can = canvas.Canvas(path, pagesize=(612, 792))
+    for page in range(10 * scale):
+        can.setFont('Helvetica', 10)
+        can.drawString(72, 760, 'Quarterly report')
+        for i in range(20):
+            can.drawString(72, 700 - i * 30, sentence(rng, 6, 12))
+        can.drawString(300, 30, f'Page {page + 1}')
+        can.showPage()
+    can.save()
+
+
+GENERATORS = {
+    'txt': generate_txt,
+    'srt': generate_srt,
+    'csv': generate_csv,
+    'pdf': generate_pdf,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the file handlers against a local stub provider.')
+    parser.add_argument('--formats', default='txt,srt,csv,pdf')
+    parser.add_argument('--scale', type=int, default=1, help='corpus size multiplier')
+    parser.add_argument('--latency', type=float, default=0.02, help='stub provider latency per request (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-chars', type=int, default=5000, help='stub provider per-request character limit')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--target-languages', default='ko',
+                        help='comma-separated; several languages share one parse and translate concurrently')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    # app을 불러오기 전에 stub 제공자와 임시 DB·폴더를 사용하도록 설정
+    os.environ.update({
+        'TRANSLATION_PROVIDER': 'stub',
+        'STUB_PROVIDER_LATENCY': str(args.latency),
+        'STUB_PROVIDER_ERROR_RATE': str(args.error_rate),
+        'STUB_PROVIDER_MAX_CHARS': str(args.max_chars),
+        'TRANSLATION_CONCURRENCY': str(args.concurrency),
+        'TRANSLATION_RATE_LIMIT': '1000000',
+        'TRANSLATION_RETRY_BASE_DELAY': '0.01',
+        'TRANSLATION_MEMORY_PATH': os.path.join(tmpdir, 'translation_memory.sqlite3'),
+        'JOB_DB_PATH': os.path.join(tmpdir, 'jobs.sqlite3'),
+        'CONTENT_STORE_DB_PATH': os.path.join(tmpdir, 'content_store.sqlite3'),
+        'FILE_INDEX_DB_PATH': os.path.join(tmpdir, 'file_index.sqlite3'),
+        'REVISION_DB_PATH': os.path.join(tmpdir, 'revisions.sqlite3'),
+        'UPLOAD_FOLDER': os.path.join(tmpdir, 'uploads'),
+        'PROCESSED_FOLDER': os.path.join(tmpdir, 'processed'),
+        'CHECKPOINT_FOLDER': os.path.join(tmpdir, 'checkpoints'),
+        'BLOB_FOLDER': os.path.join(tmpdir, 'blobs'),
+        'MAX_CONCURRENT_JOBS': '0',
+    })
+    import app
+    from progress import ProgressReporter
+
+    reporter = ProgressReporter(lambda event, data, room: None, lambda *args: None, 0)
+    rng = random.Random(0)
+    print(f'provider=stub latency={args.latency}s error_rate={args.error_rate} max_chars={args.max_chars} '
+          f'concurrency={args.concurrency} scale={args.scale} languages={args.target_languages}')
+    print(f'{"format":<6} {"requests":>8} {"chars":>9} {"p50_ms":>7} {"p99_ms":>7} {"time_s":>7} '
+          f'{"req/s":>8} {"chars/s":>9} {"errors":>6}')
+
+    failed = False
+    for fmt in args.formats.split(','):
+        filename = f'bench.{fmt}'
+        filepath = os.path.join(tmpdir, filename)
+        GENERATORS[fmt](filepath, args.scale, rng)
+        file_id = str(uuid.uuid4())
+        progress = reporter.job({'id': file_id, 'owner': 'bench', 'file_id': file_id})
+
+        # 형식마다 새 통계로 시작 (번역 메모리는 임시 경로에서 비어 있는 상태로 시작)
+        app.provider_stats.reset()
+        start = time.perf_counter()
+        try:
+            _, errors = app.process_file(filepath, filename, args.target_languages.split(','), file_id, progress)
+            if errors:
+                raise RuntimeError(errors)
+        except Exception as e:
+            print(f'{fmt:<6} failed: {e}', file=sys.stderr)
+            failed = True
+            continue
+        elapsed = time.perf_counter() - start
+
+        stats = app.provider_stats.snapshot()
+        print(f'{fmt:<6} {stats["requests"]:>8} {stats["chars"]:>9} {stats["p50"] * 1000:>7.1f} '
+              f'{stats["p99"] * 1000:>7.1f} {elapsed:>7.2f} {stats["requests"] / elapsed:>8.1f} '
+              f'{stats["chars"] / elapsed:>9.0f} {stats["errors"]:>6}')
+
+        for name in os.listdir(app.PROCESSED_FOLDER):
+            if file_id in name:
+                os.remove(os.path.join(app.PROCESSED_FOLDER, name))
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
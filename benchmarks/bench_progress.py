@@ -0,0 +1,85 @@
+# 진행 상황 전송 벤치마크: 모든 클라이언트에 매번 방송(기존 방식)과 소유자 방 + 초당 전송 제한을 비교
+# 사용법: python -m benchmarks.bench_progress --jobs 4 --clients 20 --updates 20000 --duration 2
+import eventlet
+eventlet.monkey_patch()
+import argparse
+import json
+import time
+
+from progress import ProgressReporter
+
+
+class FrameCounter:
+    # 전송된 프레임 수와 직렬화 시간을 기록하는 가짜 emit (클라이언트마다 프레임 하나)
+    def __init__(self, clients_per_room):
+        self.clients_per_room = clients_per_room
+        self.frames = 0
+        self.bytes = 0
+
+    def emit(self, event, data, room=None):
+        recipients = self.clients_per_room(room)
+        payload = json.dumps([event, data])
+        self.frames += recipients
+        self.bytes += len(payload) * recipients
+
+
+def run_job(job_id, updates, duration, send):
+    # 작업 하나가 duration 동안 updates번 진행 상황을 보고
+    delay = duration / updates
+    for i in range(1, updates + 1):
+        send(job_id, {'file_id': job_id, 'percentage': i * 100 // updates, 'status': f'Translating row {i}...'})
+        if i % 100 == 0:
+            eventlet.sleep(delay * 100)
+
+
+def broadcast(args):
+    counter = FrameCounter(lambda room: args.clients)
+    send = lambda job_id, data: counter.emit('file_progress', data)
+    pool = eventlet.GreenPool()
+    for j in range(args.jobs):
+        pool.spawn(run_job, f'job{j}', args.updates, args.duration, send)
+    pool.waitall()
+    return counter
+
+
+def coalesced(args):
+    # 각 작업의 소유자는 서로 다르고 방에는 그 소유자의 탭 하나만 있다고 가정
+    counter = FrameCounter(lambda room: 1)
+    reporter = ProgressReporter(counter.emit, eventlet.spawn_after, args.rate)
+    jobs = {f'job{j}': {'id': f'job{j}', 'owner': f'user{j}', 'file_id': f'job{j}'} for j in range(args.jobs)}
+
+    def send(job_id, data):
+        if data['percentage'] == 100:
+            reporter.finish(jobs[job_id], data)
+        else:
+            reporter.update(jobs[job_id], data)
+
+    pool = eventlet.GreenPool()
+    for job_id in jobs:
+        pool.spawn(run_job, job_id, args.updates, args.duration, send)
+    pool.waitall()
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--updates', type=int, default=20000)
+    parser.add_argument('--duration', type=float, default=2.0)
+    parser.add_argument('--rate', type=float, default=4)
+    args = parser.parse_args()
+
+    print(f'jobs={args.jobs} clients={args.clients} updates/job={args.updates} duration={args.duration}s')
+    results = {}
+    for label, func in (('broadcast', broadcast), ('coalesced', coalesced)):
+        start = time.perf_counter()
+        counter = func(args)
+        elapsed = time.perf_counter() - start
+        results[label] = counter
+        print(f'{label:10s} frames={counter.frames} bytes={counter.bytes} time={elapsed:.2f}s')
+    print(f'frame reduction {results["broadcast"].frames / max(results["coalesced"].frames, 1):.0f}x')
+
+
+if __name__ == '__main__':
+    main()
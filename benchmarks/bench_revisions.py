@@ -0,0 +1,119 @@
+# 수정본 번역 벤치마크: 1판을 번역한 뒤 몇 군데만 고친 2판(txt, srt, csv)을 번역하여 요청 수, 보낸 글자 수, 시간을 비교
+# - full: 새 문서로 번역 (1판의 번역 메모리가 만료/정리된 경우)
+# - memory: 새 문서로 번역하지만 1판의 번역 메모리가 남아 있는 경우
+# - revision: 1판의 수정본으로 번역 (revision_of, 번역 메모리 없이 1판의 구간 번역문만 사용)
+# 사용법: python -m benchmarks.bench_revisions --edits 5 --scale 2 --latency 0.05
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+from benchmarks.bench_pipeline import generate_csv, generate_srt, generate_txt, sentence
+
+GENERATORS = {'txt': generate_txt, 'srt': generate_srt, 'csv': generate_csv}
+
+
+def revise(path, revised_path, fmt, edits, rng):
+    # 레코드(txt 문단, srt 자막 블록, csv 행) 몇 개의 끝에 문장을 덧붙이고 txt는 앞쪽에 문단 하나를 끼워 넣음
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    separator = '\r\n' if fmt == 'csv' else '\n\n'
+    records = text.split(separator)
+    first = 1 if fmt == 'csv' else 0
+    for index in rng.sample(range(first, len(records) - 1), edits):
+        records[index] += ' ' + sentence(rng)
+    if fmt == 'txt':
+        records.insert(3, sentence(rng))
+    with open(revised_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(separator.join(records))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark re-translating a lightly edited revision of a document.')
+    parser.add_argument('--formats', default='txt,srt,csv')
+    parser.add_argument('--scale', type=int, default=2, help='corpus size multiplier')
+    parser.add_argument('--edits', type=int, default=5, help='records changed in the revision')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub provider latency per request (s)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_revisions_')
+    # app을 불러오기 전에 stub 제공자와 임시 DB를 사용하도록 설정
+    os.environ.update({
+        'TRANSLATION_PROVIDER': 'stub',
+        'STUB_PROVIDER_LATENCY': str(args.latency),
+        'TRANSLATION_CONCURRENCY': str(args.concurrency),
+        'TRANSLATION_RATE_LIMIT': '1000000',
+        'JOB_DB_PATH': os.path.join(tmpdir, 'jobs.sqlite3'),
+        'CONTENT_STORE_DB_PATH': os.path.join(tmpdir, 'content_store.sqlite3'),
+        'FILE_INDEX_DB_PATH': os.path.join(tmpdir, 'file_index.sqlite3'),
+        'REVISION_DB_PATH': os.path.join(tmpdir, 'revisions.sqlite3'),
+        'MAX_CONCURRENT_JOBS': '0',
+    })
+    import app
+    from file_index import UPLOAD
+    from progress import ProgressReporter
+    from translation_memory import TranslationMemory
+
+    reporter = ProgressReporter(lambda event, data, room: None, lambda *args: None, 0)
+    rng = random.Random(0)
+
+    def new_memory():
+        return TranslationMemory(os.path.join(tmpdir, f'tm-{uuid.uuid4().hex}.sqlite3'), 512 * 1024 * 1024,
+                                 24 * 3600, 10000)
+
+    def translate(path, filename, options=None):
+        # 업로드처럼 내용 저장소에 저장한 뒤 번역하고 (file_id, 결과 파일 내용)을 반환
+        file_id = str(uuid.uuid4())
+        filepath = os.path.join(tmpdir, f'{file_id}_{filename}')
+        with open(path, 'rb') as f:
+            app.content_store.save_upload(f, file_id, filename, filepath)
+        app.file_index.add(file_id, UPLOAD, filepath)
+        progress = reporter.job({'id': file_id, 'owner': 'bench', 'file_id': file_id})
+        outputs, errors = app.process_file(filepath, filename, ['ko'], file_id, progress, options)
+        if errors:
+            raise RuntimeError(errors)
+        with open(os.path.join(app.PROCESSED_FOLDER, outputs['ko']), 'r', encoding='utf-8') as f:
+            output = f.read()
+        os.remove(os.path.join(app.PROCESSED_FOLDER, outputs['ko']))
+        return file_id, output
+
+    print(f'scale={args.scale} edits={args.edits} latency={args.latency}s concurrency={args.concurrency}')
+    print(f'{"format":<6} {"mode":<9} {"requests":>8} {"chars":>8} {"time_s":>7}')
+    failed = False
+    for fmt in args.formats.split(','):
+        v1_path = os.path.join(tmpdir, f'v1.{fmt}')
+        v2_path = os.path.join(tmpdir, f'v2.{fmt}')
+        GENERATORS[fmt](v1_path, args.scale, rng)
+        revise(v1_path, v2_path, fmt, args.edits, rng)
+
+        # 1판 번역 (구간 번역문과 번역 메모리를 채움)
+        app.translation_memory = v1_memory = new_memory()
+        v1_id, _ = translate(v1_path, f'manual.{fmt}')
+
+        outputs = {}
+        for mode in ('full', 'memory', 'revision'):
+            app.translation_memory = v1_memory if mode == 'memory' else new_memory()
+            options = {'revision_of': v1_id} if mode == 'revision' else None
+            app.provider_stats.reset()
+            start = time.perf_counter()
+            _, outputs[mode] = translate(v2_path, f'manual.{fmt}', options)
+            elapsed = time.perf_counter() - start
+            stats = app.provider_stats.snapshot()
+            print(f'{fmt:<6} {mode:<9} {stats["requests"]:>8} {stats["chars"]:>8} {elapsed:>7.2f}')
+
+        # 문단 경계가 같은 stub 번역이므로 어떤 방식이든 결과 내용은 같아야 함
+        if outputs['revision'] != outputs['full']:
+            print(f'{fmt}: revision output differs from full translation', file=sys.stderr)
+            failed = True
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
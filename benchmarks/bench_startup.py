@@ -0,0 +1,81 @@
+# 시작 비용 벤치마크: 새 프로세스에서 app을 불러오는 시간과 최대 RSS를 측정
+# - lazy: app만 불러옴 (처리기 모듈은 처음 처리할 때 불러옴)
+# - eager: 이전처럼 모든 형식의 라이브러리(PDF, HTML, nltk, deep_translator)를 시작할 때 함께 불러옴
+# - 처리기별: app을 불러온 뒤 그 처리기의 모듈을 처음 불러오는 데 드는 추가 시간과 RSS
+# 사용법: python -m benchmarks.bench_startup --runs 5
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 이전 app.py가 시작할 때 불러오던 무거운 모듈
+EAGER_MODULES = ['pdf_engine', 'web_engine', 'webToPdf', 'deep_translator', 'nltk', 'reportlab.platypus']
+
+# 불러왔는지 표시할 무거운 라이브러리
+HEAVY_MODULES = ['PyPDF2', 'pdfminer', 'reportlab', 'bs4', 'markdown', 'html2text', 'nltk', 'deep_translator']
+
+PROBE = '''
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+import app
+for module in sys.argv[2:]:
+    importlib.import_module(module)
+import_seconds = time.perf_counter() - start
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if sys.argv[1]:
+    app.handler_registry.get('file.' + sys.argv[1]).load()
+print(json.dumps({
+    'import_s': import_seconds,
+    'load_s': time.perf_counter() - start,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'rss_before_kb': rss_before,
+    'heavy': [name for name in %r if name in sys.modules],
+}))
+''' % HEAVY_MODULES
+
+
+def probe(env, extension='', modules=()):
+    result = subprocess.run([sys.executable, '-c', PROBE, extension, *modules], env=env, check=True,
+                            capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold import time and RSS of the web/worker process.')
+    parser.add_argument('--runs', type=int, default=5, help='processes per measurement (median is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = dict(os.environ)
+        env.update(TRANSLATION_PROVIDER='stub',
+                   JOB_DB_PATH=os.path.join(tmpdir, 'jobs.sqlite3'),
+                   TRANSLATION_MEMORY_PATH=os.path.join(tmpdir, 'tm.sqlite3'),
+                   CONTENT_STORE_DB_PATH=os.path.join(tmpdir, 'content_store.sqlite3'),
+                   FILE_INDEX_DB_PATH=os.path.join(tmpdir, 'file_index.sqlite3'),
+                   REVISION_DB_PATH=os.path.join(tmpdir, 'revisions.sqlite3'),
+                   UPLOAD_FOLDER=os.path.join(tmpdir, 'uploads'),
+                   PROCESSED_FOLDER=os.path.join(tmpdir, 'processed'),
+                   CHECKPOINT_FOLDER=os.path.join(tmpdir, 'checkpoints'),
+                   BLOB_FOLDER=os.path.join(tmpdir, 'blobs'))
+        # 첫 실행의 바이트코드 컴파일과 데이터베이스 생성이 측정에 섞이지 않도록 한 번 미리 실행
+        probe(env, modules=EAGER_MODULES)
+
+        print(f'runs={args.runs} (median)')
+        print(f'{"mode":<12} {"import_s":>8} {"load_s":>7} {"rss_mb":>7}  heavy modules loaded')
+        cases = [('lazy', '', ()), ('eager', '', EAGER_MODULES)]
+        cases += [(f'first {extension}', extension, ()) for extension in ('txt', 'csv', 'srt', 'pdf', 'html')]
+        for mode, extension, modules in cases:
+            results = [probe(env, extension, modules) for _ in range(args.runs)]
+            import_seconds = statistics.median(result['import_s'] for result in results)
+            load_seconds = statistics.median(result['load_s'] for result in results)
+            rss_mb = statistics.median(result['rss_kb'] for result in results) / 1024
+            heavy = ','.join(results[-1]['heavy']) or '-'
+            print(f'{mode:<12} {import_seconds:>8.2f} {load_seconds:>7.2f} {rss_mb:>7.1f}  {heavy}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# 번역 꼬리 지연 벤치마크: 지연 급증과 오류를 섞는 stub 제공자로 여러 작업(txt, srt)을 동시에 처리하여
+# 고정 요청 크기/마감 시간 없음(기존 방식)과 요청 크기 자동 조정 + 마감 시간 + 헤지 + 분할 재시도의 작업 완료 시간을 비교
+# 조정 방식에서 요청 수와 오류율로 보아 충분히 일어났어야 할 헤지나 분할 재시도가 한 번도 없으면 실패(종료 코드 1)
+# (stub 제공자의 난수는 --seed로 고정)
+# 사용법: python -m benchmarks.bench_tail_latency --jobs 40 --spike-rate 0.02 --error-rate 0.1
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+from benchmarks.bench_pipeline import generate_srt, generate_txt
+
+# 헤지/분할 횟수를 확인하는 데 필요한 최소 기대 횟수 (0번일 확률 e^-5 < 1%)
+MIN_EXPECTED_EVENTS = 5
+
+MODES = {
+    'fixed': {'TRANSLATION_ADAPTIVE': 'false', 'TRANSLATION_CALL_TIMEOUT': '0'},
+    'adaptive': {'TRANSLATION_ADAPTIVE': 'true'},
+}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def run_mode(args, tmpdir):
+    # 작업마다 파일 하나를 process_file로 번역하고 완료 시간(실패한 작업은 실패 시점)을 기록
+    import eventlet
+    import app
+    from translation_executor import MIN_HEDGE_SAMPLES
+    from progress import ProgressReporter
+
+    reporter = ProgressReporter(lambda event, data, room: None, lambda *args: None, 0)
+    rng = random.Random(0)
+    files = []
+    for i in range(args.jobs):
+        fmt = 'txt' if i % 2 == 0 else 'srt'
+        filepath = os.path.join(tmpdir, f'{args.mode}-{i}.{fmt}')
+        (generate_txt if fmt == 'txt' else generate_srt)(filepath, 1, rng)
+        files.append(filepath)
+
+    def run_job(filepath):
+        file_id = str(uuid.uuid4())
+        progress = reporter.job({'id': file_id, 'owner': 'bench', 'file_id': file_id})
+        start = time.perf_counter()
+        try:
+            _, errors = app.process_file(filepath, os.path.basename(filepath), ['ko'], file_id, progress)
+            ok = not errors
+        except Exception:
+            ok = False
+        duration = time.perf_counter() - start
+        for name in os.listdir(app.PROCESSED_FOLDER):
+            if file_id in name:
+                os.remove(os.path.join(app.PROCESSED_FOLDER, name))
+        return duration, ok
+
+    start = time.perf_counter()
+    pool = eventlet.GreenPool(args.concurrent_jobs)
+    results = list(pool.imap(run_job, files))
+    elapsed = time.perf_counter() - start
+    durations = [duration for duration, _ in results]
+    failed = sum(not ok for _, ok in results)
+    stats = app.provider_stats.snapshot()
+    print(f'{args.mode:<9} {len(results):>4} {failed:>6} {percentile(durations, 0.5):>7.2f} '
+          f'{percentile(durations, 0.99):>7.2f} {max(durations):>7.2f} {elapsed:>7.2f} {stats["requests"]:>8} '
+          f'{app.translation_executor.hedged:>6} {app.translation_executor.splits:>6}')
+    if args.mode != 'adaptive':
+        return True
+    # 기대 횟수가 MIN_EXPECTED_EVENTS 이상일 때만 확인 (요청이 적은 실행에서는 0번이어도 정상)
+    # 헤지: 기준 표본이 모인 뒤 p95보다 느린 요청(약 5%), 분할: 재시도까지 모두 실패한 요청
+    ok = True
+    expected_hedges = 0.05 * max(0, stats['requests'] - MIN_HEDGE_SAMPLES)
+    expected_splits = stats['requests'] * app.app.config['STUB_PROVIDER_ERROR_RATE'] ** (
+        app.app.config['TRANSLATION_MAX_RETRIES'] + 1)
+    for name, count, expected in (('hedged', app.translation_executor.hedged, expected_hedges),
+                                  ('split', app.translation_executor.splits, expected_splits)):
+        if expected < MIN_EXPECTED_EVENTS:
+            print(f'adaptive: {name} check skipped ({expected:.1f} expected)', file=sys.stderr)
+        elif not count:
+            print(f'adaptive: expected about {expected:.0f} {name} requests, got none', file=sys.stderr)
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job completion tail latency with a spiky, failing stub.')
+    parser.add_argument('--jobs', type=int, default=40)
+    parser.add_argument('--concurrent-jobs', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.05, help='stub base latency per request (s)')
+    parser.add_argument('--latency-per-kchar', type=float, default=0.1, help='stub latency per 1000 chars (s)')
+    parser.add_argument('--spike-rate', type=float, default=0.02)
+    parser.add_argument('--spike-latency', type=float, default=5.0)
+    parser.add_argument('--error-rate', type=float, default=0.1)
+    parser.add_argument('--max-retries', type=int, default=1,
+                        help='retries per request before failing (adaptive mode then splits the request)')
+    parser.add_argument('--call-timeout', type=float, default=3.0, help='per-call deadline in adaptive mode (s)')
+    parser.add_argument('--target-latency', type=float, default=0.5, help='adaptive target request latency (s)')
+    parser.add_argument('--seed', type=int, default=0, help='stub provider random seed')
+    parser.add_argument('--mode', choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ok = run_mode(args, tmpdir)
+        sys.exit(0 if ok else 1)
+
+    print(f'jobs={args.jobs} concurrent_jobs={args.concurrent_jobs} latency={args.latency}s '
+          f'per_kchar={args.latency_per_kchar}s spike_rate={args.spike_rate} spike={args.spike_latency}s '
+          f'error_rate={args.error_rate} max_retries={args.max_retries}')
+    print(f'{"mode":<9} {"jobs":>4} {"failed":>6} {"p50_s":>7} {"p99_s":>7} {"max_s":>7} {"total_s":>7} '
+          f'{"requests":>8} {"hedged":>6} {"splits":>6}')
+    failed = False
+    for mode, overrides in MODES.items():
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # 설정은 app을 불러올 때 읽으므로 방식마다 별도 프로세스에서 실행
+            env = dict(os.environ)
+            env.update(TRANSLATION_PROVIDER='stub',
+                       STUB_PROVIDER_LATENCY=str(args.latency),
+                       STUB_PROVIDER_LATENCY_PER_KCHAR=str(args.latency_per_kchar),
+                       STUB_PROVIDER_SPIKE_RATE=str(args.spike_rate),
+                       STUB_PROVIDER_SPIKE_LATENCY=str(args.spike_latency),
+                       STUB_PROVIDER_ERROR_RATE=str(args.error_rate),
+                       STUB_PROVIDER_SEED=str(args.seed),
+                       TRANSLATION_CALL_TIMEOUT=str(args.call_timeout),
+                       TRANSLATION_TARGET_LATENCY=str(args.target_latency),
+                       TRANSLATION_RATE_LIMIT='1000000',
+                       TRANSLATION_RETRY_BASE_DELAY='0.05',
+                       TRANSLATION_MAX_RETRIES=str(args.max_retries),
+                       TRANSLATION_MEMORY_PATH=os.path.join(tmpdir, 'tm.sqlite3'),
+                       JOB_DB_PATH=os.path.join(tmpdir, 'jobs.sqlite3'),
+                       CONTENT_STORE_DB_PATH=os.path.join(tmpdir, 'content_store.sqlite3'),
+                       FILE_INDEX_DB_PATH=os.path.join(tmpdir, 'file_index.sqlite3'),
+                       REVISION_DB_PATH=os.path.join(tmpdir, 'revisions.sqlite3'),
+                       MAX_CONCURRENT_JOBS='0')
+            env.update(overrides)
+            result = subprocess.run([sys.executable, '-m', 'benchmarks.bench_tail_latency', '--mode', mode,
+                                     '--jobs', str(args.jobs), '--concurrent-jobs', str(args.concurrent_jobs)],
+                                    env=env)
+            failed = failed or result.returncode != 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
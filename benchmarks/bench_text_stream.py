@@ -0,0 +1,84 @@
+# 대용량 텍스트 파이프라인 벤치마크: 전체 읽기(기존 방식)와 스트리밍 방식의 최대 메모리/처리량 비교
+# 사용법: python -m benchmarks.bench_text_stream --size-mb 100
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_translator import StubTranslator
+from text_pipeline import ParagraphReader, iter_chunks, split_text
+
+MAX_CHARS = 4000
+WORDS = ['translation', 'document', 'paragraph', 'memory', 'stream', 'file', 'upload', 'server', 'the', 'a']
+
+
+def generate_input(path, size_mb, seed=0):
+    # 문단 길이가 다양한 합성 텍스트 파일 생성
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target:
+            paragraph = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 200)))
+            f.write(paragraph + '\n\n')
+            written += len(paragraph) + 2
+
+
+def run_before(input_path, output_path, translator):
+    # 기존 process_file 방식: 전체 읽기 → 전체 분할 → 전체 번역 결과 보관 → 한 번에 쓰기
+    with open(input_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    translated = [translator.translate(part) for part in split_text(text, MAX_CHARS)]
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("\n\n".join(translated))
+
+
+def run_after(input_path, output_path, translator):
+    # 스트리밍 방식: 문단을 읽는 대로 청크로 묶어 번역하고 바로 기록
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for i, chunk in enumerate(iter_chunks(ParagraphReader(input_path, MAX_CHARS), MAX_CHARS)):
+            if i:
+                f.write("\n\n")
+            f.write(translator.translate(chunk))
+
+
+def run_mode(mode, input_path):
+    # 각 방식을 별도 프로세스에서 실행하여 최대 RSS를 독립적으로 측정
+    output_path = input_path + f'.{mode}.out'
+    translator = StubTranslator()
+    start = time.perf_counter()
+    (run_before if mode == 'before' else run_after)(input_path, output_path, translator)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    size_mb = os.path.getsize(input_path) / (1024 * 1024)
+    print(f'{mode:<7} peak_rss={peak_mb:8.1f}MB time={elapsed:6.2f}s '
+          f'throughput={size_mb / elapsed:6.1f}MB/s calls={translator.calls}')
+    os.remove(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory and throughput of the text pipeline.')
+    parser.add_argument('--size-mb', type=int, default=100)
+    parser.add_argument('--mode', choices=['before', 'after'], help=argparse.SUPPRESS)
+    parser.add_argument('--input', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.input)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_path = os.path.join(tmpdir, 'input.txt')
+        generate_input(input_path, args.size_mb)
+        print(f'input={os.path.getsize(input_path) / (1024 * 1024):.1f}MB max_chars={MAX_CHARS}')
+        for mode in ('before', 'after'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_text_stream', '--mode', mode, '--input', input_path],
+                           check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+# 웹 페이지 번역 벤치마크: 페이지를 PDF로 저장해 올리는 기존 방식(PDF 렌더링 -> pdfminer 레이아웃 추출 -> 상자별 번역)과
+# 본문 블록을 바로 배치 번역하는 URL 작업(process_web_file)을 stub 제공자로 비교
+# 사용법: python -m benchmarks.bench_web_pipeline --pages 20 --latency 0.02 [--render]
+# (--render 없이 실행하거나 WeasyPrint 시스템 라이브러리가 없으면 기존 방식의 PDF는 reportlab으로 만들고
+#  URL 작업의 최종 렌더링 단계는 번역된 HTML을 쓰는 것으로 대신함)
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+WORDS = ['translation', 'document', 'paragraph', 'manual', 'install', 'configure', 'the', 'a', 'server', 'page',
+         'release', 'notes', 'version', 'option', 'default', 'value', 'network', 'request']
+
+
+def sentence(rng, min_words=6, max_words=18):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + '.'
+
+
+def generate_page(rng, index):
+    # 문서 사이트 페이지처럼 메뉴, 제목, 문단, 목록, 코드 블록, 표가 섞인 HTML
+    parts = [f'<h1>Page {index}: {sentence(rng, 2, 5)}</h1>']
+    for section in range(rng.randint(3, 6)):
+        parts.append(f'<h2>{sentence(rng, 2, 5)}</h2>')
+        parts += [f'<p>{" ".join(sentence(rng) for _ in range(rng.randint(2, 5)))}</p>'
+                  for _ in range(rng.randint(2, 5))]
+        parts.append('<ul>' + ''.join(f'<li>{sentence(rng, 3, 8)}</li>' for _ in range(rng.randint(2, 6))) + '</ul>')
+        parts.append(f'<pre>pip install package=={section}.0</pre>')
+        parts.append('<table>' + ''.join(f'<tr><td>{rng.choice(WORDS)}</td><td>{rng.randint(0, 100)}</td></tr>'
+                                         for _ in range(3)) + '</table>')
+    return (f'<html><head><title>Page {index}</title></head><body><nav><a href="/">Home</a></nav>'
+            f'<article>{"".join(parts)}</article></body></html>')
+
+
+def weasyprint_available():
+    try:
+        import weasyprint  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def save_as_pdf(html, path, render):
+    # 기존 방식에서 사용자가 브라우저/webToPdf로 저장해 올리던 PDF
+    import webToPdf
+    markdown_content = webToPdf.html_to_markdown(html)
+    if render:
+        webToPdf.render_pdf(markdown_content, path)
+        return
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+    from xml.sax.saxutils import escape
+    style = getSampleStyleSheet()['BodyText']
+    blocks = [block.strip() for block in markdown_content.split('\n\n') if block.strip()]
+    SimpleDocTemplate(path).build([Paragraph(escape(block), style) for block in blocks])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark web page translation: rendered-PDF upload vs URL job.')
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02, help='stub provider latency per request (s)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--render', action='store_true', help='render PDFs with WeasyPrint')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_web_pipeline_')
+    # app을 불러오기 전에 stub 제공자와 임시 DB·폴더를 사용하도록 설정
+    os.environ.update({
+        'TRANSLATION_PROVIDER': 'stub',
+        'STUB_PROVIDER_LATENCY': str(args.latency),
+        'TRANSLATION_CONCURRENCY': str(args.concurrency),
+        'TRANSLATION_RATE_LIMIT': '1000000',
+        'JOB_DB_PATH': os.path.join(tmpdir, 'jobs.sqlite3'),
+        'CONTENT_STORE_DB_PATH': os.path.join(tmpdir, 'content_store.sqlite3'),
+        'FILE_INDEX_DB_PATH': os.path.join(tmpdir, 'file_index.sqlite3'),
+        'REVISION_DB_PATH': os.path.join(tmpdir, 'revisions.sqlite3'),
+        'TRANSLATION_MEMORY_PATH': os.path.join(tmpdir, 'tm.sqlite3'),
+        'UPLOAD_FOLDER': os.path.join(tmpdir, 'uploads'),
+        'PROCESSED_FOLDER': os.path.join(tmpdir, 'processed'),
+        'CHECKPOINT_FOLDER': os.path.join(tmpdir, 'checkpoints'),
+        'BLOB_FOLDER': os.path.join(tmpdir, 'blobs'),
+        'MAX_CONCURRENT_JOBS': '0',
+    })
+    import app
+    import pdf_engine
+    from metrics import StageTimer
+    from progress import ProgressReporter
+    from translation_memory import TranslationMemory
+
+    render = args.render and weasyprint_available()
+    if not render:
+        def write_html(html_content, output_path, base_url, target_language):
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            return output_path
+        pdf_engine.TASKS['render_html'] = write_html
+
+    reporter = ProgressReporter(lambda event, data, room: None, lambda *args: None, 0)
+    rng = random.Random(0)
+    pages = [generate_page(rng, i) for i in range(args.pages)]
+    print(f'pages={args.pages} latency={args.latency}s concurrency={args.concurrency} '
+          f'render={"weasyprint" if render else "skipped (reportlab PDF / HTML output)"}')
+    print(f'{"mode":<9} {"requests":>8} {"chars":>9} {"time_s":>7}  stages')
+
+    failed = False
+    for mode in ('pdf', 'url'):
+        totals = {}
+        app.provider_stats.reset()
+        # 모드마다 같은 페이지를 처음 번역하도록 새 번역 메모리를 사용
+        app.translation_memory = TranslationMemory(os.path.join(tmpdir, f'tm-{mode}.sqlite3'), 512 * 1024 * 1024,
+                                                   24 * 3600, 10000)
+        start = time.perf_counter()
+        for i, html in enumerate(pages):
+            file_id = str(uuid.uuid4())
+            timer = StageTimer(app.stage_seconds, mode)
+            progress = reporter.job({'id': file_id, 'owner': 'bench', 'file_id': file_id}, timer)
+            if mode == 'pdf':
+                filename = f'page{i}.pdf'
+                filepath = os.path.join(tmpdir, filename)
+                with timer.stage('save_pdf'):
+                    save_as_pdf(html, filepath, render)
+                options = None
+            else:
+                filename = f'page{i}.html'
+                filepath = os.path.join(tmpdir, filename)
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write(html)
+                options = {'url': f'https://docs.example.com/page{i}.html'}
+            try:
+                _, errors = app.process_file(filepath, filename, ['ko'], file_id, progress, options)
+                if errors:
+                    raise RuntimeError(errors)
+            except Exception as e:
+                print(f'{mode:<9} failed: {e}', file=sys.stderr)
+                failed = True
+                break
+            for stage, seconds in timer.breakdown().items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+            for name in os.listdir(app.PROCESSED_FOLDER):
+                if file_id in name:
+                    os.remove(os.path.join(app.PROCESSED_FOLDER, name))
+        elapsed = time.perf_counter() - start
+
+        stats = app.provider_stats.snapshot()
+        stages = ' '.join(f'{stage}={seconds:.2f}' for stage, seconds in totals.items())
+        print(f'{mode:<9} {stats["requests"]:>8} {stats["chars"]:>9} {elapsed:>7.2f}  {stages}')
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
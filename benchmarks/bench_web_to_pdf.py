@@ -0,0 +1,156 @@
+# webToPdf 일괄 변환 벤치마크: 로컬 http.server에 문서 페이지를 띄우고
+# 페이지마다 requests.get(기존 방식)과 세션/동시 요청/조건부 요청 캐시를 쓰는 일괄 모드를 비교
+# 사용법: python -m benchmarks.bench_web_to_pdf --pages 100 --latency 0.05 [--render]
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import webToPdf
+
+WORDS = ['translation', 'document', 'paragraph', 'manual', 'install', 'configure', 'the', 'a', 'server', 'page']
+
+
+def generate_pages(num_pages, seed=0):
+    rng = random.Random(seed)
+    pages = {}
+    for i in range(num_pages):
+        paragraphs = ''.join(f'<p>{" ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 80)))}</p>'
+                             for _ in range(rng.randint(5, 20)))
+        pages[f'/docs/page{i}.html'] = (f'<html><body><nav>menu</nav><article><h1>Page {i}</h1>{paragraphs}'
+                                        f'</article></body></html>').encode('utf-8')
+    return pages
+
+
+class DocsServer(ThreadingHTTPServer):
+    # 응답 지연, 요청 수, 304 응답 수, 동시 연결 수를 기록하는 문서 서버 (ETag 지원)
+    daemon_threads = True
+
+    def __init__(self, pages, latency):
+        super().__init__(('127.0.0.1', 0), DocsHandler)
+        self.pages = pages
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.active = 0
+        self.max_active = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def sitemap(self):
+        base = f'http://127.0.0.1:{self.server_port}'
+        urls = ''.join(f'<url><loc>{base}{path}</loc></url>' for path in self.pages)
+        return f'<urlset xmlns="{webToPdf.SITEMAP_NAMESPACE[1:-1]}">{urls}</urlset>'.encode('utf-8')
+
+
+class DocsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/sitemap.xml':
+            body, etag = server.sitemap(), None
+        elif self.path in server.pages:
+            body = server.pages[self.path]
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        else:
+            self.send_error(404)
+            return
+
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.latency)
+            if etag and self.headers.get('If-None-Match') == etag:
+                with server.lock:
+                    server.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if etag:
+                self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+def run_before(urls, output_dir, render):
+    # 기존 webToPdf 방식: 페이지마다 새 연결로 가져오고 .md 파일을 쓴 뒤 렌더링
+    os.makedirs(output_dir, exist_ok=True)
+    for url in urls:
+        markdown_content = webToPdf.html_to_markdown(requests.get(url).text)
+        output_file = os.path.join(output_dir, webToPdf.output_name(url))
+        with open(output_file.rsplit('.', 1)[0] + '.md', 'w', encoding='utf-8') as f:
+            f.write(markdown_content)
+        if render:
+            webToPdf.markdown_to_pdf(markdown_content, output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark webToPdf batch mode against a local http.server.')
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05, help='server latency per request (s)')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--per-host', type=int, default=8)
+    parser.add_argument('--render', action='store_true', help='also render PDFs (needs WeasyPrint system libraries)')
+    args = parser.parse_args()
+
+    server = DocsServer(generate_pages(args.pages), args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sitemap_url = f'http://127.0.0.1:{server.server_port}/sitemap.xml'
+    print(f'pages={args.pages} latency={args.latency}s workers={args.workers} per_host={args.per_host} '
+          f'render={args.render}')
+    print(f'{"mode":<12} {"time_s":>7} {"requests":>8} {"304s":>5} {"conns":>6} {"max_active":>10} {"failed":>6}')
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        urls = webToPdf.read_url_list(sitemap_url)
+        cache_dir = os.path.join(tmpdir, 'cache')
+
+        def report(label, func):
+            server.requests = server.not_modified = server.max_active = server.connections = 0
+            start = time.perf_counter()
+            failed = func()
+            elapsed = time.perf_counter() - start
+            print(f'{label:<12} {elapsed:>7.2f} {server.requests:>8} {server.not_modified:>5} '
+                  f'{server.connections:>6} {server.max_active:>10} {failed:>6}')
+
+        def before():
+            run_before(urls, os.path.join(tmpdir, 'before'), args.render)
+            return 0
+
+        def batch():
+            results = webToPdf.batch_web_to_pdf(urls, os.path.join(tmpdir, 'batch'), args.workers, args.per_host,
+                                                cache_dir=cache_dir, render=args.render, allow_private=True)
+            return sum(bool(result['error']) for result in results)
+
+        report('before', before)
+        report('batch cold', batch)
+        report('batch warm', batch)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
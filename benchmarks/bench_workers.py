@@ -0,0 +1,171 @@
+# 작업 프로세스 분리 벤치마크: 웹 프로세스와 작업 프로세스를 각각 별도 프로세스로 실행하여
+# 번역 작업이 도는 동안의 HTTP 응답 시간과 Socket.IO 진행 이벤트 전달을 확인
+# 사용법: python -m benchmarks.bench_workers --workers 2 --csv-rows 50000 --files 4
+import argparse
+import csv
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+import socketio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ['soft', 'cotton', 'shirt', 'with', 'long', 'sleeves', 'and', 'blue', 'stripes', 'for', 'summer']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def generate_csv(path, num_rows, seed):
+    # 셀 분류와 CSV 처리로 CPU를 쓰는 파일
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'sku', 'description'])
+        for i in range(num_rows):
+            writer.writerow([i, f'SKU-{rng.randint(0, 999999):06d}',
+                             ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8)))])
+
+
+def serve_web(port):
+    # 벤치마크용 웹 프로세스 (디버그/리로더 없이 실행)
+    import app
+    app.socketio.run(app.app, host='127.0.0.1', port=port, log_output=False)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def run(workers, args, tmpdir):
+    # 데이터베이스와 업로드/결과/체크포인트/원본 폴더를 모두 임시 디렉터리에 두어 실제 데이터와 섞이지 않게 함
+    env = dict(os.environ,
+               JOB_DB_PATH=os.path.join(tmpdir, f'jobs-{workers}.sqlite3'),
+               TRANSLATION_MEMORY_PATH=os.path.join(tmpdir, f'tm-{workers}.sqlite3'),
+               CONTENT_STORE_DB_PATH=os.path.join(tmpdir, f'content-{workers}.sqlite3'),
+               FILE_INDEX_DB_PATH=os.path.join(tmpdir, f'files-{workers}.sqlite3'),
+               REVISION_DB_PATH=os.path.join(tmpdir, f'revisions-{workers}.sqlite3'),
+               UPLOAD_FOLDER=os.path.join(tmpdir, f'uploads-{workers}'),
+               PROCESSED_FOLDER=os.path.join(tmpdir, f'processed-{workers}'),
+               CHECKPOINT_FOLDER=os.path.join(tmpdir, f'checkpoints-{workers}'),
+               BLOB_FOLDER=os.path.join(tmpdir, f'blobs-{workers}'),
+               MESSAGE_QUEUE='sqlite:///' + os.path.join(tmpdir, f'queue-{workers}.sqlite3'),
+               JOB_RUNNER='worker' if workers else 'web',
+               TRANSLATION_PROVIDER='stub',
+               STUB_PROVIDER_LATENCY=str(args.latency),
+               TRANSLATION_RATE_LIMIT='1000',
+               MAX_CONCURRENT_JOBS=str(args.files),
+               MAX_JOBS_PER_USER=str(args.files),
+               PDF_WORKERS='1',
+               SESSION_COOKIE_SECURE='false')
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    processes = [subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_workers', '--serve-web', str(port)],
+                                  cwd=ROOT, env=env)]
+    processes += [subprocess.Popen([sys.executable, 'worker.py'], cwd=ROOT, env=env) for _ in range(workers)]
+
+    # 페이지를 열 때 발급되는 세션 쿠키로 작업 소유자를 식별하므로 모든 요청과 Socket.IO 연결에서 같은 쿠키를 사용
+    client = requests.Session()
+    finished = set()
+    events = []
+    sio = socketio.Client()
+
+    @sio.on('file_progress')
+    def on_progress(data):
+        events.append(data)
+        if 'target_language' not in data and data['percentage'] == 100:
+            finished.add(data['job_id'])
+
+    try:
+        for _ in range(200):
+            try:
+                client.get(base_url + '/', timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        cookie = '; '.join(f'{name}={value}' for name, value in client.cookies.items())
+        sio.connect(base_url, headers={'Cookie': cookie}, transports=['polling'])
+
+        files = []
+        for i in range(args.files):
+            path = os.path.join(tmpdir, f'bench{i}.csv')
+            generate_csv(path, args.csv_rows, seed=i)
+            with open(path, 'rb') as f:
+                response = client.post(base_url + '/upload', files={'files[]': (f'bench{i}.csv', f)})
+            files += response.json()['files']
+
+        start = time.perf_counter()
+        response = client.post(base_url + '/start_translation', json={'files': files, 'target_languages': ['ko']})
+        job_ids = {job['id'] for job in response.json()['jobs']}
+
+        # 작업이 도는 동안 웹 프로세스의 응답 시간을 측정
+        latencies = []
+        deadline = time.time() + args.timeout
+        while finished < job_ids and time.time() < deadline:
+            request_start = time.perf_counter()
+            client.get(base_url + '/jobs', timeout=60)
+            latencies.append(time.perf_counter() - request_start)
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+
+        jobs = client.get(base_url + '/jobs').json()['jobs']
+        completed = sum(job['status'] == 'completed' for job in jobs)
+        print(f'{"worker" if workers else "web":<7} {workers:>7} {len(job_ids):>4} {completed:>9} '
+              f'{len(finished & job_ids):>8} {len(events):>6} {elapsed:>7.2f} '
+              f'{percentile(latencies, 0.5) * 1000:>7.1f} {percentile(latencies, 0.99) * 1000:>7.1f} '
+              f'{max(latencies, default=0) * 1000:>7.1f}')
+        for file in files:
+            client.delete(f'{base_url}/delete_file/{file["id"]}')
+        return completed == len(job_ids) and finished >= job_ids
+    finally:
+        if sio.connected:
+            sio.disconnect()
+        for process in processes:
+            process.send_signal(signal.SIGTERM)
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the web and worker processes separately and measure '
+                                                 'HTTP latency while jobs run.')
+    parser.add_argument('--workers', type=int, default=2, help='worker processes in worker mode')
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--csv-rows', type=int, default=50000)
+    parser.add_argument('--latency', type=float, default=0.005, help='stub provider latency per request (s)')
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--serve-web', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_web:
+        serve_web(args.serve_web)
+        return
+
+    print(f'files={args.files} csv_rows={args.csv_rows} latency={args.latency}s')
+    print(f'{"runner":<7} {"workers":>7} {"jobs":>4} {"completed":>9} {"finished":>8} {"events":>6} '
+          f'{"time_s":>7} {"p50_ms":>7} {"p99_ms":>7} {"max_ms":>7}')
+    ok = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # 웹 프로세스에서 직접 실행(기존 방식)한 뒤 작업 프로세스로 분리하여 실행
+        for workers in (0, args.workers):
+            ok = run(workers, args, tmpdir) and ok
+    if not ok:
+        print('some jobs did not complete or their progress events were not delivered', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# 줄바꿈 마이크로 벤치마크: 빽빽한 페이지의 텍스트 상자들을 기존 wrap_text와 새 줄바꿈 엔진으로 비교
+# 사용법: python -m benchmarks.bench_wrap --boxes 60 --chars 600 --repeat 5
+import argparse
+import random
+import time
+from io import BytesIO
+
+from reportlab.pdfgen import canvas
+
+from line_breaker import wrap_text
+
+FONT_NAME = 'Helvetica'
+FONT_SIZE = 9
+MAX_WIDTH = 480
+LATIN_WORDS = ['translation', 'layout', 'page', 'document', 'rendering', 'width', 'a', 'of', 'the', 'benchmark']
+CJK_TEXT = '번역된문서의레이아웃을유지합니다翻訳された文書のレイアウトを保持します'
+
+
+def legacy_wrap_text(text, canvas, max_width):
+    # 기존 pdf 처리 코드의 wrap_text: 단어를 추가할 때마다 줄 전체 폭을 다시 계산
+    words = text.split()
+    lines = []
+    current_line = []
+    for word in words:
+        test_line = ' '.join(current_line + [word])
+        width = canvas.stringWidth(test_line)
+        if width <= max_width:
+            current_line.append(word)
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+    lines.append(' '.join(current_line))
+    return lines
+
+
+def generate_boxes(num_boxes, chars_per_box, seed=0):
+    # 라틴 문자 상자와 공백 없는 CJK 문자 상자를 섞어서 생성
+    rng = random.Random(seed)
+    boxes = []
+    for i in range(num_boxes):
+        if i % 3 == 2:
+            boxes.append(''.join(rng.choice(CJK_TEXT) for _ in range(chars_per_box // 2)))
+        else:
+            words = []
+            while sum(len(word) + 1 for word in words) < chars_per_box:
+                words.append(rng.choice(LATIN_WORDS))
+            boxes.append(' '.join(words))
+    return boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF line wrapping on dense pages.')
+    parser.add_argument('--boxes', type=int, default=60)
+    parser.add_argument('--chars', type=int, default=600)
+    parser.add_argument('--repeat', type=int, default=5, help='number of pages to wrap')
+    args = parser.parse_args()
+
+    boxes = generate_boxes(args.boxes, args.chars)
+    can = canvas.Canvas(BytesIO())
+    can.setFont(FONT_NAME, FONT_SIZE)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        legacy_lines = [legacy_wrap_text(text, can, MAX_WIDTH) for text in boxes]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        new_lines = [wrap_text(text, FONT_NAME, FONT_SIZE, MAX_WIDTH) for text in boxes]
+    new_time = time.perf_counter() - start
+
+    def overflowing(all_lines):
+        return sum(1 for lines in all_lines for line in lines if can.stringWidth(line) > MAX_WIDTH)
+
+    print(f'pages={args.repeat} boxes/page={args.boxes} chars/box={args.chars}')
+    print(f'before time={legacy_time:.3f}s lines={sum(map(len, legacy_lines))} overflowing={overflowing(legacy_lines)}')
+    print(f'after  time={new_time:.3f}s lines={sum(map(len, new_lines))} overflowing={overflowing(new_lines)}')
+    print(f'speedup {legacy_time / max(new_time, 1e-9):.1f}x')
+
+
+if __name__ == '__main__':
+    main()
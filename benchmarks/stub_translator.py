@@ -0,0 +1,20 @@
+# 벤치마크용 스텁 번역기: 네트워크 대신 고정 지연 후 텍스트를 변환하여 반환
+import threading
+import time
+
+
+class StubTranslator:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.chars = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text):
+        with self._lock:
+            self.calls += 1
+            self.chars += len(text)
+        if self.latency:
+            time.sleep(self.latency)
+        # 줄 단위로 변환하여 배치 구분자(줄바꿈)를 보존
+        return '\n'.join(f'[T]{line}' for line in text.split('\n'))
@@ -0,0 +1,76 @@
+# 번역 체크포인트: 완료된 파트를 작업별 JSON Lines 파일에 기록하여 재시도 시 이어서 번역
+import json
+import logging
+import os
+from threading import Lock
+
+
+def file_fingerprint(filepath, *extra):
+    # 원본 파일이 바뀌었는지 판별하기 위한 지문 (크기, 수정 시각, 분할 설정 등)
+    stat = os.stat(filepath)
+    return ':'.join(str(value) for value in (stat.st_size, stat.st_mtime_ns, *extra))
+
+
+class TranslationCheckpoint:
+    def __init__(self, folder, file_id, target_language, fingerprint, chunk_chars=None):
+        # chunk_chars: 파트를 나눈 청크 크기 (같은 크기로 나눠야 파트 번호가 같은 청크를 가리킴)
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f'{file_id}_{target_language}.jsonl')
+        self.fingerprint = fingerprint
+        self.chunk_chars = chunk_chars
+        self._lock = Lock()
+
+    def _read_header(self, f):
+        header = json.loads(f.readline() or '{}')
+        return header if header.get('fingerprint') == self.fingerprint else None
+
+    def saved_chunk_chars(self):
+        # 지문이 일치하는 체크포인트를 기록할 때 쓴 청크 크기 (없으면 None)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = self._read_header(f)
+        except (OSError, ValueError):
+            return None
+        return header and header.get('chunk_chars')
+
+    def load(self):
+        # 지문이 일치하는 체크포인트에서 {파트 번호: 번역문}을 읽어옴
+        completed = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    header = self._read_header(f)
+                    if header is not None and header.get('chunk_chars') == self.chunk_chars:
+                        for line in f:
+                            try:
+                                record = json.loads(line)
+                            except ValueError:
+                                # 기록 도중 중단된 마지막 줄은 무시
+                                break
+                            completed[record['index']] = record['text']
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable checkpoint ({self.path}): {e}")
+                completed = {}
+
+        # 새로 시작하거나 지문이 다르면 헤더만 있는 체크포인트로 다시 작성
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'fingerprint': self.fingerprint, 'chunk_chars': self.chunk_chars}) + '\n')
+                for index, text in completed.items():
+                    f.write(json.dumps({'index': index, 'text': text}, ensure_ascii=False) + '\n')
+        return completed
+
+    def record(self, index, text):
+        # 번역이 끝난 파트를 즉시 디스크에 기록
+        line = json.dumps({'index': index, 'text': text}, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
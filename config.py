@@ -10,8 +10,86 @@ class Config:
     
     # 현재 스크립트의 디렉토리를 기준으로 절대 경로 설정
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-    UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
-    PROCESSED_FOLDER = os.path.join(BASE_DIR, 'processed')
+    UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', os.path.join(BASE_DIR, 'uploads'))
+    PROCESSED_FOLDER = os.getenv('PROCESSED_FOLDER', os.path.join(BASE_DIR, 'processed'))
+    CHECKPOINT_FOLDER = os.getenv('CHECKPOINT_FOLDER', os.path.join(BASE_DIR, 'checkpoints'))
+    BLOB_FOLDER = os.getenv('BLOB_FOLDER', os.path.join(BASE_DIR, 'blobs'))
+    CONTENT_STORE_DB_PATH = os.getenv('CONTENT_STORE_DB_PATH', os.path.join(BASE_DIR, 'content_store.sqlite3'))
+    FILE_INDEX_DB_PATH = os.getenv('FILE_INDEX_DB_PATH', os.path.join(BASE_DIR, 'file_index.sqlite3'))
+    # 파일별 구간 번역문 저장소 (이전 판의 수정본을 번역할 때 바뀌지 않은 구간 재사용)
+    REVISION_DB_PATH = os.getenv('REVISION_DB_PATH', os.path.join(BASE_DIR, 'revisions.sqlite3'))
+
+    # 파일 정리 설정 (마지막 사용 후 보관 기간, 전체 용량 한도, 정리 주기)
+    # FILE_SWEEPER: 이 프로세스에서 정리 작업을 실행할지 (웹 프로세스를 여러 개 실행하면 하나만 켬, 작업 프로세스는 항상 끔)
+    FILE_SWEEPER = os.getenv('FILE_SWEEPER', 'true').lower() in ('1', 'true', 'yes')
+    FILE_TTL = int(os.getenv('FILE_TTL', 7 * 24 * 3600))
+    STORAGE_QUOTA_BYTES = int(os.getenv('STORAGE_QUOTA_BYTES', 10 * 1024 * 1024 * 1024))
+    FILE_SWEEP_INTERVAL = int(os.getenv('FILE_SWEEP_INTERVAL', 600))
     KOREAN_FONT_PATH = os.getenv('KOREAN_FONT_PATH')
     JAPANESE_FONT_PATH = os.getenv('JAPANESE_FONT_PATH')
-    DEFAULT_FONT_PATH = os.getenv('DEFAULT_FONT_PATH')
\ No newline at end of file
+    DEFAULT_FONT_PATH = os.getenv('DEFAULT_FONT_PATH')
+
+    # 번역 메모리(캐시) 설정
+    TRANSLATION_MEMORY_PATH = os.getenv('TRANSLATION_MEMORY_PATH', os.path.join(BASE_DIR, 'translation_memory.sqlite3'))
+    TRANSLATION_MEMORY_MAX_BYTES = int(os.getenv('TRANSLATION_MEMORY_MAX_BYTES', 512 * 1024 * 1024))
+    TRANSLATION_MEMORY_MAX_AGE = int(os.getenv('TRANSLATION_MEMORY_MAX_AGE', 90 * 24 * 3600))
+    TRANSLATION_MEMORY_LRU_SIZE = int(os.getenv('TRANSLATION_MEMORY_LRU_SIZE', 10000))
+
+    # 번역 제공자 설정 (google 또는 네트워크 없이 동작하는 stub)
+    TRANSLATION_PROVIDER = os.getenv('TRANSLATION_PROVIDER', 'google')
+    STUB_PROVIDER_LATENCY = float(os.getenv('STUB_PROVIDER_LATENCY', 0.05))  # 요청당 지연 시간(초)
+    STUB_PROVIDER_ERROR_RATE = float(os.getenv('STUB_PROVIDER_ERROR_RATE', 0))
+    STUB_PROVIDER_MAX_CHARS = int(os.getenv('STUB_PROVIDER_MAX_CHARS', 5000))
+    STUB_PROVIDER_SEED = int(os.getenv('STUB_PROVIDER_SEED', 0))
+    STUB_PROVIDER_LATENCY_PER_KCHAR = float(os.getenv('STUB_PROVIDER_LATENCY_PER_KCHAR', 0))  # 1000자당 추가 지연(초)
+    STUB_PROVIDER_SPIKE_RATE = float(os.getenv('STUB_PROVIDER_SPIKE_RATE', 0))  # 지연 급증 요청 비율
+    STUB_PROVIDER_SPIKE_LATENCY = float(os.getenv('STUB_PROVIDER_SPIKE_LATENCY', 5))
+
+    # 번역 요청 동시 실행 및 속도 제한 설정
+    TRANSLATION_CONCURRENCY = int(os.getenv('TRANSLATION_CONCURRENCY', 8))
+    TRANSLATION_RATE_LIMIT = float(os.getenv('TRANSLATION_RATE_LIMIT', 5))  # 제공자별 초당 요청 수
+    TRANSLATION_RATE_BURST = int(os.getenv('TRANSLATION_RATE_BURST', 10))
+    TRANSLATION_MAX_RETRIES = int(os.getenv('TRANSLATION_MAX_RETRIES', 3))
+    TRANSLATION_RETRY_BASE_DELAY = float(os.getenv('TRANSLATION_RETRY_BASE_DELAY', 0.5))
+    TRANSLATION_RETRY_MAX_DELAY = float(os.getenv('TRANSLATION_RETRY_MAX_DELAY', 8))
+    # 요청 한 번의 마감 시간(초, 0이면 제한 없음)
+    TRANSLATION_CALL_TIMEOUT = float(os.getenv('TRANSLATION_CALL_TIMEOUT', 30))
+    # 요청 크기 자동 조정(목표 지연 시간 안에 끝나도록 MAX_CHARS ~ TRANSLATION_MIN_CHARS 사이에서 조정),
+    # p95보다 느린 요청의 헤지, 재시도해도 실패한 요청의 분할 재시도
+    TRANSLATION_ADAPTIVE = os.getenv('TRANSLATION_ADAPTIVE', 'true').lower() in ('1', 'true', 'yes')
+    TRANSLATION_TARGET_LATENCY = float(os.getenv('TRANSLATION_TARGET_LATENCY', 3))
+    TRANSLATION_MIN_CHARS = int(os.getenv('TRANSLATION_MIN_CHARS', 500))
+
+    # 작업 큐 설정
+    JOB_DB_PATH = os.getenv('JOB_DB_PATH', os.path.join(BASE_DIR, 'jobs.sqlite3'))
+    MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', 4))
+    MAX_JOBS_PER_USER = int(os.getenv('MAX_JOBS_PER_USER', 2))
+    # 작업 소유자 ID를 담는 세션 쿠키 서명 키 (웹 프로세스를 여러 개 실행하면 모두 같은 값으로 설정,
+    # 비워 두면 시작할 때마다 새로 만들어 재시작 후에는 이전 작업 목록이 보이지 않음)
+    SECRET_KEY = os.getenv('SECRET_KEY') or os.urandom(32).hex()
+    # HTTPS로만 세션 쿠키 전송 (HTTP로 접속하는 개발 환경에서는 false로 설정)
+    SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', 'true').lower() in ('1', 'true', 'yes')
+    # 작업 실행 위치: web(웹 프로세스에서 직접 실행) 또는 worker(별도 작업 프로세스 worker.py에서 실행)
+    JOB_RUNNER = os.getenv('JOB_RUNNER', 'web')
+    # 작업 프로세스가 이 시간(초) 동안 상태를 갱신하지 않으면 그 작업을 다시 큐에 넣음
+    JOB_STALE_AFTER = float(os.getenv('JOB_STALE_AFTER', 30))
+    # 작업 프로세스와 웹 프로세스가 Socket.IO 이벤트를 주고받는 메시지 큐
+    # (예: sqlite:///socketio_queue.sqlite3, redis://localhost:6379/0, 비워 두면 단일 프로세스)
+    MESSAGE_QUEUE = os.getenv('MESSAGE_QUEUE')
+
+    # CSV 스트리밍 설정 (한 번에 읽고 번역하여 기록하는 행 수, 열 종류 추론에 쓰는 표본 행 수)
+    CSV_WINDOW_ROWS = int(os.getenv('CSV_WINDOW_ROWS', 1000))
+    CSV_SAMPLE_ROWS = int(os.getenv('CSV_SAMPLE_ROWS', 200))
+
+    # 웹 페이지 번역 설정 (페이지를 가져올 때 호스트별 최대 연결 수, 가져오는 페이지의 최대 크기)
+    WEB_FETCH_PER_HOST = int(os.getenv('WEB_FETCH_PER_HOST', 4))
+    WEB_FETCH_MAX_BYTES = int(os.getenv('WEB_FETCH_MAX_BYTES', 10 * 1024 * 1024))
+
+    # PDF 페이지 병렬 처리 설정 (작업 프로세스 수가 1 이하이면 웹 프로세스에서 직접 처리)
+    PDF_WORKERS = int(os.getenv('PDF_WORKERS', os.cpu_count() or 1))
+    PDF_PAGES_PER_TASK = int(os.getenv('PDF_PAGES_PER_TASK', 4))
+
+    # 진행 상황 전송 설정 (작업별 초당 최대 전송 횟수, 완료/오류/취소는 항상 바로 전송)
+    PROGRESS_UPDATES_PER_SECOND = float(os.getenv('PROGRESS_UPDATES_PER_SECOND', 4))
+    # 마지막 진행 이벤트에 작업의 단계별 소요 시간(timings)을 포함할지 여부
+    PROGRESS_STAGE_TIMINGS = os.getenv('PROGRESS_STAGE_TIMINGS', 'true').lower() in ('1', 'true', 'yes')
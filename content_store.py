@@ -0,0 +1,159 @@
+# 내용 주소 저장소: 업로드 파일을 해시하면서 디스크에 기록하고 같은 내용은 한 번만 저장하며 번역 결과를 재사용
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from threading import Lock
+
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+def link_or_copy(source, destination):
+    # 하드 링크로 연결하고 지원하지 않는 파일 시스템이면 복사
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+class ContentStore:
+    def __init__(self, blob_folder, db_path):
+        # blob_folder: 내용 해시로 이름 붙인 원본/결과 파일 보관 위치
+        self.blob_folder = blob_folder
+        self.upload_blobs = os.path.join(blob_folder, 'uploads')
+        self.artifact_blobs = os.path.join(blob_folder, 'artifacts')
+        self.tmp_folder = os.path.join(blob_folder, 'tmp')
+        for folder in (self.upload_blobs, self.artifact_blobs, self.tmp_folder):
+            os.makedirs(folder, exist_ok=True)
+
+        self._lock = Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS uploads (
+                file_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )''')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS artifacts (
+                content_hash TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                handler_version TEXT NOT NULL,
+                path TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, target_language, handler_version)
+            )''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_uploads_hash ON uploads (content_hash)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_last_used ON artifacts (last_used)')
+        self._conn.commit()
+
+    def blob_path(self, content_hash):
+        return os.path.join(self.upload_blobs, content_hash[:2], content_hash)
+
+    def save_upload(self, stream, file_id, filename, destination):
+        # 스트림을 조금씩 읽어 해시를 계산하며 임시 파일에 기록한 뒤 내용 해시 위치로 옮기고
+        # destination(uploads/{file_id}_{filename})에는 하드 링크를 만듦
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp_folder, uuid.uuid4().hex)
+        try:
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    block = stream.read(COPY_BLOCK_SIZE)
+                    if not block:
+                        break
+                    digest.update(block)
+                    f.write(block)
+                    size += len(block)
+
+            content_hash = digest.hexdigest()
+            blob_path = self.blob_path(content_hash)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            with self._lock:
+                if os.path.exists(blob_path):
+                    logging.info(f"Upload {filename} matches stored content {content_hash[:12]}")
+                else:
+                    os.replace(tmp_path, blob_path)
+                link_or_copy(blob_path, destination)
+                self._conn.execute('INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)',
+                                   (file_id, content_hash, filename, size, time.time()))
+                self._conn.commit()
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return content_hash
+
+    def content_hash(self, file_id):
+        with self._lock:
+            row = self._conn.execute('SELECT content_hash FROM uploads WHERE file_id = ?', (file_id,)).fetchone()
+        return row[0] if row else None
+
+    def release(self, file_id):
+        # 업로드 기록을 지우고 같은 내용을 참조하는 업로드가 더 없으면 원본 파일을 삭제
+        # (하드 링크 대신 복사한 경우 링크 수로는 판단할 수 없으므로 업로드 기록 수로 판단)
+        # 마지막 참조였으면 그 내용 해시를 반환 (그 외에는 None)
+        with self._lock:
+            row = self._conn.execute('SELECT content_hash FROM uploads WHERE file_id = ?', (file_id,)).fetchone()
+            if not row:
+                return None
+            self._conn.execute('DELETE FROM uploads WHERE file_id = ?', (file_id,))
+            self._conn.commit()
+            remaining = self._conn.execute('SELECT COUNT(*) FROM uploads WHERE content_hash = ?', (row[0],)).fetchone()[0]
+            if remaining:
+                return None
+            blob_path = self.blob_path(row[0])
+            if os.path.exists(blob_path):
+                os.remove(blob_path)
+            return row[0]
+
+    def find_artifact(self, content_hash, target_language, handler_version):
+        # 같은 내용, 대상 언어, 처리기 버전으로 이미 만든 결과 파일의 경로 (없으면 None)
+        key = (content_hash, target_language, handler_version)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT path FROM artifacts WHERE content_hash = ? AND target_language = ? AND handler_version = ?',
+                key).fetchone()
+            if not row or not os.path.exists(row[0]):
+                return None
+            self._conn.execute(
+                'UPDATE artifacts SET last_used = ? WHERE content_hash = ? AND target_language = ? AND handler_version = ?',
+                (time.time(), *key))
+            self._conn.commit()
+        return row[0]
+
+    def save_artifact(self, content_hash, target_language, handler_version, result_path):
+        # 번역 결과를 보관 위치에 하드 링크로 남겨 사용자가 결과를 삭제해도 재사용할 수 있게 함
+        extension = os.path.splitext(result_path)[1]
+        artifact_path = os.path.join(self.artifact_blobs,
+                                     f'{content_hash}_{target_language}_{handler_version}{extension}')
+        with self._lock:
+            if os.path.exists(artifact_path):
+                os.remove(artifact_path)
+            link_or_copy(result_path, artifact_path)
+            now = time.time()
+            self._conn.execute('INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)',
+                               (content_hash, target_language, handler_version, artifact_path, now, now))
+            self._conn.commit()
+        return artifact_path
+
+    def expire_artifacts(self, max_age):
+        # max_age초 동안 재사용되지 않은 보관 결과를 삭제하고 삭제한 개수를 반환
+        with self._lock:
+            rows = self._conn.execute('SELECT path FROM artifacts WHERE last_used < ?',
+                                      (time.time() - max_age,)).fetchall()
+            for (path,) in rows:
+                if os.path.exists(path):
+                    os.remove(path)
+            self._conn.executemany('DELETE FROM artifacts WHERE path = ?', rows)
+            self._conn.commit()
+        if rows:
+            logging.info(f"Expired {len(rows)} stored translation results")
+        return len(rows)
@@ -0,0 +1,123 @@
+# CSV 셀 번역 엔진: 고유 셀만 모아 배치로 번역한 뒤 원래 격자에 다시 매핑
+# 열 종류를 표본으로 추론하여 번역할 열만 고르고, 숫자/날짜/URL/이메일/코드 셀은 번역하지 않음
+import re
+from collections import Counter
+from itertools import islice
+
+from batch_translate import translate_unique, unique_texts
+
+# 셀 종류
+EMPTY = 'empty'
+TEXT = 'text'
+NUMBER = 'number'
+DATE = 'date'
+URL = 'url'
+EMAIL = 'email'
+CODE = 'code'
+SYMBOL = 'symbol'
+
+NUMBER_PATTERN = re.compile(r'^[-+(]?[$€£¥₩]?\s?\d[\d,.\s]*(e[-+]?\d+)?\s?%?\)?$', re.IGNORECASE)
+DATE_PATTERN = re.compile(
+    r'^(\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?\s?(Z|[+-]\d{2}:?\d{2})?)?'
+    r'|\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?)$')
+URL_PATTERN = re.compile(r'^(https?://|ftp://|www\.)\S+$', re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'^[\w.+-]+@[\w-]+(\.[\w-]+)+$')
+# 공백 없이 숫자가 섞인 식별자 (SKU-12345, AB12CD, UUID 등)
+CODE_PATTERN = re.compile(r'^(?=[^\d]*\d)[A-Za-z0-9][\w\-./#:]*$')
+
+# 열을 번역 대상으로 판단하는 텍스트 셀 비율 (비어 있지 않은 표본 셀 기준)
+TEXT_COLUMN_RATIO = 0.5
+
+
+def classify_cell(cell):
+    # 셀 하나의 종류 (TEXT만 번역 대상)
+    value = cell.strip()
+    if not value:
+        return EMPTY
+    if NUMBER_PATTERN.match(value):
+        return NUMBER
+    if DATE_PATTERN.match(value):
+        return DATE
+    if URL_PATTERN.match(value):
+        return URL
+    if EMAIL_PATTERN.match(value):
+        return EMAIL
+    if CODE_PATTERN.match(value):
+        return CODE
+    if not any(ch.isalpha() for ch in value):
+        return SYMBOL
+    return TEXT
+
+
+def infer_columns(header, sample_rows, text_ratio=TEXT_COLUMN_RATIO):
+    # 표본 행으로 열마다 가장 많은 셀 종류와 번역 대상 여부를 추론
+    # [{'index', 'name', 'type', 'translatable'}, ...]
+    width = max([len(header)] + [len(row) for row in sample_rows])
+    columns = []
+    for index in range(width):
+        kinds = Counter(classify_cell(row[index]) for row in sample_rows if index < len(row))
+        kinds.pop(EMPTY, None)
+        filled = sum(kinds.values())
+        if filled:
+            kind = kinds.most_common(1)[0][0]
+            translatable = kinds[TEXT] / filled >= text_ratio
+        else:
+            # 표본에 값이 없는 열은 머리글만 보고 판단
+            kind = EMPTY
+            translatable = index < len(header) and classify_cell(header[index]) == TEXT
+        columns.append({
+            'index': index,
+            'name': header[index] if index < len(header) else '',
+            'type': kind,
+            'translatable': translatable,
+        })
+    return columns
+
+
+def iter_windows(rows, window_rows):
+    # 행 반복자를 최대 window_rows개씩 묶어서 반환 (파일 전체를 메모리에 올리지 않음)
+    rows = iter(rows)
+    while True:
+        window = list(islice(rows, window_rows))
+        if not window:
+            return
+        yield window
+
+
+def selected_cells(rows, columns=None, header=False):
+    # 번역할 열(columns가 None이면 모든 열)의 셀 중 TEXT로 분류된 셀
+    # header: 첫 행이 머리글이면 머리글은 열 선택과 관계없이 모든 열을 번역 (숫자, 날짜 열의 이름도 번역)
+    selected = None if columns is None else set(columns)
+    for row_number, row in enumerate(rows):
+        all_columns = selected is None or (header and row_number == 0)
+        for index, cell in enumerate(row):
+            if (all_columns or index in selected) and classify_cell(cell) == TEXT:
+                yield cell
+
+
+def unique_cells(rows, columns=None, header=False):
+    # 번역할 고유 셀 목록 (여러 언어로 번역할 때 한 번만 계산)
+    return unique_texts(selected_cells(rows, columns, header))
+
+
+def apply_translations(rows, translations, columns=None, header=False):
+    # 번역문을 원래 격자 모양으로 다시 배치 (선택하지 않은 열과 번역하지 않은 셀은 그대로, 머리글은 모든 열)
+    if columns is None:
+        return [[translations.get(cell, cell) for cell in row] for row in rows]
+    selected = set(columns)
+    return [[translations.get(cell, cell) if index in selected or (header and row_number == 0) else cell
+             for index, cell in enumerate(row)]
+            for row_number, row in enumerate(rows)]
+
+
+def translate_rows(rows, translator, max_chars, progress_callback=None, memory=None, executor=None, columns=None):
+    # 모든 행(헤더 포함)의 셀을 번역하고 같은 모양의 격자를 반환
+    translations = translate_unique(
+        translator,
+        unique_cells(rows, columns, header=True),
+        max_chars,
+        progress_callback,
+        memory,
+        executor,
+    )
+    return apply_translations(rows, translations, columns, header=True)
@@ -0,0 +1,122 @@
+# 파일 메타데이터 색인: file_id별 업로드, 체크포인트, 결과 파일의 경로/크기/시각을 SQLite에 기록하고
+# 폴더를 훑지 않고 삭제, 다운로드, 만료(TTL), 디스크 용량 제한(LRU)을 처리
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+
+# 파일 종류
+UPLOAD = 'upload'
+CHECKPOINT = 'checkpoint'
+OUTPUT = 'output'
+
+
+class FileIndex:
+    def __init__(self, db_path):
+        self._lock = Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                file_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                target_language TEXT,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_files_file_id ON files (file_id)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_files_name ON files (name, kind)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_files_accessed ON files (accessed_at)')
+        self._conn.commit()
+
+    def add(self, file_id, kind, path, target_language=None):
+        # 파일을 색인에 등록 (같은 경로가 있으면 크기와 시각을 갱신)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                               (path, os.path.basename(path), file_id, kind, target_language, size, now, now))
+            self._conn.commit()
+
+    def find(self, name, kind=OUTPUT):
+        # 파일 이름으로 색인된 파일을 찾고 마지막 사용 시각을 갱신 (없으면 None)
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM files WHERE name = ? AND kind = ?', (name, kind)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE files SET accessed_at = ? WHERE file_id = ?', (time.time(), row['file_id']))
+            self._conn.commit()
+        return dict(row)
+
+    def get(self, file_id, kind):
+        # file_id의 해당 종류 파일 하나 (없으면 None)
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM files WHERE file_id = ? AND kind = ?', (file_id, kind)).fetchone()
+        return dict(row) if row else None
+
+    def outputs(self, file_id):
+        # file_id의 결과 파일 목록 (대상 언어 순)
+        with self._lock:
+            rows = self._conn.execute('SELECT * FROM files WHERE file_id = ? AND kind = ? ORDER BY target_language',
+                                      (file_id, OUTPUT)).fetchall()
+        return [dict(row) for row in rows]
+
+    def touch(self, file_id):
+        with self._lock:
+            self._conn.execute('UPDATE files SET accessed_at = ? WHERE file_id = ?', (time.time(), file_id))
+            self._conn.commit()
+
+    def remove(self, file_id, kind=None, target_language=None):
+        # file_id의 파일(종류, 대상 언어로 좁힐 수 있음)을 디스크와 색인에서 삭제하고 삭제한 파일 이름을 반환
+        query = 'SELECT path FROM files WHERE file_id = ?'
+        params = [file_id]
+        if kind is not None:
+            query += ' AND kind = ?'
+            params.append(kind)
+        if target_language is not None:
+            query += ' AND target_language = ?'
+            params.append(target_language)
+        deleted = []
+        with self._lock:
+            paths = [row['path'] for row in self._conn.execute(query, params)]
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+                    deleted.append(os.path.basename(path))
+            self._conn.executemany('DELETE FROM files WHERE path = ?', [(path,) for path in paths])
+            self._conn.commit()
+        return deleted
+
+    def total_size(self):
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM files').fetchone()[0]
+
+    def sweep(self, max_age, max_bytes, is_busy=lambda file_id: False):
+        # max_age초 동안 사용되지 않은 파일을 삭제하고, 전체 크기가 max_bytes를 넘으면
+        # 가장 오래 사용되지 않은 file_id부터 삭제 (is_busy(file_id)가 참인 파일은 건너뜀)
+        # 삭제한 file_id 목록을 반환
+        with self._lock:
+            groups = [dict(row) for row in self._conn.execute(
+                'SELECT file_id, MAX(accessed_at) AS accessed_at, SUM(size) AS size '
+                'FROM files GROUP BY file_id ORDER BY accessed_at')]
+        total_bytes = sum(group['size'] for group in groups)
+        cutoff = time.time() - max_age
+        removed = []
+        for group in groups:
+            expired = group['accessed_at'] < cutoff
+            if not expired and total_bytes <= max_bytes:
+                break
+            if is_busy(group['file_id']):
+                continue
+            self.remove(group['file_id'])
+            total_bytes -= group['size']
+            removed.append(group['file_id'])
+        if removed:
+            logging.info(f"Swept {len(removed)} files (remaining {total_bytes} bytes)")
+        return removed
@@ -0,0 +1,72 @@
+# 글꼴 레지스트리: 설정된 TTF 글꼴을 프로세스당 한 번만 읽어 언어별 고유 이름으로 등록하고 글자 폭을 캐시
+import logging
+import os
+from threading import Lock
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from config import Config
+
+# 글꼴 파일이 없을 때 사용하는 reportlab 기본 글꼴 (CJK 글자는 표시되지 않음)
+FALLBACK_FONT_NAME = 'Helvetica'
+
+# 글꼴별로 캐시하는 글자/단어 폭의 최대 개수
+MAX_CACHED_WIDTHS = 100000
+
+
+class FontRegistry:
+    def __init__(self, font_paths, default_font_path):
+        # font_paths: {언어 코드: 글꼴 경로}, 그 외 언어는 default_font_path 사용
+        self.font_paths = font_paths
+        self.default_font_path = default_font_path
+        self._names = {}
+        self._widths = {}
+        self._lock = Lock()
+
+    def font_key(self, target_language):
+        return target_language if self.font_paths.get(target_language) else 'default'
+
+    def font_path(self, target_language):
+        # 대상 언어에 따른 폰트 경로 반환
+        return self.font_paths.get(target_language) or self.default_font_path
+
+    def font_name(self, target_language):
+        # 대상 언어의 글꼴을 처음 요청될 때 한 번만 등록하고 등록된 이름을 반환
+        key = self.font_key(target_language)
+        with self._lock:
+            if key not in self._names:
+                path = self.font_path(target_language)
+                if path and os.path.exists(path):
+                    name = f'target_font_{key}'
+                    pdfmetrics.registerFont(TTFont(name, path))
+                    logging.info(f"Registered font {name}: {path}")
+                else:
+                    logging.warning(f"Font for '{target_language}' not found ({path}); using {FALLBACK_FONT_NAME}")
+                    name = FALLBACK_FONT_NAME
+                self._names[key] = name
+            return self._names[key]
+
+    def width_cache(self, font_name):
+        # 글꼴별 글자/단어 폭 캐시 (글자 크기 1pt 기준)
+        cache = self._widths.get(font_name)
+        if cache is None:
+            with self._lock:
+                cache = self._widths.setdefault(font_name, {})
+        return cache
+
+    def string_width(self, text, font_name, font_size):
+        cache = self.width_cache(font_name)
+        width = cache.get(text)
+        if width is None:
+            if len(cache) >= MAX_CACHED_WIDTHS:
+                cache.clear()
+            width = cache[text] = pdfmetrics.stringWidth(text, font_name, 1)
+        return width * font_size
+
+
+# 프로세스 전체에서 공유하는 레지스트리
+font_registry = FontRegistry(
+    {'ko': Config.KOREAN_FONT_PATH, 'ja': Config.JAPANESE_FONT_PATH},
+    Config.DEFAULT_FONT_PATH,
+)
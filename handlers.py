@@ -0,0 +1,61 @@
+# 파일 형식 처리기 등록부: 확장자별 처리기(처리 함수, 결과 형식 버전, 처리 함수에 넘길 작업 설정)를 찾아 실행
+# 처리기가 쓰는 무거운 모듈(PDF, HTML 라이브러리)은 그 형식의 파일을 처음 처리할 때 불러와서
+# 웹/작업 프로세스 시작과 txt, csv만 번역하는 배포에서는 불러오지 않음
+import importlib
+import logging
+import os
+import time
+from threading import Lock
+
+
+class Handler:
+    def __init__(self, name, version, process, modules=(), options=()):
+        self.name = name
+        # 결과 파일의 내용이 달라지도록 처리기를 바꾸면 올려서 이전 결과를 재사용하지 않게 함
+        self.version = version
+        self.process = process
+        # 처음 실행하기 전에 불러올 모듈 이름
+        self.modules = tuple(modules)
+        # 작업 설정(options) 중 처리 함수에 키워드 인자로 넘길 항목
+        self.options = tuple(options)
+        self.loaded = not self.modules
+        self._lock = Lock()
+
+    def load(self):
+        # 처리기가 쓰는 모듈을 한 번만 불러오고 걸린 시간을 기록
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            start = time.perf_counter()
+            for module in self.modules:
+                importlib.import_module(module)
+            self.loaded = True
+            logging.info(f"Loaded {self.name} handler ({', '.join(self.modules)}) "
+                         f"in {time.perf_counter() - start:.2f}s")
+
+    def __call__(self, filepath, filename, target_languages, file_id, progress, options=None):
+        self.load()
+        kwargs = {key: (options or {}).get(key) for key in self.options}
+        return self.process(filepath, filename, target_languages, file_id, progress, **kwargs)
+
+
+class HandlerRegistry:
+    def __init__(self):
+        self._extensions = {}
+        self._default = None
+
+    def register(self, name, extensions, version, process, modules=(), options=(), default=False):
+        # extensions: 이 처리기로 처리할 확장자 목록 ('.pdf'처럼 점 포함)
+        # default: 등록된 확장자가 아닌 파일을 처리할 처리기
+        handler = Handler(name, version, process, modules, options)
+        for extension in extensions:
+            self._extensions[extension.lower()] = handler
+        if default:
+            self._default = handler
+        return handler
+
+    def get(self, filename):
+        extension = os.path.splitext(filename)[1].lower()
+        return self._extensions.get(extension, self._default)
@@ -0,0 +1,275 @@
+# 번역 작업 큐: SQLite에 작업을 저장하고 전체/사용자별 동시 실행 수를 제한하며 공정하게 스케줄링
+# 여러 프로세스(웹 프로세스, 작업 프로세스)가 같은 데이터베이스를 공유하며 작업을 나눠 가져갈 수 있음
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from collections import Counter
+from threading import Event, Lock
+
+from greenlet import GreenletExit
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+JOB_FIELDS = ('id', 'owner', 'file_id', 'filename', 'filepath', 'target_language',
+              'status', 'error', 'created_at', 'started_at', 'finished_at', 'options')
+
+# 이전 버전의 데이터베이스에 없는 열 (열 이름, 형식)
+ADDED_COLUMNS = (('options', 'TEXT'), ('worker', 'TEXT'), ('heartbeat_at', 'REAL'), ('progress', 'TEXT'))
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class JobScheduler:
+    def __init__(self, db_path, runner, spawn, max_concurrent, max_per_owner, poll_interval=1.0,
+                 stale_after=30.0, worker_id=None):
+        # runner(job): 작업을 실제로 처리하는 함수, 실패 시 예외 발생
+        # spawn(func, *args): 백그라운드 실행 함수 (kill()을 지원하는 스레드 객체 반환)
+        # max_concurrent: 이 프로세스에서 동시에 실행할 작업 수 (사용자별 제한은 모든 프로세스 합계)
+        # stale_after: 실행 중인 작업의 상태 갱신(heartbeat)이 이 시간(초) 동안 없으면
+        #              실행하던 프로세스가 죽은 것으로 보고 다시 큐에 넣음
+        self.runner = runner
+        self.spawn = spawn
+        self.max_concurrent = max_concurrent
+        self.max_per_owner = max_per_owner
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.worker_id = worker_id or default_worker_id()
+        self._running = {}  # job_id -> (owner, 스레드)
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._started = False
+        self._stopping = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                file_id TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                filepath TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                options TEXT,
+                worker TEXT,
+                heartbeat_at REAL,
+                progress TEXT
+            )''')
+        # 이전 버전에서 만든 데이터베이스에는 없는 열을 추가
+        existing_columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        for name, column_type in ADDED_COLUMNS:
+            if name not in existing_columns:
+                self._conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {column_type}')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_owner_created ON jobs (owner, created_at)')
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor
+
+    def _fetch(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def submit(self, owner, file_id, filename, filepath, target_language, options=None):
+        # 작업을 큐에 추가하고 작업 정보를 반환
+        # options: 처리기별 추가 설정 (JSON 문자열, 예: CSV 번역 열 선택)
+        job = {
+            'id': str(uuid.uuid4()),
+            'owner': owner,
+            'file_id': file_id,
+            'filename': filename,
+            'filepath': filepath,
+            'target_language': target_language,
+            'status': QUEUED,
+            'error': None,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'options': options,
+        }
+        self._execute(f'INSERT INTO jobs ({", ".join(JOB_FIELDS)}) VALUES ({", ".join("?" * len(JOB_FIELDS))})',
+                      tuple(job[field] for field in JOB_FIELDS))
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id):
+        jobs = self._fetch('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        return jobs[0] if jobs else None
+
+    def list_jobs(self, owner, limit=100):
+        # 사용자의 최근 작업 목록 (최신순)
+        return self._fetch('SELECT * FROM jobs WHERE owner = ? ORDER BY created_at DESC LIMIT ?', (owner, limit))
+
+    def active_file_ids(self):
+        # 대기 중이거나 실행 중인 작업의 file_id 집합 (정리 작업에서 제외할 파일)
+        rows = self._fetch('SELECT DISTINCT file_id FROM jobs WHERE status IN (?, ?)', (QUEUED, RUNNING))
+        return {row['file_id'] for row in rows}
+
+    def queue_depth(self):
+        return self._fetch('SELECT COUNT(*) AS count FROM jobs WHERE status = ?', (QUEUED,))[0]['count']
+
+    def active_count(self):
+        with self._lock:
+            return len(self._running)
+
+    def save_progress(self, job_id, progress):
+        # 작업의 가장 최근 진행 상황 목록 (다른 프로세스에서 실행 중인 작업도 조회할 수 있도록 저장)
+        self._execute('UPDATE jobs SET progress = ? WHERE id = ?', (json.dumps(progress), job_id))
+
+    def saved_progress(self, job):
+        return json.loads(job.get('progress') or '[]')
+
+    def cancel(self, job_id):
+        # 대기 중인 작업은 취소 상태로 바꾸고, 실행 중인 작업은 스레드를 중단
+        # (다른 프로세스에서 실행 중이면 취소 상태로 바꾸고, 그 프로세스가 상태 갱신 중에 발견하여 중단)
+        job = self.get(job_id)
+        if not job or job['status'] in FINISHED_STATUSES:
+            return False
+        if job['status'] == QUEUED:
+            cursor = self._execute('UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?',
+                                   (CANCELLED, time.time(), job_id, QUEUED))
+            if cursor.rowcount:
+                return True
+        with self._lock:
+            running = self._running.get(job_id)
+        if running:
+            running[1].kill()
+            with self._lock:
+                # 시작 전에 중단된 스레드는 정리 코드가 실행되지 않으므로 여기서 마무리
+                not_started = self._running.pop(job_id, None) is not None
+            if not_started:
+                self._finish(job_id, CANCELLED)
+                self._wakeup.set()
+            return True
+        cursor = self._execute('UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?',
+                               (CANCELLED, time.time(), job_id, RUNNING))
+        return bool(cursor.rowcount)
+
+    def recover(self):
+        # 상태 갱신이 끊긴(실행하던 프로세스가 죽은) 작업을 다시 큐에 넣음
+        cursor = self._execute(
+            'UPDATE jobs SET status = ?, started_at = NULL, worker = NULL '
+            'WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)',
+            (QUEUED, RUNNING, time.time() - self.stale_after))
+        if cursor.rowcount:
+            logging.info(f"Re-queued {cursor.rowcount} unfinished jobs")
+
+    def heartbeat(self):
+        # 이 프로세스에서 실행 중인 작업의 상태를 갱신하고, 다른 프로세스에서 취소된 작업은 중단
+        with self._lock:
+            running = dict(self._running)
+        if not running:
+            return
+        placeholders = ', '.join('?' * len(running))
+        self._execute(f'UPDATE jobs SET heartbeat_at = ? WHERE id IN ({placeholders}) AND status = ?',
+                      (time.time(), *running, RUNNING))
+        cancelled = self._fetch(f'SELECT id FROM jobs WHERE id IN ({placeholders}) AND status = ?',
+                                (*running, CANCELLED))
+        for row in cancelled:
+            logging.info(f"Job cancelled by another process: {row['id']}")
+            running[row['id']][1].kill()
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self.recover()
+        self.spawn(self._dispatch_loop)
+
+    def stop(self):
+        # 새 작업을 가져오지 않고 실행 중인 작업은 중단하여 다른 프로세스가 이어서 처리하도록 다시 큐에 넣음
+        self._stopping = True
+        with self._lock:
+            running = list(self._running.values())
+        for _, thread in running:
+            thread.kill()
+
+    def _dispatch_loop(self):
+        while not self._stopping:
+            try:
+                self.heartbeat()
+                self.recover()
+                self._dispatch()
+            except Exception as e:
+                logging.error(f"Job dispatch error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _next_job(self, queued):
+        # 공정 분배: 실행 중인 작업이 가장 적은 사용자의 가장 오래된 작업을 선택
+        # (사용자별 실행 중인 작업 수는 모든 프로세스의 작업을 합쳐서 계산)
+        running_by_owner = Counter({row['owner']: row['count'] for row in self._fetch(
+            'SELECT owner, COUNT(*) AS count FROM jobs WHERE status = ? GROUP BY owner', (RUNNING,))})
+        candidates = [job for job in queued if running_by_owner[job['owner']] < self.max_per_owner]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda job: (running_by_owner[job['owner']], job['created_at']))
+
+    def _dispatch(self):
+        while not self._stopping and self.active_count() < self.max_concurrent:
+            queued = self._fetch('SELECT * FROM jobs WHERE status = ? ORDER BY created_at', (QUEUED,))
+            job = self._next_job(queued)
+            if job is None:
+                return
+            # 여러 프로세스가 같은 작업을 가져가지 않도록 대기 상태일 때만 실행 상태로 바꿈
+            now = time.time()
+            cursor = self._execute(
+                'UPDATE jobs SET status = ?, started_at = ?, worker = ?, heartbeat_at = ? WHERE id = ? AND status = ?',
+                (RUNNING, now, self.worker_id, now, job['id'], QUEUED))
+            if not cursor.rowcount:
+                continue
+            with self._lock:
+                # 스레드가 등록되기 전에 끝나는 경우를 막기 위해 잠금 안에서 실행
+                self._running[job['id']] = (job['owner'], self.spawn(self._run_job, job))
+
+    def _finish(self, job_id, status, error=None):
+        # 다른 프로세스에서 이미 취소한 작업의 상태는 덮어쓰지 않음
+        self._execute('UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?',
+                      (status, error, time.time(), job_id, RUNNING))
+
+    def _requeue(self, job_id):
+        self._execute('UPDATE jobs SET status = ?, started_at = NULL, worker = NULL WHERE id = ? AND status = ?',
+                      (QUEUED, job_id, RUNNING))
+
+    def _run_job(self, job):
+        try:
+            self.runner(job)
+            self._finish(job['id'], COMPLETED)
+        except GreenletExit:
+            if self._stopping:
+                logging.info(f"Job re-queued on shutdown: {job['id']}")
+                self._requeue(job['id'])
+            else:
+                logging.info(f"Job cancelled: {job['id']}")
+                self._finish(job['id'], CANCELLED)
+        except Exception as e:
+            logging.error(f"Job failed ({job['id']}): {e}")
+            self._finish(job['id'], FAILED, str(e))
+        finally:
+            with self._lock:
+                self._running.pop(job['id'], None)
+            self._wakeup.set()
@@ -0,0 +1,95 @@
+# 줄바꿈 엔진: 캐시된 글자 폭으로 줄 너비를 누적 계산하며 CJK는 글자 단위, 그 외는 단어 단위로 줄을 나눔
+import re
+
+from font_registry import font_registry
+
+# 줄의 맨 앞에 오면 안 되는 닫는 문장 부호 (앞 단위에 붙여서 함께 이동)
+NO_LINE_START = set('.,;:!?%)]}>»”’、。，．：；！？）］｝〉》」』】〕〗〙〛ー々ぁぃぅぇぉっゃゅょゎァィゥェォッャュョヮヵヶ')
+# 줄의 맨 끝에 오면 안 되는 여는 문장 부호 (뒤 단위에 붙여서 함께 이동)
+NO_LINE_END = set('([{<«“‘（［｛〈《「『【〔〖〘〚')
+
+CJK_RANGES = (
+    (0x1100, 0x11FF),    # 한글 자모
+    (0x2E80, 0x2FDF),    # CJK 부수
+    (0x3000, 0x303F),    # CJK 기호 및 문장 부호
+    (0x3040, 0x30FF),    # 히라가나, 가타카나
+    (0x3130, 0x318F),    # 한글 호환 자모
+    (0x31F0, 0x31FF),    # 가타카나 확장
+    (0x3400, 0x4DBF),    # CJK 통합 한자 확장 A
+    (0x4E00, 0x9FFF),    # CJK 통합 한자
+    (0xAC00, 0xD7AF),    # 한글 음절
+    (0xF900, 0xFAFF),    # CJK 호환 한자
+    (0xFF00, 0xFFEF),    # 전각/반각 문자
+    (0x20000, 0x2FA1F),  # CJK 통합 한자 확장 B 이후
+)
+
+CJK_CLASS = ''.join(f'{chr(start)}-{chr(end)}' for start, end in CJK_RANGES)
+# (앞의 공백, CJK 한 글자 또는 공백/CJK가 아닌 글자의 연속)
+TOKEN_PATTERN = re.compile(f'(\\s*)([{CJK_CLASS}]|[^\\s{CJK_CLASS}]+)')
+
+
+def is_cjk(char):
+    code = ord(char)
+    return any(start <= code <= end for start, end in CJK_RANGES)
+
+
+def tokenize(text):
+    # 줄을 나눌 수 있는 단위로 분리: (단위, 앞에 공백이 있었는지)
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        space, token = match.groups()
+        # 앞에 공백이 없는 닫는 문장 부호는 앞 단위에, 여는 문장 부호 뒤의 단위는 그 부호에 붙임
+        # (첫/마지막 글자로 먼저 걸러서 대부분의 단위는 바로 추가)
+        if tokens and not space and (
+                (token[0] in NO_LINE_START and all(char in NO_LINE_START for char in token))
+                or (tokens[-1][0][-1] in NO_LINE_END and all(char in NO_LINE_END for char in tokens[-1][0]))):
+            previous, previous_space = tokens[-1]
+            tokens[-1] = (previous + token, previous_space)
+        else:
+            tokens.append((token, bool(space)))
+    return tokens
+
+
+def wrap_text(text, font_name, font_size, max_width):
+    # 텍스트를 max_width에 맞게 여러 줄로 나눔 (명시적인 줄바꿈은 유지)
+    # 폭은 글꼴별 캐시(1pt 기준)에서 가져오므로 max_width를 글자 크기로 나누어 비교
+    cache = font_registry.width_cache(font_name)
+    measure = font_registry.string_width
+    limit = max_width / font_size
+    space_width = measure(' ', font_name, 1)
+    lines = []
+
+    for paragraph in text.split('\n'):
+        line = []
+        line_width = 0.0
+        for token, space_before in tokenize(paragraph):
+            token_width = cache.get(token)
+            if token_width is None:
+                token_width = measure(token, font_name, 1)
+            gap = space_width if space_before and line else 0.0
+
+            if line and line_width + gap + token_width > limit:
+                lines.append(''.join(line))
+                line = []
+                line_width = 0.0
+                gap = 0.0
+
+            if token_width > limit and len(token) > 1:
+                # 한 줄보다 긴 단위는 글자 단위로 잘라서 배치
+                for char in token:
+                    char_width = measure(char, font_name, 1)
+                    if line and line_width + char_width > limit:
+                        lines.append(''.join(line))
+                        line = []
+                        line_width = 0.0
+                    line.append(char)
+                    line_width += char_width
+                continue
+
+            if gap:
+                line.append(' ')
+            line.append(token)
+            line_width += gap + token_width
+
+        lines.append(''.join(line))
+    return lines
@@ -0,0 +1,81 @@
+# Socket.IO 메시지 큐: 작업 프로세스가 보낸 이벤트를 웹 프로세스가 받아 브라우저로 전달
+# Redis 등 외부 서비스 없이 같은 디스크(또는 공유 파일 시스템)의 SQLite 파일을 공유하는 게시/구독 관리자를 제공하고
+# redis:// 등 그 밖의 주소는 Flask-SocketIO의 기본 메시지 큐 관리자를 사용
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+import socketio
+
+SQLITE_SCHEME = 'sqlite:///'
+
+# 전달된 메시지를 보관하는 시간 (초, 지난 메시지는 게시할 때 정리)
+MESSAGE_RETENTION = 60
+CLEANUP_INTERVAL = 10
+
+
+class SQLiteManager(socketio.PubSubManager):
+    # sqlite:///상대경로 또는 sqlite:////절대경로 형식의 주소를 사용
+    name = 'sqlite'
+
+    def __init__(self, url, channel='flask-socketio', write_only=False, logger=None, json=None,
+                 poll_interval=0.05):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.db_path = url[len(SQLITE_SCHEME):]
+        self.poll_interval = poll_interval
+        self._lock = Lock()
+        self._conn = None
+        self._cleaned_at = 0.0
+
+    def _connection(self):
+        # 처음 사용할 때 연결 (작업 프로세스가 fork되는 경우 연결을 공유하지 않도록)
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )''')
+            self._conn.commit()
+        return self._conn
+
+    def _publish(self, data):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute('INSERT INTO messages (channel, payload, created_at) VALUES (?, ?, ?)',
+                         (self.channel, json.dumps(data), now))
+            if now - self._cleaned_at > CLEANUP_INTERVAL:
+                self._cleaned_at = now
+                conn.execute('DELETE FROM messages WHERE created_at < ?', (now - MESSAGE_RETENTION,))
+            conn.commit()
+
+    def _listen(self):
+        # 구독을 시작한 뒤에 게시된 메시지만 순서대로 전달
+        with self._lock:
+            last_id = self._connection().execute('SELECT COALESCE(MAX(id), 0) FROM messages').fetchone()[0]
+        while True:
+            with self._lock:
+                rows = self._connection().execute(
+                    'SELECT id, payload FROM messages WHERE id > ? AND channel = ? ORDER BY id',
+                    (last_id, self.channel)).fetchall()
+            for row_id, payload in rows:
+                last_id = row_id
+                yield json.loads(payload)
+            if not rows:
+                self.server.sleep(self.poll_interval)
+
+
+def message_queue_options(url, channel='flask-socketio'):
+    # SocketIO(...)에 넘길 메시지 큐 설정 (주소가 없으면 단일 프로세스로 동작)
+    if not url:
+        return {}
+    if url.startswith(SQLITE_SCHEME):
+        return {'client_manager': SQLiteManager(url, channel=channel)}
+    return {'message_queue': url, 'channel': channel}
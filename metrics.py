@@ -0,0 +1,186 @@
+# 경량 계측: 카운터, 게이지, 히스토그램을 메모리에 모아 Prometheus 텍스트 형식으로 내보내고
+# 작업별 단계(read, split/extract, translate, render, write) 시간을 측정
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+# 초 단위 기본 구간 (짧은 요청부터 수 분 걸리는 작업 단계까지)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, help, labelnames=(), func=None):
+        # func가 주어지면 내보낼 때마다 호출하여 현재 값을 읽음 (라벨 없는 지표만)
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.func = func
+        self._values = {}
+        self._lock = Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple((name, labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        if self.func is not None:
+            return [(self.name, (), self.func())]
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type}']
+        for name, labels, value in self.samples():
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, state in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, state['counts']):
+                    cumulative += count
+                    samples.append((f'{self.name}_bucket', key + (('le', _format_value(bound)),), cumulative))
+                samples.append((f'{self.name}_sum', key, state['sum']))
+                samples.append((f'{self.name}_count', key, state['count']))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=(), func=None):
+        return self.register(Counter(name, help, labelnames, func))
+
+    def gauge(self, name, help, labelnames=(), func=None):
+        return self.register(Gauge(name, help, labelnames, func))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self):
+        # Prometheus 텍스트 형식 (버전 0.0.4)
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimer:
+    # 한 작업의 단계별 소요 시간을 누적하고 끝나면 단계 히스토그램에 기록
+    # 모든 대상 언어가 공유하는 단계(읽기, 분할)는 target_language 레이블을 비워 두고,
+    # 언어별 단계(번역, 렌더링, 기록)는 language()로 얻은 언어별 측정기에 누적
+    def __init__(self, histogram, file_type, target_language=''):
+        self.histogram = histogram
+        self.file_type = file_type
+        self.target_language = target_language
+        self.totals = {}
+        self._languages = {}
+
+    def language(self, target_language):
+        if target_language not in self._languages:
+            self._languages[target_language] = StageTimer(self.histogram, self.file_type, target_language)
+        return self._languages[target_language]
+
+    def add(self, stage, seconds):
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def timed_iter(self, stage, iterable):
+        # 반복자에서 다음 항목을 꺼내는 데 걸린 시간을 단계 시간으로 누적 (스트리밍 읽기용)
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - start)
+                return
+            self.add(stage, time.perf_counter() - start)
+            yield item
+
+    def breakdown(self):
+        # {단계: 초} (언어별 단계는 모든 언어의 합, 밀리초 단위로 반올림)
+        totals = dict(self.totals)
+        for timer in self._languages.values():
+            for stage, seconds in timer.totals.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return {stage: round(seconds, 3) for stage, seconds in totals.items()}
+
+    def observe(self):
+        for stage, seconds in self.totals.items():
+            self.histogram.observe(seconds, stage=stage, file_type=self.file_type,
+                                   target_language=self.target_language)
+        for timer in self._languages.values():
+            timer.observe()
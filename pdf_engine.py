@@ -0,0 +1,249 @@
+# PDF 엔진: 레이아웃 추출과 번역 오버레이 렌더링(웹 페이지는 WeasyPrint 렌더링)을 페이지 단위로 나누어 별도 프로세스에서 실행
+import atexit
+import os
+import pickle
+import struct
+import sys
+from io import BytesIO
+from threading import Lock
+
+from PyPDF2 import PdfReader, PdfWriter
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextBox, LTChar
+from reportlab.lib.colors import red
+from reportlab.pdfgen import canvas
+
+from font_registry import font_registry
+from line_breaker import wrap_text
+
+LINE_SPACING = 1.2
+
+# 메시지 길이 헤더 (부호 없는 8바이트 정수)
+HEADER = struct.Struct('!Q')
+
+
+def get_average_font_size(textbox):
+    sizes = [char.size for char in textbox if isinstance(char, LTChar)]
+    return sum(sizes) / len(sizes) if sizes else 12
+
+
+def extract_layouts(filepath, page_numbers):
+    # 지정한 페이지들의 텍스트 상자(텍스트, 위치, 글자 크기)와 페이지 크기를 추출
+    pages = []
+    for layout in extract_pages(filepath, page_numbers=page_numbers):
+        boxes = []
+        for element in layout:
+            if isinstance(element, LTTextBox):
+                text = element.get_text().strip()
+                if text:
+                    x0, _, _, y1 = element.bbox
+                    boxes.append({'text': text, 'x': x0, 'top': y1, 'font_size': get_average_font_size(element)})
+        pages.append({'width': layout.width, 'height': layout.height, 'boxes': boxes})
+    return pages
+
+
+def render_overlays(pages, translations, target_language):
+    # 페이지별로 번역문을 그린 오버레이 PDF(바이트)를 생성
+    # 글꼴은 프로세스당 한 번만 등록되고 언어별로 고유한 이름을 가짐
+    font_name = font_registry.font_name(target_language)
+    overlays = []
+    for page, page_translations in zip(pages, translations):
+        packet = BytesIO()
+        can = canvas.Canvas(packet, pagesize=(page['width'], page['height']))
+        for box, translated_text in zip(page['boxes'], page_translations):
+            font_size = box['font_size']
+            can.setFont(font_name, font_size)
+            can.setFillColor(red)
+
+            # 텍스트 상자의 윗부분부터 아래로 여러 줄로 나누어 그리기
+            lines = wrap_text(translated_text, font_name, font_size, page['width'] - box['x'])
+            for i, line in enumerate(lines):
+                can.drawString(box['x'], box['top'] - font_size - i * font_size * LINE_SPACING, line)
+        can.save()
+        overlays.append(packet.getvalue())
+    return overlays
+
+
+def merge_overlays(filepath, overlays, output_path):
+    # 원본 페이지 위에 오버레이를 순서대로 합쳐서 저장
+    pdf_reader = PdfReader(filepath)
+    pdf_writer = PdfWriter()
+    for page, overlay in zip(pdf_reader.pages, overlays):
+        page.merge_page(PdfReader(BytesIO(overlay)).pages[0])
+        pdf_writer.add_page(page)
+    with open(output_path, 'wb') as f:
+        pdf_writer.write(f)
+
+
+def count_pages(filepath):
+    return len(PdfReader(filepath).pages)
+
+
+def render_html(html_content, output_path, base_url, target_language):
+    # 번역한 웹 페이지 HTML을 WeasyPrint로 렌더링 (설정된 대상 언어 글꼴이 있으면 본문 글꼴로 사용)
+    from pathlib import Path
+
+    import webToPdf
+
+    font_path = font_registry.font_path(target_language)
+    extra_css = None
+    allowed_files = ()
+    if font_path and os.path.exists(font_path):
+        extra_css = (f"@font-face {{ font-family: 'target-font'; src: url('{Path(font_path).resolve().as_uri()}'); }}"
+                     " body { font-family: 'target-font', Arial, sans-serif; }")
+        # 렌더링할 때 읽을 수 있는 로컬 파일은 이 글꼴 파일뿐
+        allowed_files = (font_path,)
+    return webToPdf.render_html(html_content, output_path, base_url, extra_css, allowed_files)
+
+
+# 작업 프로세스에서 실행할 수 있는 함수 목록
+TASKS = {
+    'extract_layouts': extract_layouts,
+    'render_overlays': render_overlays,
+    'render_html': render_html,
+}
+
+
+def _read_message(stream):
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    (length,) = HEADER.unpack(header)
+    data = b''
+    while len(data) < length:
+        chunk = stream.read(length - len(data))
+        if not chunk:
+            raise EOFError('PDF worker pipe closed')
+        data += chunk
+    return pickle.loads(data)
+
+
+def _write_message(stream, message):
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def serve_worker():
+    # 작업 프로세스 본체: 표준 입력으로 (함수 이름, 인자)를 받아 결과를 표준 출력으로 반환
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    # 라이브러리의 print 출력이 결과 스트림을 오염시키지 않도록 표준 출력을 표준 오류로 돌림
+    sys.stdout = sys.stderr
+    while True:
+        message = _read_message(stdin)
+        if message is None:
+            return
+        task_name, args = message
+        try:
+            _write_message(stdout, (True, TASKS[task_name](*args)))
+        except Exception as e:
+            _write_message(stdout, (False, f'{type(e).__name__}: {e}'))
+
+
+class PdfWorkerPool:
+    # 페이지 처리를 `python -m pdf_engine` 작업 프로세스들에 분배하는 프로세스 풀
+    # (eventlet이 threading을 패치한 환경에서도 동작하도록 파이프로 직접 통신)
+    def __init__(self, size):
+        self.size = size
+        self._idle = None
+        self._processes = []
+        self._lock = Lock()
+
+    def _start_worker(self):
+        from eventlet.green import subprocess
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'pdf_engine'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._processes.append(process)
+        return process
+
+    def _ensure_started(self):
+        from eventlet.queue import LightQueue
+        with self._lock:
+            if self._idle is None:
+                self._idle = LightQueue()
+                for _ in range(self.size):
+                    self._idle.put(self._start_worker())
+
+    def _run(self, task):
+        task_name, args = task
+        process = self._idle.get()
+        try:
+            _write_message(process.stdin, (task_name, args))
+            result = _read_message(process.stdout)
+        except BaseException:
+            # 통신이 끊기거나 작업이 취소된 경우 상태를 알 수 없으므로 새 프로세스로 교체
+            process.kill()
+            self._processes.remove(process)
+            self._idle.put(self._start_worker())
+            raise
+        self._idle.put(process)
+        if result is None:
+            raise RuntimeError('PDF worker exited unexpectedly')
+        ok, value = result
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    def map(self, task_name, arg_lists):
+        # 인자 목록마다 작업을 실행하고 결과를 입력 순서대로 반환 (크기가 1 이하이면 현재 프로세스에서 실행)
+        if self.size <= 1:
+            return [TASKS[task_name](*args) for args in arg_lists]
+        from eventlet.greenpool import GreenPool
+        self._ensure_started()
+        pool = GreenPool(self.size)
+        return list(pool.imap(self._run, [(task_name, args) for args in arg_lists]))
+
+    def close(self):
+        for process in self._processes:
+            process.kill()
+        self._processes = []
+        self._idle = None
+
+
+def page_ranges(total_pages, pages_per_task):
+    # 페이지 번호(0부터)를 작업 단위로 나눔
+    return [list(range(start, min(start + pages_per_task, total_pages)))
+            for start in range(0, total_pages, pages_per_task)]
+
+
+def extract_document(pool, filepath, total_pages, pages_per_task):
+    # 페이지 범위별로 레이아웃을 병렬 추출하고 페이지 순서대로 합침
+    ranges = page_ranges(total_pages, pages_per_task)
+    results = pool.map('extract_layouts', [(filepath, page_numbers) for page_numbers in ranges])
+    return [page for pages in results for page in pages]
+
+
+def render_document(pool, pages, translations, target_language, pages_per_task):
+    # 페이지 범위별로 오버레이를 병렬 렌더링하고 페이지 순서대로 합침
+    ranges = page_ranges(len(pages), pages_per_task)
+    arg_lists = [([pages[i] for i in page_numbers], [translations[i] for i in page_numbers], target_language)
+                 for page_numbers in ranges]
+    return [overlay for overlays in pool.map('render_overlays', arg_lists) for overlay in overlays]
+
+
+def render_web_page(pool, html_content, output_path, base_url, target_language):
+    # 웹 페이지 PDF 렌더링도 작업 프로세스에서 실행하여 웹 프로세스의 이벤트 루프를 막지 않음
+    return pool.map('render_html', [(html_content, output_path, base_url, target_language)])[0]
+
+
+_pools = []
+
+
+@atexit.register
+def _close_pools():
+    for pool in _pools:
+        pool.close()
+
+
+def create_pool(size):
+    pool = PdfWorkerPool(size)
+    _pools.append(pool)
+    return pool
+
+
+if __name__ == '__main__':
+    serve_worker()
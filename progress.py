@@ -0,0 +1,141 @@
+# 진행 상황 전송: 작업 소유자의 방(room)으로만 보내고, 작업별 초당 전송 횟수를 제한하며 마지막 상태를 보관
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from threading import Lock
+
+PROGRESS_EVENT = 'file_progress'
+
+# 재접속한 클라이언트가 조회할 수 있도록 보관하는 끝난 작업 상태의 최대 개수
+MAX_FINISHED_STATES = 1000
+
+
+def owner_room(owner):
+    return f'owner:{owner}'
+
+
+class ProgressReporter:
+    def __init__(self, emit, spawn_after, max_updates_per_second, clock=time.monotonic, include_timings=False):
+        # emit(event, data, room): 실제 전송 함수
+        # spawn_after(seconds, func, *args): 지연 실행 함수 (cancel()을 지원하는 객체 반환)
+        # max_updates_per_second: 작업별 초당 최대 전송 횟수 (0 이하이면 제한 없음)
+        # include_timings: 마지막 이벤트에 작업의 단계별 소요 시간(timings)을 포함할지 여부
+        self.emit = emit
+        self.include_timings = include_timings
+        self.spawn_after = spawn_after
+        self.interval = 1.0 / max_updates_per_second if max_updates_per_second > 0 else 0.0
+        self.clock = clock
+        # 대상 언어별 진행 상황은 따로 묶어서 전송 (target_language가 없는 이벤트는 작업 전체에 해당)
+        self._active = {}  # (job_id, target_language) -> {'room', 'latest', 'last_sent', 'timer'}
+        self._finished = OrderedDict()  # job_id -> {target_language: 마지막 상태}
+        self._lock = Lock()
+        self.sent = 0
+        self.coalesced = 0
+
+    def job(self, job, timer=None):
+        return JobProgress(self, job, timer)
+
+    def update(self, job, data):
+        # 중간 진행 상황: 최근 전송 후 간격이 지나지 않았으면 마지막 값만 남겨 두었다가 한 번에 전송
+        key = (job['id'], data.get('target_language'))
+        with self._lock:
+            state = self._active.get(key)
+            if state is None:
+                state = self._active[key] = {'room': owner_room(job['owner']), 'latest': None,
+                                             'last_sent': None, 'timer': None}
+            state['latest'] = data
+            if state['timer'] is not None:
+                self.coalesced += 1
+                return
+            now = self.clock()
+            wait = 0.0 if state['last_sent'] is None else state['last_sent'] + self.interval - now
+            if wait > 0:
+                self.coalesced += 1
+                state['timer'] = self.spawn_after(wait, self._flush, key)
+                return
+            state['last_sent'] = now
+            self.sent += 1
+        self.emit(PROGRESS_EVENT, data, state['room'])
+
+    def _flush(self, key):
+        with self._lock:
+            state = self._active.get(key)
+            if state is None:
+                return
+            state['timer'] = None
+            state['last_sent'] = self.clock()
+            data = state['latest']
+            self.sent += 1
+        self.emit(PROGRESS_EVENT, data, state['room'])
+
+    def finish(self, job, data):
+        # 완료, 오류, 취소 등 마지막 상태는 묶지 않고 항상 바로 전송
+        # target_language가 없으면 작업 전체가 끝난 것이므로 모든 언어의 대기 중인 전송을 취소
+        job_id = job['id']
+        target_language = data.get('target_language')
+        with self._lock:
+            if target_language is None:
+                keys = [key for key in self._active if key[0] == job_id]
+            else:
+                keys = [(job_id, target_language)]
+            states = [self._active.pop(key) for key in keys if key in self._active]
+            finished = self._finished.setdefault(job_id, {})
+            finished[target_language] = data
+            self._finished.move_to_end(job_id)
+            while len(self._finished) > MAX_FINISHED_STATES:
+                self._finished.popitem(last=False)
+            self.sent += 1
+        for state in states:
+            if state['timer'] is not None:
+                state['timer'].cancel()
+        self.emit(PROGRESS_EVENT, data, owner_room(job['owner']))
+
+    def state(self, job_id):
+        # 작업의 가장 최근 진행 상황 목록 (작업 전체와 대상 언어별, 아직 전송되지 않은 값 포함)
+        with self._lock:
+            latest = dict(self._finished.get(job_id, {}))
+            for (active_job_id, target_language), state in self._active.items():
+                if active_job_id == job_id:
+                    latest[target_language] = state['latest']
+        # 작업 전체 상태를 먼저 적용하도록 언어가 없는 항목을 앞에 둠
+        return sorted(latest.values(), key=lambda data: data.get('target_language') is not None)
+
+    def stats(self):
+        with self._lock:
+            return {'active': len(self._active), 'sent': self.sent, 'coalesced': self.coalesced}
+
+
+class JobProgress:
+    # 한 작업의 진행 상황 전송기 (file_id, job_id와 대상 언어를 자동으로 포함)
+    # timer(metrics.StageTimer)가 주어지면 stage()로 처리 단계별 시간을 측정
+    def __init__(self, reporter, job, timer=None, target_language=None):
+        self.reporter = reporter
+        self.job = job
+        self.timer = timer
+        self.target_language = target_language
+
+    def language(self, target_language):
+        # 대상 언어 하나의 진행 상황 전송기 (단계 시간은 작업 측정기의 언어별 측정기에 누적)
+        timer = self.timer.language(target_language) if self.timer else None
+        return JobProgress(self.reporter, self.job, timer, target_language)
+
+    def stage(self, name):
+        return self.timer.stage(name) if self.timer else nullcontext()
+
+    def timed_iter(self, name, iterable):
+        return self.timer.timed_iter(name, iterable) if self.timer else iterable
+
+    def _payload(self, percentage, status, extra):
+        payload = {'file_id': self.job['file_id'], 'job_id': self.job['id'],
+                   'percentage': percentage, 'status': status, **extra}
+        if self.target_language is not None:
+            payload['target_language'] = self.target_language
+        return payload
+
+    def update(self, percentage, status, **extra):
+        self.reporter.update(self.job, self._payload(percentage, status, extra))
+
+    def finish(self, percentage, status, **extra):
+        if self.timer and self.reporter.include_timings and self.target_language is None:
+            extra['timings'] = self.timer.breakdown()
+        self.reporter.finish(self.job, self._payload(percentage, status, extra))
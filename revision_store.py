@@ -0,0 +1,144 @@
+# 문서 판 구간 저장소: 번역한 파일의 구간(텍스트 청크, 자막 대사, CSV 칸, 웹 페이지 블록, PDF 구간)별 번역문을 원본 내용 해시별로 보관
+# 새 업로드를 이전 판(file_id)의 수정본으로 번역하면 바뀌지 않은 구간은 이전 판의 번역문을 그대로 쓰고
+# 추가/수정된 구간만 번역기로 보냄 (번역 메모리와 달리 만료/용량 제한으로 지워지지 않고 원본이 남아 있는 동안 유지)
+import hashlib
+import sqlite3
+import time
+from threading import Lock
+
+from text_pipeline import PARAGRAPH_SEPARATOR
+
+# 한 번에 조회하는 구간 수 (SQLite 변수 개수 제한)
+LOOKUP_BATCH_SIZE = 500
+
+# 작업 중에 모아 두는 최대 구간 수 (넘으면 작업이 끝나기 전에 한 번에 기록하여 큰 파일도 메모리 사용량을 제한)
+FLUSH_ROWS = 2000
+
+
+def segment_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def segment_anchor(text):
+    # 여러 문단으로 된 구간(텍스트 청크)의 (첫 문단 해시, 문단 수): 새 판에서 같은 청크가 시작하는 위치를 찾는 데 사용
+    parts = text.split(PARAGRAPH_SEPARATOR)
+    if len(parts) == 1:
+        return segment_hash(text), 1
+    return segment_hash(parts[0].strip()), len(parts)
+
+
+class RevisionStore:
+    def __init__(self, db_path):
+        self._lock = Lock()
+        # {내용 해시: [아직 기록하지 않은 구간 행]}
+        self._pending = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS segments (
+                content_hash TEXT NOT NULL,
+                handler TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                anchor TEXT NOT NULL,
+                parts INTEGER NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, handler, target_language, source_hash)
+            )''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_segments_anchor ON segments (content_hash, handler, anchor)')
+        self._conn.commit()
+
+    def bind(self, content_hash, previous_hash, handler, target_language, memory=None):
+        return RevisionMemory(self, content_hash, previous_hash, handler, target_language, memory)
+
+    def lookup(self, content_hash, handler, target_language, texts):
+        # {원문: 번역문} (저장된 구간만)
+        hashes = {}
+        for text in texts:
+            hashes.setdefault(segment_hash(text), text)
+        found = {}
+        keys = list(hashes)
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + LOOKUP_BATCH_SIZE]
+                rows = self._conn.execute(
+                    f'SELECT source_hash, translation FROM segments WHERE content_hash = ? AND handler = ? '
+                    f'AND target_language = ? AND source_hash IN ({",".join("?" * len(batch))})',
+                    (content_hash, handler, target_language, *batch)).fetchall()
+                for source_hash, translation in rows:
+                    found[hashes[source_hash]] = translation
+        return found
+
+    def save(self, content_hash, handler, target_language, translations):
+        # 구간은 모아 두었다가 flush()에서 한 트랜잭션으로 기록 (구간마다 커밋하면 디스크 동기화가 허브를 막음)
+        now = time.time()
+        rows = [(content_hash, handler, target_language, segment_hash(source), *segment_anchor(source), translated, now)
+                for source, translated in translations.items()]
+        with self._lock:
+            pending = self._pending.setdefault(content_hash, [])
+            pending.extend(rows)
+            if len(pending) >= FLUSH_ROWS:
+                self._write(self._pending.pop(content_hash))
+
+    def flush(self, content_hash):
+        # 작업이 끝나면 그 파일의 모아 둔 구간을 기록
+        with self._lock:
+            rows = self._pending.pop(content_hash, None)
+            if rows:
+                self._write(rows)
+
+    def _write(self, rows):
+        self._conn.executemany('INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        self._conn.commit()
+
+    def chunk_index(self, content_hash, handler):
+        # 이전 판 텍스트 청크의 ({첫 문단 해시: {문단 수, ...}}, {청크 해시, ...}) (모든 대상 언어)
+        anchors = {}
+        chunks = set()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT DISTINCT source_hash, anchor, parts FROM segments WHERE content_hash = ? AND handler = ?',
+                (content_hash, handler)).fetchall()
+        for source_hash, anchor, parts in rows:
+            anchors.setdefault(anchor, set()).add(parts)
+            chunks.add(source_hash)
+        return anchors, chunks
+
+    def remove(self, content_hash):
+        with self._lock:
+            self._pending.pop(content_hash, None)
+            self._conn.execute('DELETE FROM segments WHERE content_hash = ?', (content_hash,))
+            self._conn.commit()
+
+
+class RevisionMemory:
+    # 번역 메모리(memory) 앞에 이전 판의 구간 번역문을 두고, 이 판에서 쓴 모든 구간 번역문을 이 판의 구간으로 기록
+    # (translate_unique와 CachedTranslator가 쓰는 번역 메모리와 같은 get_many / put_many 인터페이스)
+    def __init__(self, store, content_hash, previous_hash, handler, target_language, memory=None):
+        self.store = store
+        self.content_hash = content_hash
+        self.previous_hash = previous_hash
+        self.handler = handler
+        self.target_language = target_language
+        self.memory = memory
+        # 이전 판에서 가져온 구간 수
+        self.reused = 0
+
+    def get_many(self, texts):
+        found = {}
+        if self.previous_hash:
+            found = self.store.lookup(self.previous_hash, self.handler, self.target_language, texts)
+            self.reused += len(found)
+        rest = [text for text in texts if text not in found]
+        if self.memory is not None and rest:
+            found.update(self.memory.get_many(rest))
+        if found:
+            self.store.save(self.content_hash, self.handler, self.target_language, found)
+        return found
+
+    def put_many(self, translations):
+        if self.memory is not None:
+            self.memory.put_many(translations)
+        self.store.save(self.content_hash, self.handler, self.target_language, translations)
@@ -0,0 +1,90 @@
+# 반복 구간 색인: PDF에서 추출한 텍스트 상자 중 여러 번 나오는 구간(머리글, 바닥글, 쪽 번호 줄, 저작권 문구, 표 머리글)을 찾아
+# 작업마다 한 번만 번역하고 모든 위치에 재사용
+# - 공백을 정규화한 텍스트가 같은 상자는 위치와 관계없이 한 번만 번역
+# - 숫자만 다른 상자("Page 3 of 300")는 대략 같은 위치에 여러 페이지에 걸쳐 나올 때만 하나의 구간으로 묶고,
+#   대표 상자의 번역문에서 숫자만 바꿔 사용 (번역문에서 숫자 순서가 바뀐 경우에는 따로 번역)
+import re
+
+NUMBER_PATTERN = re.compile(r'\d+')
+
+# 같은 위치로 보는 좌표 차이 (pt)
+POSITION_TOLERANCE = 12
+# 숫자만 다른 상자를 묶으려면 같은 위치에 나와야 하는 최소 페이지 수
+MIN_REPEAT_PAGES = 3
+
+
+def normalize_segment(text):
+    return ' '.join(text.split())
+
+
+def substitute_numbers(translated, source_numbers, numbers):
+    # 대표 상자 번역문의 숫자를 이 상자의 숫자로 차례대로 바꿈 (번역문의 숫자가 원문과 다르면 None)
+    if NUMBER_PATTERN.findall(translated) != source_numbers:
+        return None
+    replacements = iter(numbers)
+    return NUMBER_PATTERN.sub(lambda match: next(replacements), translated)
+
+
+class SegmentIndex:
+    def __init__(self, pages, position_tolerance=POSITION_TOLERANCE, min_pages=MIN_REPEAT_PAGES):
+        # pages: pdf_engine.extract_document 결과 ([{'boxes': [{'text', 'x', 'top', ...}]}])
+        self.pages = pages
+        # 번역할 구간의 대표 원문과 그 숫자 목록
+        self.sources = []
+        self.source_numbers = []
+        # 상자별 (구간 번호, 이 상자의 숫자 목록; 원문이 같으면 None)
+        self.occurrences = []
+
+        boxes = [(page_number, box) for page_number, page in enumerate(pages) for box in page['boxes']]
+        keys = []
+        repeat_pages = {}
+        for page_number, box in boxes:
+            text = normalize_segment(box['text'])
+            template = NUMBER_PATTERN.sub('#', text)
+            position_key = (template, round(box['x'] / position_tolerance), round(box['top'] / position_tolerance))
+            keys.append((text, template, position_key))
+            if template != text:
+                repeat_pages.setdefault(position_key, set()).add(page_number)
+
+        segments = {}
+        for (page_number, box), (text, template, position_key) in zip(boxes, keys):
+            templated = template != text and len(repeat_pages[position_key]) >= min_pages
+            key = position_key if templated else text
+            segment = segments.get(key)
+            if segment is None:
+                segment = segments[key] = len(self.sources)
+                self.sources.append(box['text'])
+                self.source_numbers.append(NUMBER_PATTERN.findall(text))
+            if templated and text != normalize_segment(self.sources[segment]):
+                self.occurrences.append((segment, NUMBER_PATTERN.findall(text)))
+            else:
+                self.occurrences.append((segment, None))
+
+    def texts(self):
+        # 번역기로 보낼 구간 원문 (한 번씩)
+        return list(self.sources)
+
+    def stats(self):
+        return {'boxes': len(self.occurrences), 'segments': len(self.sources),
+                'templated': sum(numbers is not None for _, numbers in self.occurrences)}
+
+    def expand(self, translated, translate_many):
+        # 구간 번역문을 모든 상자에 펼쳐 페이지별 번역문 목록으로 반환
+        # 숫자를 바꿔 넣을 수 없는 상자는 translate_many(원문 목록)로 따로 번역
+        box_texts = [box['text'] for page in self.pages for box in page['boxes']]
+        results = []
+        fallback_indexes = []
+        for i, (segment, numbers) in enumerate(self.occurrences):
+            if numbers is None:
+                results.append(translated[segment])
+                continue
+            result = substitute_numbers(translated[segment], self.source_numbers[segment], numbers)
+            if result is None:
+                fallback_indexes.append(i)
+            results.append(result)
+        if fallback_indexes:
+            for i, result in zip(fallback_indexes, translate_many([box_texts[i] for i in fallback_indexes])):
+                results[i] = result
+
+        translations = iter(results)
+        return [[next(translations) for _ in page['boxes']] for page in self.pages]
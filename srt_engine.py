@@ -0,0 +1,57 @@
+# SRT 자막 엔진: 번호와 타임코드 줄은 그대로 두고 큐별 대사만 모아서 배치로 번역
+import re
+
+TIMING_PATTERN = re.compile(r'^\s*\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}\s*-->\s*\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}')
+
+
+def split_line_ending(line):
+    # 줄 내용과 원래의 줄바꿈 문자(\r\n, \n 등)를 분리
+    content = line.rstrip('\r\n')
+    return content, line[len(content):]
+
+
+class SubtitleDocument:
+    # 원본 줄 목록과 큐별 대사 줄의 위치만 보관하는 간단한 자막 표현
+    def __init__(self, lines, cues):
+        self.lines = lines
+        self.cues = cues  # 큐마다 대사 줄 번호 목록
+
+    @classmethod
+    def parse(cls, text):
+        lines = text.splitlines(keepends=True)
+        cues = []
+        in_cue = False
+        for i, line in enumerate(lines):
+            content, _ = split_line_ending(line)
+            if TIMING_PATTERN.match(content):
+                in_cue = True
+                cues.append([])
+            elif not content.strip():
+                in_cue = False
+            elif in_cue:
+                # 빈 줄 없이 다음 큐가 시작되는 경우 번호 줄은 대사로 취급하지 않음
+                next_content = split_line_ending(lines[i + 1])[0] if i + 1 < len(lines) else ''
+                if content.strip().isdigit() and TIMING_PATTERN.match(next_content):
+                    in_cue = False
+                else:
+                    cues[-1].append(i)
+        return cls(lines, [cue for cue in cues if cue])
+
+    def cue_texts(self):
+        # 큐마다 대사 줄을 줄바꿈으로 이은 텍스트 (여러 줄 대사를 한 문장으로 번역하도록 큐 단위로 번역)
+        return ['\n'.join(split_line_ending(self.lines[i])[0] for i in cue) for cue in self.cues]
+
+    def render(self, translations):
+        # 대사 줄만 번역문으로 바꾸고 나머지 줄(번호, 타임코드, 빈 줄)은 원본 그대로 유지
+        lines = list(self.lines)
+        for cue, text in zip(self.cues, self.cue_texts()):
+            # 번역문의 빈 줄은 큐를 끝내므로 빼고, 번역문 줄은 큐의 대사 줄 자리에 원래 줄바꿈 문자로 이어서 씀
+            translated = [line for line in translations.get(text, text).splitlines() if line.strip()]
+            if not translated:
+                continue
+            line_ending = split_line_ending(lines[cue[0]])[1]
+            last_line_ending = split_line_ending(lines[cue[-1]])[1]
+            for i in cue:
+                lines[i] = ''
+            lines[cue[0]] = (line_ending or '\n').join(translated) + last_line_ending
+        return ''.join(lines)
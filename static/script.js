@@ -1,5 +1,3 @@
-const socket = io();
-
 const fileInput = document.getElementById("fileInput");
 const uploadBtn = document.getElementById("uploadBtn");
 const startTranslationBtn = document.getElementById("startTranslationBtn");
@@ -7,9 +5,18 @@ const targetLanguageSelect = document.getElementById("targetLanguage");
 const uploadProgress = document.getElementById("uploadProgress");
 const fileList = document.getElementById("fileList");
 const statusMessage = document.getElementById("statusMessage");
+const urlInput = document.getElementById("urlInput");
+const translateUrlBtn = document.getElementById("translateUrlBtn");
+const downloadAllBtn = document.getElementById("downloadAllBtn");
 
 let uploadedFiles = [];
 
+// 서버는 세션 쿠키에 발급한 작업 소유자 ID의 방으로만 진행 상황을 보냄
+const socket = io();
+
+// file_id -> 파일 목록 항목 (진행 상황마다 목록 전체를 검색하지 않도록 보관)
+const fileItems = new Map();
+
 uploadBtn.addEventListener("click", () => fileInput.click());
 
 fileInput.addEventListener("change", (e) => {
@@ -95,6 +102,9 @@ function uploadFiles(files) {
 
 function updateFileList() {
   fileList.innerHTML = "";
+  // 목록을 다시 만들면 다운로드 링크도 사라지므로 새 결과가 나올 때까지 숨김
+  downloadAllBtn.style.display = "none";
+  fileItems.clear();
   uploadedFiles.forEach((file) => {
     const fileItem = document.createElement("div");
     fileItem.className = "file-item";
@@ -104,10 +114,18 @@ function updateFileList() {
                 <span class="file-name" title="${file.name}">${file.name}</span>
                 <span class='progress-text'>0%</span>
             </div>
+            <div class="revision-of"></div>
+            <div class="csv-columns"></div>
+            <div class="language-progress"></div>
             <div class="file-actions">
                 <button class='delete-btn' data-file-id='${file.id}'>Delete</button>
             </div>`;
     fileList.appendChild(fileItem);
+    fileItems.set(file.id, fileItem);
+    addRevisionSelect(file, fileItem);
+    if (file.name.toLowerCase().endsWith(".csv")) {
+      loadCsvColumns(file, fileItem);
+    }
   });
 
   const deleteButtons = document.querySelectorAll(".delete-btn");
@@ -119,6 +137,73 @@ function updateFileList() {
   });
 }
 
+// 같은 형식의 다른 업로드 파일을 이전 판으로 고르는 선택 상자 (이전 판에서 바뀌지 않은 부분은 다시 번역하지 않음)
+function addRevisionSelect(file, fileItem) {
+  const extension = file.name.toLowerCase().split(".").pop();
+  const candidates = uploadedFiles.filter(
+    (other) => other.id !== file.id && other.name.toLowerCase().split(".").pop() === extension
+  );
+  if (candidates.length === 0) {
+    return;
+  }
+  const label = document.createElement("label");
+  label.textContent = "Revision of ";
+  const select = document.createElement("select");
+  select.appendChild(new Option("New document", ""));
+  candidates.forEach((other) => {
+    select.appendChild(new Option(other.name, other.id, false, other.id === file.revisionOf));
+  });
+  select.addEventListener("change", () => {
+    file.revisionOf = select.value || undefined;
+  });
+  label.appendChild(select);
+  fileItem.querySelector(".revision-of").appendChild(label);
+}
+
+// CSV 파일의 열 목록을 가져와 번역할 열을 고르는 체크박스를 표시 (텍스트 열이 기본 선택)
+function loadCsvColumns(file, fileItem) {
+  fetch(`/csv_columns/${file.id}`)
+    .then((response) => response.json())
+    .then((data) => {
+      if (!data.columns) {
+        return;
+      }
+      const container = fileItem.querySelector(".csv-columns");
+      container.innerHTML = "";
+      data.columns.forEach((column) => {
+        const label = document.createElement("label");
+        label.className = "csv-column";
+        label.title = column.type;
+        const checkbox = document.createElement("input");
+        checkbox.type = "checkbox";
+        checkbox.value = column.index;
+        checkbox.checked = column.translatable;
+        label.appendChild(checkbox);
+        label.appendChild(document.createTextNode(` ${column.name || `#${column.index + 1}`} (${column.type})`));
+        container.appendChild(label);
+      });
+    })
+    .catch((error) => console.error("Error:", error));
+}
+
+// 번역 요청에 보낼 파일 목록 (CSV는 선택한 열 번호, 수정본은 이전 판의 file_id 포함)
+function translationFiles() {
+  return uploadedFiles.map((file) => {
+    const fileItem = fileItems.get(file.id);
+    const checkboxes = fileItem ? fileItem.querySelectorAll(".csv-columns input[type=checkbox]") : [];
+    const request = { id: file.id, name: file.name };
+    if (file.revisionOf && uploadedFiles.some((other) => other.id === file.revisionOf)) {
+      request.revision_of = file.revisionOf;
+    }
+    if (checkboxes.length > 0) {
+      request.columns = Array.from(checkboxes)
+        .filter((checkbox) => checkbox.checked)
+        .map((checkbox) => Number(checkbox.value));
+    }
+    return request;
+  });
+}
+
 function deleteFile(fileId) {
   fetch(`/delete_file/${fileId}`, {
     method: "DELETE",
@@ -128,9 +213,10 @@ function deleteFile(fileId) {
       statusMessage.textContent = "";
       if (data.success) {
         // Remove deleted file item from UI
-        const fileItem = document.querySelector(`[data-file-id="${fileId}"]`);
+        const fileItem = fileItems.get(fileId);
         if (fileItem) {
           fileItem.remove();
+          fileItems.delete(fileId);
         }
         // Remove file from uploadedFiles array
         uploadedFiles = uploadedFiles.filter((file) => file.id !== fileId);
@@ -156,7 +242,10 @@ startTranslationBtn.addEventListener("click", () => {
     return;
   }
 
-  const targetLanguage = targetLanguageSelect.value;
+  const targetLanguages = selectedLanguages();
+  if (targetLanguages.length === 0) {
+    return;
+  }
 
   fetch("/start_translation", {
     method: "POST",
@@ -164,20 +253,12 @@ startTranslationBtn.addEventListener("click", () => {
       "Content-Type": "application/json",
     },
     body: JSON.stringify({
-      files: uploadedFiles,
-      target_language: targetLanguage,
+      files: translationFiles(),
+      target_languages: targetLanguages,
     }),
   })
     .then((response) => response.json())
-    .then((data) => {
-      statusMessage.textContent = "";
-      if (data.message) {
-        statusMessage.textContent = data.message;
-      } else {
-        statusMessage.textContent =
-          data.error || "Failed to start translation.";
-      }
-    })
+    .then(handleTranslationStarted)
     .catch((error) => {
       console.error("Error:", error);
       statusMessage.textContent = "";
@@ -186,34 +267,202 @@ startTranslationBtn.addEventListener("click", () => {
     });
 });
 
-socket.on("file_progress", (data) => {
-  const fileItem = Array.from(fileList.children).find(
-    (item) => item.getAttribute("data-file-id") === data.file_id,
+// 선택한 모든 대상 언어를 한 작업으로 번역 (원본은 한 번만 처리)
+function selectedLanguages() {
+  const targetLanguages = Array.from(targetLanguageSelect.selectedOptions).map((option) => option.value);
+  if (targetLanguages.length === 0) {
+    statusMessage.textContent = "Please select at least one target language.";
+  }
+  return targetLanguages;
+}
+
+function handleTranslationStarted(data) {
+  statusMessage.textContent = "";
+  if (data.message) {
+    statusMessage.textContent = data.message;
+    (data.jobs || []).forEach((job) => addCancelButton(job.file_id, job.id));
+    // 이미 번역된 같은 내용의 파일은 결과가 바로 반환됨
+    (data.reused || []).forEach(updateProgress);
+  } else {
+    statusMessage.textContent =
+      data.error || "Failed to start translation.";
+  }
+}
+
+// 웹 페이지 번역: 서버가 페이지를 가져와 파일 목록에 추가하고 번역된 PDF를 만듦
+translateUrlBtn.addEventListener("click", () => {
+  const url = urlInput.value.trim();
+  if (!url) {
+    statusMessage.textContent = "Please enter a web page URL.";
+    return;
+  }
+  const targetLanguages = selectedLanguages();
+  if (targetLanguages.length === 0) {
+    return;
+  }
+
+  statusMessage.textContent = `Fetching ${url}...`;
+  fetch("/translate_url", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({
+      url: url,
+      target_languages: targetLanguages,
+    }),
+  })
+    .then((response) => response.json())
+    .then((data) => {
+      if (data.file) {
+        uploadedFiles = [...uploadedFiles, data.file];
+        updateFileList();
+        startTranslationBtn.disabled = false;
+        urlInput.value = "";
+      }
+      handleTranslationStarted(data);
+    })
+    .catch((error) => {
+      console.error("Error:", error);
+      statusMessage.textContent = "An error occurred while translating the web page.";
+    });
+});
+
+function addCancelButton(fileId, jobId) {
+  const fileItem = fileItems.get(fileId);
+  if (!fileItem) {
+    return;
+  }
+  let cancelButton = fileItem.querySelector(".cancel-btn");
+  if (!cancelButton) {
+    cancelButton = document.createElement("button");
+    cancelButton.className = "cancel-btn";
+    cancelButton.textContent = "Cancel";
+    cancelButton.addEventListener("click", () => cancelJob(cancelButton.getAttribute("data-job-id")));
+    fileItem.querySelector(".file-actions").appendChild(cancelButton);
+  }
+  cancelButton.setAttribute("data-job-id", jobId);
+}
+
+function cancelJob(jobId) {
+  fetch(`/jobs/${jobId}/cancel`, { method: "POST" })
+    .then((response) => response.json())
+    .then((data) => {
+      statusMessage.textContent = data.message || data.error || "";
+    })
+    .catch((error) => {
+      console.error("Error:", error);
+      statusMessage.textContent = "An error occurred while cancelling the job.";
+    });
+}
+
+// 완료, 취소, 오류 등 더 이상 진행되지 않는 상태인지 확인
+function isTerminalProgress(data) {
+  return (
+    Boolean(data.download_filename) ||
+    data.status === "Cancelled" ||
+    data.status.startsWith("Error") ||
+    data.status.startsWith("오류")
   );
+}
+
+// 재접속 시 연결이 끊긴 동안 놓친 진행 상황을 서버에서 다시 가져옴
+socket.on("connect", () => {
+  fetch("/jobs")
+    .then((response) => response.json())
+    .then((data) => {
+      // 최신 작업이 먼저 오므로 오래된 작업부터 적용
+      // 진행 상황은 작업 전체 상태가 먼저 오고 대상 언어별 상태가 뒤따름
+      (data.jobs || []).reverse().forEach((job) => {
+        const progress = job.progress || [];
+        progress.forEach(updateProgress);
+        const jobProgress = progress.find((data) => !data.target_language);
+        if (jobProgress && !isTerminalProgress(jobProgress)) {
+          addCancelButton(job.file_id, job.id);
+        }
+      });
+    })
+    .catch((error) => console.error("Error:", error));
+});
+
+socket.on("file_progress", updateProgress);
+
+function updateProgress(data) {
+  const fileItem = fileItems.get(data.file_id);
   if (fileItem) {
-    const progressText = fileItem.querySelector(".progress-text");
+    // 대상 언어가 있는 진행 상황은 그 언어의 줄에, 없으면 파일 전체 상태에 표시
+    const target = data.target_language ? languageRow(fileItem, data.target_language) : fileItem;
+    const progressText = target.querySelector(".progress-text");
     progressText.textContent = `${data.percentage}% - ${data.status}`;
 
+    if (!data.target_language && isTerminalProgress(data)) {
+      const cancelButton = fileItem.querySelector(".cancel-btn");
+      if (cancelButton) {
+        cancelButton.remove();
+      }
+    }
+
     if (data.download_filename) {
-      let downloadLink = fileItem.querySelector(".download-btn");
+      const actions = data.target_language ? target : fileItem.querySelector(".file-actions");
+      let downloadLink = actions.querySelector(".download-btn");
       if (!downloadLink) {
         downloadLink = document.createElement("a");
-        downloadLink.href = `/download/${encodeURIComponent(data.download_filename)}`;
-        downloadLink.download = data.download_filename.split('_').slice(0, -1).join('_') + '_' + data.download_filename.split('_').pop();
         downloadLink.textContent = "Download";
         downloadLink.className = "download-btn";
         downloadLink.addEventListener("click", (e) => {
           e.preventDefault();
           window.location.href = downloadLink.href;
         });
-        fileItem.querySelector(".file-actions").appendChild(downloadLink);
-      } else {
-        downloadLink.href = `/download/${encodeURIComponent(data.download_filename)}`;
-        downloadLink.download = data.download_filename.split('_').slice(0, -1).join('_') + '_' + data.download_filename.split('_').pop();
+        actions.appendChild(downloadLink);
       }
+      downloadLink.href = `/download/${encodeURIComponent(data.download_filename)}`;
+      downloadLink.download = data.download_filename.split('_').slice(0, -1).join('_') + '_' + data.download_filename.split('_').pop();
+      downloadLink.dataset.filename = data.download_filename;
+      downloadAllBtn.style.display = "block";
     }
   }
-});
+}
+
+// 완료된 모든 결과를 하나의 ZIP으로 내려받음
+// (fetch로 받으면 ZIP 전체가 브라우저 메모리에 쌓이므로 폼 제출로 브라우저가 바로 파일에 저장하게 함)
+function downloadAll() {
+  const filenames = Array.from(fileList.querySelectorAll(".download-btn"))
+    .map((link) => link.dataset.filename)
+    .filter(Boolean);
+  if (filenames.length === 0) {
+    return;
+  }
+  const form = document.createElement("form");
+  form.method = "POST";
+  form.action = "/download_bundle";
+  filenames.forEach((filename) => {
+    const input = document.createElement("input");
+    input.type = "hidden";
+    input.name = "files";
+    input.value = filename;
+    form.appendChild(input);
+  });
+  document.body.appendChild(form);
+  form.submit();
+  form.remove();
+}
+
+downloadAllBtn.addEventListener("click", downloadAll);
+
+// 파일 항목 안의 대상 언어별 진행 상황 줄 (없으면 생성)
+function languageRow(fileItem, targetLanguage) {
+  const container = fileItem.querySelector(".language-progress");
+  let row = container.querySelector(`.language-row[data-lang="${targetLanguage}"]`);
+  if (!row) {
+    row = document.createElement("div");
+    row.className = "language-row";
+    row.setAttribute("data-lang", targetLanguage);
+    row.innerHTML = `<span class="language-name">${targetLanguage}</span>
+                     <span class="progress-text"></span>`;
+    container.appendChild(row);
+  }
+  return row;
+}
 
 document.addEventListener("DOMContentLoaded", function () {
   const fileInput = document.getElementById("fileInput");
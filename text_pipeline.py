@@ -0,0 +1,142 @@
+# 텍스트 파일 처리 파이프라인: 파일을 조금씩 읽어 문단 단위로 나누고 번역 단위(청크)로 묶음
+import os
+from collections import deque
+from itertools import islice
+
+PARAGRAPH_SEPARATOR = '\n\n'
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def split_text(text, max_length):
+    # 텍스트를 최대 길이에 맞춰 분할
+    parts = []
+    current_part = ""
+
+    for paragraph in text.split('\n\n'):
+        if len(current_part) + len(paragraph) + 2 < max_length:
+            current_part += paragraph + '\n\n'
+        else:
+            if current_part:
+                parts.append(current_part.strip())
+            current_part = paragraph + '\n\n'
+
+    if current_part:
+        parts.append(current_part.strip())
+
+    return parts
+
+
+def cut_long_paragraph(paragraph, max_length):
+    # max_length보다 긴 문단을 줄바꿈(없으면 공백) 위치에서 잘라 순서대로 반환
+    while len(paragraph) > max_length:
+        cut = paragraph.rfind('\n', 0, max_length)
+        if cut <= 0:
+            cut = paragraph.rfind(' ', 0, max_length)
+        if cut <= 0:
+            cut = max_length
+        yield paragraph[:cut]
+        paragraph = paragraph[cut:].lstrip('\n ')
+    yield paragraph
+
+
+class ParagraphReader:
+    # 파일 전체를 메모리에 올리지 않고 블록 단위로 읽으면서 문단을 하나씩 반환
+    def __init__(self, filepath, max_paragraph_length, encoding='utf-8', block_size=READ_BLOCK_SIZE):
+        self.filepath = filepath
+        self.max_paragraph_length = max_paragraph_length
+        self.encoding = encoding
+        self.block_size = block_size
+        self.total_bytes = os.path.getsize(filepath)
+        self.bytes_read = 0
+
+    def __iter__(self):
+        buffer = ''
+        with open(self.filepath, 'r', encoding=self.encoding) as f:
+            while True:
+                block = f.read(self.block_size)
+                self.bytes_read = f.buffer.tell()
+                if not block:
+                    break
+                buffer += block
+                paragraphs = buffer.split(PARAGRAPH_SEPARATOR)
+                buffer = paragraphs.pop()
+                for paragraph in paragraphs:
+                    yield from cut_long_paragraph(paragraph, self.max_paragraph_length)
+                # 구분자 없이 길게 이어지는 텍스트도 메모리가 일정하게 유지되도록 잘라서 내보냄
+                if len(buffer) > self.max_paragraph_length:
+                    *heads, buffer = cut_long_paragraph(buffer, self.max_paragraph_length)
+                    yield from heads
+        yield buffer
+
+
+def iter_chunks(paragraphs, max_length):
+    # 문단들을 max_length를 넘지 않는 청크로 묶어서 채워지는 대로 반환 (split_text의 스트리밍 버전)
+    current = []
+    current_length = 0
+    for paragraph in paragraphs:
+        if current_length + len(paragraph) + 2 < max_length:
+            current.append(paragraph)
+            current_length += len(paragraph) + 2
+        else:
+            if current:
+                chunk = PARAGRAPH_SEPARATOR.join(current).strip()
+                if chunk:
+                    yield chunk
+            current = [paragraph]
+            current_length = len(paragraph) + 2
+
+    if current:
+        chunk = PARAGRAPH_SEPARATOR.join(current).strip()
+        if chunk:
+            yield chunk
+
+
+def iter_aligned_chunks(paragraphs, max_length, anchors, chunks, key):
+    # 이전 판의 청크와 같은 문단 묶음은 그대로 한 청크로 내보내고 그 사이의 추가/수정된 문단만 iter_chunks처럼 새로 묶음
+    # (문단 하나가 바뀌어도 뒤따르는 청크의 경계가 밀리지 않아 바뀌지 않은 청크의 이전 번역문을 재사용할 수 있음)
+    # anchors: 이전 판 청크의 {첫 문단 키: {문단 수, ...}}, chunks: 이전 판 청크 키 집합, key: 텍스트 -> 키
+    paragraphs = iter(paragraphs)
+    # 이전 판 청크와 맞춰 보기 위해 미리 읽어 둔 문단 (가장 긴 청크의 문단 수까지만 보관)
+    window = deque()
+    current = []
+    current_length = 0
+
+    def fill(count):
+        for paragraph in islice(paragraphs, count - len(window)):
+            window.append(paragraph)
+        return len(window) >= count
+
+    while window or fill(1):
+        matched = 0
+        for count in sorted(anchors.get(key(window[0].strip()), ()), reverse=True):
+            if fill(count) and key(PARAGRAPH_SEPARATOR.join(islice(window, count)).strip()) in chunks:
+                matched = count
+                break
+
+        if matched:
+            # 앞서 모은 새 문단을 먼저 내보내고 이전 판 청크를 그대로 내보냄
+            if current:
+                chunk = PARAGRAPH_SEPARATOR.join(current).strip()
+                if chunk:
+                    yield chunk
+                current = []
+                current_length = 0
+            yield PARAGRAPH_SEPARATOR.join(window.popleft() for _ in range(matched)).strip()
+            continue
+
+        paragraph = window.popleft()
+        if current_length + len(paragraph) + 2 < max_length:
+            current.append(paragraph)
+            current_length += len(paragraph) + 2
+        else:
+            if current:
+                chunk = PARAGRAPH_SEPARATOR.join(current).strip()
+                if chunk:
+                    yield chunk
+            current = [paragraph]
+            current_length = len(paragraph) + 2
+
+    if current:
+        chunk = PARAGRAPH_SEPARATOR.join(current).strip()
+        if chunk:
+            yield chunk
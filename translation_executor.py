@@ -0,0 +1,280 @@
+# 번역 요청 실행기: 동시 실행 수 제한, 제공자별 요청 속도 제한, 재시도를 담당
+# 요청마다 마감 시간을 두고, 최근 p95보다 오래 걸리면 같은 요청을 한 번 더 보내(헤지) 먼저 끝난 결과를 사용하며,
+# 재시도해도 실패한 요청은 반으로 나눠 다시 번역
+import logging
+import random
+import time
+from collections import deque
+from functools import partial
+from threading import Lock
+
+import eventlet
+from eventlet.greenpool import GreenPool
+from eventlet.queue import Empty, LightQueue
+from eventlet.semaphore import Semaphore
+
+# 지연 시간 백분위 계산에 사용하는 최근 요청 수와 헤지를 시작하기 전에 필요한 최소 요청 수
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+# 실패한 텍스트를 더 나누지 않는 최소 글자 수
+MIN_SPLIT_CHARS = 200
+
+
+class TranslationTimeout(Exception):
+    pass
+
+
+class AdaptiveController:
+    # 최근 요청의 지연 시간과 오류로 한 요청의 글자 수를 조정 (AIMD)
+    # 오류가 나거나 목표 지연 시간을 넘으면 절반으로 줄이고, 목표 안에 끝나면 조금씩 늘림
+    def __init__(self, target_latency, min_chars, window=LATENCY_WINDOW, increase=0.05, decrease=0.5):
+        self.target_latency = target_latency
+        self.min_chars = min_chars
+        self.increase = increase
+        self.decrease = decrease
+        self.scale = 1.0
+        self.latencies = deque(maxlen=window)
+        self.errors = deque(maxlen=window)
+        self._lock = Lock()
+
+    def record(self, latency, failed):
+        with self._lock:
+            self.errors.append(failed)
+            if not failed:
+                self.latencies.append(latency)
+            if failed or latency > self.target_latency:
+                self.scale = max(0.0, self.scale * self.decrease)
+            else:
+                self.scale = min(1.0, self.scale + self.increase)
+
+    def chunk_chars(self, max_chars):
+        # 현재 한 요청에 보낼 글자 수 (min_chars ~ max_chars)
+        return max(min(self.min_chars, max_chars), int(max_chars * self.scale))
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def stats(self):
+        with self._lock:
+            error_rate = sum(self.errors) / len(self.errors) if self.errors else 0.0
+        return {'scale': round(self.scale, 3), 'p95': self.percentile(95), 'error_rate': round(error_rate, 3)}
+
+
+def ordered_imap(func, items, concurrency):
+    # items를 최대 concurrency개씩 동시에 func로 처리하고 결과는 입력 순서대로 반환
+    # (GreenPool.imap과 달리 입력은 소비하는 쪽 그린스레드에서 읽으므로 따로 남는 입력 그린스레드가 없고,
+    #  소비가 중단되면(작업 취소, 오류, close()) 진행 중인 처리를 모두 중단)
+    pool = GreenPool(concurrency)
+    threads = deque()
+    try:
+        for item in items:
+            # 끝난 앞쪽 결과를 먼저 내보내고, 내보내지 못한 결과가 많이 쌓이면 앞쪽 결과를 기다림
+            while threads and (threads[0].dead or len(threads) >= concurrency * 2):
+                yield threads.popleft().wait()
+            threads.append(pool.spawn(func, item))
+        while threads:
+            yield threads.popleft().wait()
+    finally:
+        for thread in threads:
+            thread.kill()
+
+
+def split_item(item):
+    # 실패한 요청을 두 부분으로 나눔 (텍스트 목록은 반씩, 긴 텍스트는 가운데에 가까운 문단/줄/문장/공백 경계에서)
+    # 나눌 수 없으면 None, 나누면 (앞부분, 구분자, 뒷부분)
+    if isinstance(item, list):
+        if len(item) < 2:
+            return None
+        middle = len(item) // 2
+        return item[:middle], None, item[middle:]
+    if not isinstance(item, str) or len(item) < MIN_SPLIT_CHARS:
+        return None
+    middle = len(item) // 2
+    for separator in ('\n\n', '\n', '. ', ' '):
+        before = item.rfind(separator, 0, middle)
+        after = item.find(separator, middle)
+        candidates = [index for index in (before, after) if index > 0]
+        if candidates:
+            index = min(candidates, key=lambda index: abs(index - middle))
+            if separator == '. ':
+                index, separator = index + 1, ' '
+            return item[:index], separator, item[index + len(separator):]
+    return None
+
+
+class TokenBucket:
+    # 초당 rate개의 토큰이 채워지고 최대 capacity개까지 쌓이는 속도 제한기
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def retry_with_backoff(func, *args, retries=3, base_delay=0.5, max_delay=8.0, before_attempt=None):
+    # 실패 시 지수 백오프 + 전체 지터(full jitter)로 재시도
+    for attempt in range(retries + 1):
+        if before_attempt:
+            before_attempt()
+        try:
+            return func(*args)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            logging.warning(f"Translation attempt {attempt + 1} failed ({e}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+
+class TranslationExecutor:
+    def __init__(self, concurrency, rate_limits, max_retries=3, base_delay=0.5, max_delay=8.0, provider='google',
+                 call_timeout=None, controller=None, hedge=False, split_failed=False):
+        # rate_limits: {제공자 이름: (초당 요청 수, 버스트 크기)}
+        # provider: 제공자를 지정하지 않은 요청에 적용할 기본 제공자 이름
+        # call_timeout: 요청 한 번의 마감 시간(초, None이면 제한 없음)
+        # controller: 요청 글자 수를 조정하고 헤지 기준(p95)을 제공하는 AdaptiveController
+        # hedge: p95보다 오래 걸리는 요청을 한 번 더 보낼지, split_failed: 재시도해도 실패한 요청을 나눠 다시 보낼지
+        self.provider = provider
+        self.concurrency = concurrency
+        self.rate_limits = rate_limits
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.call_timeout = call_timeout
+        self.controller = controller
+        self.hedge = hedge and controller is not None
+        self.split_failed = split_failed
+        self.hedged = 0
+        self.splits = 0
+        # 프로세스 전체(모든 작업, 모든 대상 언어)에서 동시에 진행하는 요청 수 제한
+        # (imap마다 만드는 GreenPool은 호출 하나의 동시 실행 수만 제한하므로 작업이 여러 개면 합이 늘어남)
+        self._slots = Semaphore(concurrency)
+        self._buckets = {}
+        self._lock = Lock()
+
+    def bucket(self, provider):
+        # 제공자별 토큰 버킷 (설정이 없으면 제한 없음)
+        with self._lock:
+            if provider not in self._buckets:
+                limit = self.rate_limits.get(provider)
+                self._buckets[provider] = TokenBucket(*limit) if limit else None
+            return self._buckets[provider]
+
+    def chunk_chars(self, max_chars):
+        # 요청 하나에 묶어 보낼 글자 수 (조정기가 없으면 max_chars)
+        return self.controller.chunk_chars(max_chars) if self.controller else max_chars
+
+    def _attempt(self, func, item, bucket):
+        # 한 번의 시도: 마감 시간을 넘기면 TranslationTimeout
+        # 최근 p95보다 오래 걸리면 같은 요청을 한 번 더 보내고 먼저 성공한 결과를 사용 (남은 요청은 취소)
+        # 시도하는 동안 동시 실행 자리 하나를 차지 (재시도 대기 중에는 반납)
+        with self._slots:
+            return self._attempt_once(func, item, bucket)
+
+    def _attempt_once(self, func, item, bucket):
+        hedge_after = self.controller.percentile(95) if self.hedge else None
+        if hedge_after is not None and self.call_timeout and hedge_after >= self.call_timeout:
+            hedge_after = None
+        results = LightQueue()
+        start = time.monotonic()
+
+        def run():
+            try:
+                results.put((True, func(item), time.monotonic() - start))
+            except Exception as e:
+                results.put((False, e, time.monotonic() - start))
+
+        threads = [eventlet.spawn(run)]
+        timeout = eventlet.Timeout(self.call_timeout, TranslationTimeout(
+            f'Translation request timed out after {self.call_timeout}s')) if self.call_timeout else None
+        try:
+            try:
+                ok, value, latency = results.get(timeout=hedge_after)
+            except Empty:
+                if bucket:
+                    bucket.acquire()
+                with self._lock:
+                    self.hedged += 1
+                threads.append(eventlet.spawn(run))
+                ok, value, latency = results.get()
+                if not ok:
+                    # 먼저 끝난 요청이 실패하면 다른 요청의 결과를 기다림
+                    ok, value, latency = results.get()
+        except TranslationTimeout:
+            if self.controller:
+                self.controller.record(time.monotonic() - start, True)
+            raise
+        finally:
+            if timeout:
+                timeout.cancel()
+            for thread in threads:
+                thread.kill()
+
+        if self.controller:
+            self.controller.record(latency, not ok)
+        if not ok:
+            raise value
+        return value
+
+    def call(self, func, item, provider=None):
+        # 속도 제한을 지키며 재시도와 함께 한 건을 실행
+        bucket = self.bucket(provider or self.provider)
+        return retry_with_backoff(
+            self._attempt, func, item, bucket,
+            retries=self.max_retries,
+            base_delay=self.base_delay,
+            max_delay=self.max_delay,
+            before_attempt=bucket.acquire if bucket else None,
+        )
+
+    def call_split(self, func, item, provider=None):
+        # 재시도해도 실패하면 요청을 둘로 나눠 각각 다시 번역하고 합침 (더 나눌 수 없으면 오류를 그대로 전달)
+        try:
+            return self.call(func, item, provider)
+        except Exception as e:
+            parts = split_item(item) if self.split_failed else None
+            if parts is None:
+                raise
+            head, separator, tail = parts
+            with self._lock:
+                self.splits += 1
+            logging.warning(f"Translation of {len(item)} items/chars failed ({e}); retrying in two parts")
+            translated_head = self.call_split(func, head, provider)
+            translated_tail = self.call_split(func, tail, provider)
+            if separator is None:
+                return translated_head + translated_tail
+            return translated_head + separator + translated_tail
+
+    def imap(self, func, items, provider=None):
+        # 입력 순서대로 결과를 반환 (동시 요청 수는 프로세스 전체에서 concurrency개로 제한)
+        # 다 읽기 전에 그만두면 close()로 진행 중인 요청을 중단
+        return ordered_imap(partial(self.call_split, func, provider=provider), items, self.concurrency)
+
+    def map(self, func, items, provider=None, progress_callback=None):
+        results = []
+        translated = self.imap(func, items, provider)
+        try:
+            for i, result in enumerate(translated, 1):
+                results.append(result)
+                if progress_callback:
+                    progress_callback(i)
+        finally:
+            translated.close()
+        return results
@@ -0,0 +1,194 @@
+# 번역 메모리: 이미 번역한 텍스트를 디스크(SQLite)와 프로세스 내 LRU에 저장하여 재사용
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+
+# 이 횟수만큼 저장할 때마다 크기/기간 기반 정리를 수행
+EVICT_EVERY_PUTS = 500
+
+# 캐시 키 형식 버전 (키 구성이 바뀌면 올려서 이전 형식의 항목은 조회되지 않고 만료/정리되게 함)
+# 2: 번역 제공자 이름 포함
+KEY_VERSION = 2
+
+
+def normalize_text(text):
+    # 유니코드 정규화, 줄바꿈 통일, 줄 안의 연속 공백 축약
+    text = unicodedata.normalize('NFC', text).replace('\r\n', '\n').replace('\r', '\n')
+    text = re.sub(r'[ \t\f\v]+', ' ', text)
+    return text.strip()
+
+
+def make_key(text, provider, source_language, target_language):
+    # 정규화된 원문, 번역 제공자, 언어 쌍으로 캐시 키 생성 (제공자마다 번역 결과가 다르므로 따로 저장)
+    raw = f'{KEY_VERSION}\0{provider}\0{source_language}\0{target_language}\0{normalize_text(text)}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, db_path, max_bytes, max_age, lru_size):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lru_size = lru_size
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+        self._lock = Lock()
+        self._puts_since_evict = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                translated TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_translations_created_at ON translations (created_at)')
+        self._conn.commit()
+        self.evict()
+
+    def bind(self, provider, target_language, source_language='auto'):
+        # 특정 번역 제공자와 언어 쌍에 고정된 조회/저장 뷰 반환
+        return BoundMemory(self, provider, source_language, target_language)
+
+    def _remember(self, key, translated):
+        self._lru[key] = translated
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts, provider, source_language, target_language):
+        # 캐시에 있는 텍스트만 {원문: 번역문}으로 반환
+        found = {}
+        missing = {}
+        now = time.time()
+        with self._lock:
+            for text in texts:
+                key = make_key(text, provider, source_language, target_language)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[text] = self._lru[key]
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(text)
+
+            keys = list(missing)
+            # SQLite 변수 개수 제한을 고려해 나누어 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, translated FROM translations WHERE key IN ({placeholders}) AND created_at >= ?',
+                    (*chunk, now - self.max_age)).fetchall()
+                for key, translated in rows:
+                    self._remember(key, translated)
+                    for text in missing.pop(key):
+                        found[text] = translated
+                        self.disk_hits += 1
+                if rows:
+                    self._conn.executemany('UPDATE translations SET last_used = ? WHERE key = ?',
+                                           [(now, key) for key, _ in rows])
+            if keys:
+                self._conn.commit()
+            self.misses += sum(len(texts) for texts in missing.values())
+        return found
+
+    def put_many(self, translations, provider, source_language, target_language):
+        # {원문: 번역문}을 저장
+        now = time.time()
+        records = []
+        with self._lock:
+            for text, translated in translations.items():
+                if translated is None:
+                    continue
+                key = make_key(text, provider, source_language, target_language)
+                self._remember(key, translated)
+                records.append((key, translated, len(translated.encode('utf-8')), now, now))
+            if not records:
+                return
+            self._conn.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)', records)
+            self._conn.commit()
+            self._puts_since_evict += len(records)
+            evict_needed = self._puts_since_evict >= EVICT_EVERY_PUTS
+        if evict_needed:
+            self.evict()
+
+    def evict(self):
+        # 오래된 항목 삭제 후 전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+        with self._lock:
+            self._puts_since_evict = 0
+            expired = self._conn.execute('DELETE FROM translations WHERE created_at < ?',
+                                         (time.time() - self.max_age,)).rowcount
+            total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM translations').fetchone()[0]
+            evicted = 0
+            if total_bytes > self.max_bytes:
+                excess = total_bytes - self.max_bytes
+                cursor = self._conn.execute('SELECT key, size FROM translations ORDER BY last_used')
+                victims = []
+                for key, size in cursor:
+                    victims.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._conn.executemany('DELETE FROM translations WHERE key = ?', victims)
+                evicted = len(victims)
+                for (key,) in victims:
+                    self._lru.pop(key, None)
+            self._conn.commit()
+        if expired or evicted:
+            logging.info(f"Translation memory evicted {expired} expired and {evicted} least recently used entries")
+
+    def stats(self):
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations').fetchone()
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'lru_entries': len(self._lru),
+                'entries': entries,
+                'bytes': total_bytes,
+            }
+
+
+class BoundMemory:
+    def __init__(self, memory, provider, source_language, target_language):
+        self.memory = memory
+        self.provider = provider
+        self.source_language = source_language
+        self.target_language = target_language
+
+    def get_many(self, texts):
+        return self.memory.get_many(texts, self.provider, self.source_language, self.target_language)
+
+    def put_many(self, translations):
+        self.memory.put_many(translations, self.provider, self.source_language, self.target_language)
+
+
+class CachedTranslator:
+    # 번역 메모리를 먼저 조회하고 없을 때만 실제 번역기를 호출하는 래퍼
+    def __init__(self, translator, memory):
+        self.translator = translator
+        self.memory = memory
+
+    def translate(self, text):
+        cached = self.memory.get_many([text])
+        if text in cached:
+            return cached[text]
+        translated = self.translator.translate(text)
+        self.memory.put_many({text: translated})
+        return translated
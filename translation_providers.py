@@ -0,0 +1,164 @@
+# 번역 제공자 계층: 공통 인터페이스(translate / translate_batch)와 설정으로 선택하는 제공자 레지스트리
+import random
+import time
+from collections import deque
+from itertools import count
+from threading import Lock
+
+from batch_translate import translate_batch
+
+# 지연 시간 백분위 계산에 사용하는 최근 요청 수
+MAX_LATENCY_SAMPLES = 100000
+
+
+class ProviderStats:
+    # 제공자 요청 통계 (요청 수, 보낸 글자 수, 오류 수, 최근 요청 지연 시간)
+    def __init__(self, on_record=None):
+        # on_record(chars, latency, failed): 요청마다 호출 (외부 지표 수집용)
+        self.on_record = on_record
+        self.requests = 0
+        self.chars = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=MAX_LATENCY_SAMPLES)
+        self._lock = Lock()
+
+    def record(self, chars, latency, failed=False):
+        with self._lock:
+            self.requests += 1
+            self.chars += chars
+            self.errors += failed
+            self.latencies.append(latency)
+        if self.on_record:
+            self.on_record(chars, latency, failed)
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.chars = 0
+            self.errors = 0
+            self.latencies.clear()
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def snapshot(self):
+        return {'requests': self.requests, 'chars': self.chars, 'errors': self.errors,
+                'p50': self.percentile(50), 'p99': self.percentile(99)}
+
+
+class TranslationProvider:
+    # 제공자 기본 클래스: 하위 클래스는 _translate(text)만 구현하면 됨
+    name = None
+    max_chars = 5000  # 요청 하나에 보낼 수 있는 최대 글자 수
+
+    def __init__(self, target_language, source_language='auto', stats=None):
+        self.target_language = target_language
+        self.source_language = source_language
+        self.stats = stats
+
+    def _translate(self, text):
+        raise NotImplementedError
+
+    def translate(self, text):
+        if len(text) > self.max_chars:
+            raise ValueError(f'Request too long for {self.name}: {len(text)} > {self.max_chars} characters')
+        start = time.perf_counter()
+        try:
+            result = self._translate(text)
+        except Exception:
+            if self.stats is not None:
+                self.stats.record(len(text), time.perf_counter() - start, True)
+            raise
+        # (헤지로 보낸 요청 중 취소된 쪽은 기록하지 않음)
+        if self.stats is not None:
+            self.stats.record(len(text), time.perf_counter() - start)
+        return result
+
+    def translate_batch(self, texts):
+        # 여러 텍스트를 줄바꿈으로 이어 한 번의 요청으로 번역 (배치 API가 있는 제공자는 재정의)
+        return translate_batch(self, texts)
+
+
+class GoogleProvider(TranslationProvider):
+    name = 'google'
+    max_chars = 5000
+
+    def __init__(self, target_language, source_language='auto', stats=None):
+        super().__init__(target_language, source_language, stats)
+        # stub 제공자만 쓰는 배포와 테스트에서는 불러오지 않음
+        from deep_translator import GoogleTranslator
+        self.translator = GoogleTranslator(source=source_language, target=target_language)
+
+    def _translate(self, text):
+        return self.translator.translate(text)
+
+
+class StubProvider(TranslationProvider):
+    # 네트워크 없이 동작하는 결정적 제공자 (벤치마크와 부하 테스트용)
+    # 각 줄 앞에 대상 언어 표시를 붙여 반환하므로 줄 수(배치 구분자)가 보존됨
+    # (실제 번역기처럼 글자가 없는 줄(숫자, 기호, 배치 번호 표시 줄)은 그대로 반환)
+    name = 'stub'
+    _instances = count()
+
+    def __init__(self, target_language, source_language='auto', stats=None,
+                 latency=0.0, error_rate=0.0, max_chars=5000, seed=0,
+                 latency_per_kchar=0.0, spike_rate=0.0, spike_latency=0.0):
+        # latency_per_kchar: 1000자당 추가 지연 시간, spike_rate/spike_latency: 가끔 매우 느린 요청의 비율과 지연 시간
+        super().__init__(target_language, source_language, stats)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_chars = max_chars
+        self.latency_per_kchar = latency_per_kchar
+        self.spike_rate = spike_rate
+        self.spike_latency = spike_latency
+        # 작업마다 새로 만드는 제공자가 모두 같은 오류/지연 순서를 갖지 않도록 생성 순서를 시드에 더함
+        self._random = random.Random(f'{seed}:{next(StubProvider._instances)}')
+        self._lock = Lock()
+
+    def _translate(self, text):
+        with self._lock:
+            fail = self._random.random() < self.error_rate
+            spike = self._random.random() < self.spike_rate
+        latency = self.latency + self.latency_per_kchar * len(text) / 1000 + (self.spike_latency if spike else 0)
+        if latency:
+            time.sleep(latency)
+        if fail:
+            raise RuntimeError('Simulated stub provider error')
+        return '\n'.join(f'[{self.target_language}] {line}' if any(c.isalpha() for c in line) else line
+                         for line in text.split('\n'))
+
+
+PROVIDERS = {
+    GoogleProvider.name: GoogleProvider,
+    StubProvider.name: StubProvider,
+}
+
+
+def provider_options(name, config):
+    # 설정(Config 또는 app.config)에서 제공자별 생성 옵션을 가져옴
+    if name == StubProvider.name:
+        return {
+            'latency': config['STUB_PROVIDER_LATENCY'],
+            'error_rate': config['STUB_PROVIDER_ERROR_RATE'],
+            'max_chars': config['STUB_PROVIDER_MAX_CHARS'],
+            'seed': config['STUB_PROVIDER_SEED'],
+            'latency_per_kchar': config['STUB_PROVIDER_LATENCY_PER_KCHAR'],
+            'spike_rate': config['STUB_PROVIDER_SPIKE_RATE'],
+            'spike_latency': config['STUB_PROVIDER_SPIKE_LATENCY'],
+        }
+    return {}
+
+
+def max_request_chars(name, options):
+    # 제공자가 한 번의 요청으로 받을 수 있는 최대 글자 수
+    return options.get('max_chars') or PROVIDERS[name].max_chars
+
+
+def create_provider(name, target_language, source_language='auto', stats=None, **options):
+    if name not in PROVIDERS:
+        raise ValueError(f'Unknown translation provider: {name} (available: {", ".join(PROVIDERS)})')
+    return PROVIDERS[name](target_language, source_language, stats, **options)
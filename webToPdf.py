@@ -2,77 +2,366 @@ import requests
 from bs4 import BeautifulSoup
 import html2text
 import markdown
-from weasyprint import HTML
+import argparse
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import socket
 import sys
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlparse
+
+# 요청 제한 시간 (연결, 읽기, 초)
+REQUEST_TIMEOUT = (5, 30)
+
+# 가져오는 응답 본문의 최대 크기 (페이지, 렌더링할 때 가져오는 이미지/스타일시트)
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# 따라가는 리디렉션 최대 횟수
+MAX_REDIRECTS = 5
+
+READ_CHUNK_SIZE = 64 * 1024
+
+STYLESHEET = """
+    body { font-family: Arial, sans-serif; margin: 0 auto; max-width: 800px; padding: 20px; }
+    h1, h2, h3 { color: #333366; }
+    p { line-height: 1.6; }
+    img { max-width: 100%; height: auto; }
+"""
+
+SITEMAP_NAMESPACE = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
 
 def extract_main_content(soup):
     # 주요 콘텐츠를 포함할 가능성이 높은 태그들
     content_tags = ['article', 'main', 'div[id*="content"]', 'div[class*="content"]']
-    
+
     for tag in content_tags:
         content = soup.select_one(tag)
         if content:
             return content
-    
+
     # 주요 콘텐츠를 찾지 못한 경우 body 전체를 반환
     return soup.body
 
+def html_to_markdown(html):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 주요 콘텐츠 추출
+    main_content = extract_main_content(soup)
+
+    # HTML을 마크다운으로 변환
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    return h.handle(str(main_content))
+
 def web_to_markdown(url):
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=REQUEST_TIMEOUT)
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 주요 콘텐츠 추출
-        main_content = extract_main_content(soup)
-        
-        # HTML을 마크다운으로 변환
-        h = html2text.HTML2Text()
-        h.ignore_links = False
-        markdown_content = h.handle(str(main_content))
-        
-        return markdown_content
+        return html_to_markdown(response.text)
     except requests.RequestException as e:
         print(f"웹 페이지를 가져오는 중 오류 발생: {e}")
         sys.exit(1)
 
+def markdown_to_html(markdown_content):
+    return markdown.markdown(markdown_content)
+
 def markdown_to_pdf(markdown_content, output_file):
     try:
-        html_content = markdown.markdown(markdown_content)
-        
-        css = """
-        <style>
-            body { font-family: Arial, sans-serif; margin: 0 auto; max-width: 800px; padding: 20px; }
-            h1, h2, h3 { color: #333366; }
-            p { line-height: 1.6; }
-            img { max-width: 100%; height: auto; }
-        </style>
-        """
-        html_content = f"<html><head>{css}</head><body>{html_content}</body></html>"
-        
-        HTML(string=html_content).write_pdf(output_file)
+        from weasyprint import CSS, HTML
+
+        html_content = f"<html><head></head><body>{markdown_to_html(markdown_content)}</body></html>"
+        # 페이지의 이미지 주소로 로컬 파일(file://)을 읽지 않도록 제한된 url_fetcher 사용 (직접 지정한 URL이므로 사설 주소는 허용)
+        HTML(string=html_content, url_fetcher=safe_url_fetcher(allow_private=True)).write_pdf(
+            output_file, stylesheets=[CSS(string=STYLESHEET)])
     except Exception as e:
         print(f"PDF 생성 중 오류 발생: {e}")
         sys.exit(1)
 
 def web_to_pdf(url, output_file):
     markdown_content = web_to_markdown(url)
-    
+
     # 마크다운 파일 생성
     markdown_file = output_file.rsplit('.', 1)[0] + '.md'
     with open(markdown_file, 'w', encoding='utf-8') as f:
         f.write(markdown_content)
     print(f"마크다운 파일이 생성되었습니다: {markdown_file}")
-    
+
     markdown_to_pdf(markdown_content, output_file)
     print(f"PDF 파일이 생성되었습니다: {output_file}")
 
-if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("사용법: python webToPdf.py <URL> <출력_파일명>")
+# ---- 일괄 변환 (URL 목록 또는 사이트맵) ----
+
+class UnsafeUrlError(ValueError):
+    pass
+
+def check_public_url(url):
+    # http(s) 주소이고 호스트가 가리키는 모든 IP가 공인 주소인지 확인 (사설, 루프백, 링크 로컬(클라우드 메타데이터),
+    # 예약 주소로 요청을 보내게 하는 SSRF 방지)
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise UnsafeUrlError(f'Only http(s) URLs are allowed: {url}')
+    try:
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        addresses = socket.getaddrinfo(parsed.hostname, port, proto=socket.IPPROTO_TCP)
+    except (OSError, ValueError) as e:
+        raise UnsafeUrlError(f'Could not resolve {parsed.hostname}: {e}')
+    for address in addresses:
+        ip = ipaddress.ip_address(address[4][0].split('%')[0])
+        if getattr(ip, 'ipv4_mapped', None):
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast or ip.is_reserved:
+            raise UnsafeUrlError(f'Host {parsed.hostname} resolves to a non-public address ({ip})')
+
+def get_limited(session, url, headers=None, timeout=REQUEST_TIMEOUT, max_bytes=MAX_BODY_BYTES, allow_private=False):
+    # 리디렉션을 직접 따라가며 매번 주소를 확인하고, 본문은 max_bytes까지만 읽음
+    # (응답, 본문 바이트, 최종 URL)을 반환
+    for _ in range(MAX_REDIRECTS + 1):
+        if not allow_private:
+            check_public_url(url)
+        response = session.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=False)
+        if response.is_redirect:
+            location = response.headers.get('Location')
+            response.close()
+            url = urljoin(url, location)
+            continue
+        try:
+            if int(response.headers.get('Content-Length') or 0) > max_bytes:
+                raise ValueError(f'Response from {url} is larger than {max_bytes} bytes')
+            body = bytearray()
+            for chunk in response.iter_content(READ_CHUNK_SIZE):
+                body += chunk
+                if len(body) > max_bytes:
+                    raise ValueError(f'Response from {url} is larger than {max_bytes} bytes')
+        finally:
+            response.close()
+        return response, bytes(body), url
+    raise ValueError(f'Too many redirects: {url}')
+
+def create_session(per_host_limit):
+    # 연결을 재사용하는 세션 (호스트별 연결 풀 크기를 제한하고, 풀이 가득 차면 빈 연결을 기다림)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=per_host_limit, pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class HttpCache:
+    # ETag/Last-Modified로 조건부 요청을 보내고, 바뀌지 않은 페이지(304)는 저장해 둔 본문을 사용
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, key + '.json'), os.path.join(self.folder, key + '.body')
+
+    def load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def store(self, url, response, body):
+        meta_path, body_path = self._paths(url)
+        meta = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'),
+                'encoding': response.encoding}
+        # 임시 파일에 쓴 뒤 교체하여 동시에 읽는 쪽이 반쯤 쓴 파일을 보지 않게 함
+        for path, mode, data in ((body_path, 'wb', body), (meta_path, 'w', json.dumps(meta))):
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+def fetch(session, url, cache=None, timeout=REQUEST_TIMEOUT, max_bytes=MAX_BODY_BYTES, allow_private=False):
+    # 페이지 HTML과 캐시 사용 여부를 반환 (바뀌지 않았으면 서버는 본문 없이 304로 응답)
+    # allow_private: 사설/루프백 주소도 허용 (직접 실행하는 일괄 변환에서 사내 페이지를 변환할 때)
+    meta, body = cache.load(url) if cache else (None, None)
+    headers = {}
+    if meta:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response, content, _ = get_limited(session, url, headers, timeout, max_bytes, allow_private)
+    if response.status_code == 304 and body is not None:
+        return body.decode(meta.get('encoding') or 'utf-8', errors='replace'), True
+    response.raise_for_status()
+    if not response.encoding or response.encoding.lower() == 'iso-8859-1':
+        response.encoding = 'utf-8'
+    if cache and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+        cache.store(url, response, content)
+    return content.decode(response.encoding, errors='replace'), False
+
+def read_url_list(source, session=None):
+    # URL 목록 파일(한 줄에 하나, #은 주석) 또는 사이트맵(경로나 URL, 사이트맵 색인 포함)에서 URL 목록을 읽음
+    if source.startswith(('http://', 'https://')):
+        response = (session or requests).get(source, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        text = response.content
+    else:
+        with open(source, 'rb') as f:
+            text = f.read()
+
+    if text.lstrip().startswith(b'<'):
+        root = ET.fromstring(text)
+        locations = [loc.text.strip() for loc in root.iter(f'{SITEMAP_NAMESPACE}loc') if loc.text]
+        if root.tag == f'{SITEMAP_NAMESPACE}sitemapindex':
+            return [url for location in locations for url in read_url_list(location, session)]
+        return locations
+
+    lines = (line.strip() for line in text.decode('utf-8').splitlines())
+    return [line for line in lines if line and not line.startswith('#')]
+
+def page_name(url):
+    # URL로 만든 파일 이름용 페이지 이름 (호스트_경로)
+    parsed = urlparse(url)
+    path = parsed.path.strip('/') or 'index'
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', f'{parsed.netloc}_{path}')[:100]
+
+def output_name(url):
+    # URL에서 겹치지 않는 PDF 파일 이름을 만듦 (호스트_경로_해시.pdf)
+    return f"{page_name(url)}_{hashlib.sha256(url.encode('utf-8')).hexdigest()[:8]}.pdf"
+
+_renderer = {}
+
+def _init_renderer():
+    # 렌더링 프로세스마다 스타일시트와 글꼴 설정을 한 번만 만들어 모든 페이지가 공유
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    _renderer['font_config'] = font_config
+    _renderer['stylesheet'] = CSS(string=STYLESHEET, font_config=font_config)
+
+def safe_url_fetcher(allowed_files=(), allow_private=False):
+    # WeasyPrint가 이미지, 스타일시트, 첨부 파일을 가져올 때 쓰는 함수
+    # 기본 함수는 file:// 주소도 읽으므로 페이지가 서버의 로컬 파일(.env, 데이터베이스)을 PDF에 넣을 수 있음
+    # -> data: 주소, 지정한 로컬 파일(글꼴), 공인 주소의 http(s)만 허용하고 크기를 제한
+    from pathlib import Path
+
+    allowed_uris = {Path(path).resolve().as_uri() for path in allowed_files}
+    session = requests.Session()
+
+    def fetcher(url, timeout=10, ssl_context=None):
+        if url.startswith('data:') or url in allowed_uris:
+            from weasyprint import default_url_fetcher
+            return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+        response, content, final_url = get_limited(session, url, timeout=timeout, allow_private=allow_private)
+        response.raise_for_status()
+        mime_type = (response.headers.get('Content-Type') or '').split(';')[0].strip() or None
+        return {'string': content, 'mime_type': mime_type, 'encoding': response.encoding,
+                'redirected_url': final_url}
+    return fetcher
+
+def render_html(html_content, output_file, base_url=None, extra_css=None, allowed_files=(), allow_private=False):
+    # base_url: 상대 경로 이미지와 링크의 기준 주소, extra_css: 기본 스타일시트에 더할 스타일 (예: 글꼴)
+    # allowed_files: 렌더링할 때 읽어도 되는 로컬 파일 (extra_css의 글꼴 파일)
+    from weasyprint import CSS, HTML
+
+    if not _renderer:
+        _init_renderer()
+    stylesheets = [_renderer['stylesheet']]
+    if extra_css:
+        stylesheets.append(CSS(string=extra_css, font_config=_renderer['font_config']))
+    url_fetcher = safe_url_fetcher(allowed_files, allow_private)
+    HTML(string=html_content, base_url=base_url, url_fetcher=url_fetcher).write_pdf(
+        output_file, stylesheets=stylesheets, font_config=_renderer['font_config'])
+    return output_file
+
+def render_pdf(markdown_content, output_file, allow_private=False):
+    html_content = f"<html><head></head><body>{markdown_to_html(markdown_content)}</body></html>"
+    return render_html(html_content, output_file, allow_private=allow_private)
+
+def batch_web_to_pdf(urls, output_dir, fetch_workers=8, per_host_limit=4, render_workers=None,
+                     cache_dir=None, keep_markdown=False, render=True, allow_private=False):
+    # 페이지를 동시에 가져와 마크다운으로 바꾸고, 가져온 순서대로 렌더링 프로세스 풀에서 PDF로 만듦
+    # 결과: [{'url', 'output', 'cached', 'error'}, ...] (실패한 페이지가 있어도 나머지는 계속 처리)
+    os.makedirs(output_dir, exist_ok=True)
+    session = create_session(per_host_limit)
+    cache = HttpCache(cache_dir) if cache_dir else None
+    results = {url: {'url': url, 'output': None, 'cached': False, 'error': None} for url in urls}
+
+    def fetch_page(url):
+        html, cached = fetch(session, url, cache, allow_private=allow_private)
+        return url, html_to_markdown(html), cached
+
+    render_pool = ProcessPoolExecutor(render_workers, initializer=_init_renderer) if render else None
+    renders = {}
+    try:
+        with ThreadPoolExecutor(fetch_workers) as fetch_pool:
+            fetches = {fetch_pool.submit(fetch_page, url): url for url in results}
+            for future in as_completed(fetches):
+                url = fetches[future]
+                try:
+                    _, markdown_content, cached = future.result()
+                except Exception as e:
+                    results[url]['error'] = f'fetch: {e}'
+                    continue
+                results[url]['cached'] = cached
+                output_file = os.path.join(output_dir, output_name(url))
+                if keep_markdown:
+                    with open(output_file.rsplit('.', 1)[0] + '.md', 'w', encoding='utf-8') as f:
+                        f.write(markdown_content)
+                if render_pool:
+                    renders[render_pool.submit(render_pdf, markdown_content, output_file, allow_private)] = url
+
+        for future in as_completed(renders):
+            url = renders[future]
+            try:
+                results[url]['output'] = future.result()
+            except Exception as e:
+                results[url]['error'] = f'render: {e}'
+    finally:
+        if render_pool:
+            render_pool.shutdown(cancel_futures=True)
+        session.close()
+    return list(results.values())
+
+def main():
+    parser = argparse.ArgumentParser(description='웹 페이지를 PDF로 변환합니다.')
+    parser.add_argument('url', nargs='?', help='변환할 URL (한 페이지)')
+    parser.add_argument('output_file', nargs='?', help='출력 PDF 파일명 (한 페이지)')
+    parser.add_argument('--batch', metavar='SOURCE', help='URL 목록 파일 또는 사이트맵(경로/URL)')
+    parser.add_argument('--output-dir', default='pdf_output', help='일괄 변환 결과 폴더')
+    parser.add_argument('--workers', type=int, default=8, help='동시에 가져올 페이지 수')
+    parser.add_argument('--per-host', type=int, default=4, help='호스트별 최대 연결 수')
+    parser.add_argument('--render-workers', type=int, default=None, help='PDF 렌더링 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--cache-dir', default='.http_cache', help='조건부 요청용 HTTP 캐시 폴더 (빈 값이면 사용 안 함)')
+    parser.add_argument('--keep-markdown', action='store_true', help='마크다운 파일도 함께 저장')
+    parser.add_argument('--allow-private-hosts', action='store_true',
+                        help='사설/루프백 주소의 페이지도 변환 (사내 문서 사이트)')
+    args = parser.parse_args()
+
+    if not args.batch:
+        if not args.url or not args.output_file:
+            print("사용법: python webToPdf.py <URL> <출력_파일명>")
+            print("       python webToPdf.py --batch <URL_목록_또는_사이트맵> [--output-dir 폴더]")
+            sys.exit(1)
+        web_to_pdf(args.url, args.output_file)
+        return
+
+    urls = read_url_list(args.batch)
+    print(f"{len(urls)}개 페이지 변환 시작")
+    results = batch_web_to_pdf(urls, args.output_dir, args.workers, args.per_host, args.render_workers,
+                               args.cache_dir or None, args.keep_markdown, allow_private=args.allow_private_hosts)
+    failed = [result for result in results if result['error']]
+    cached = sum(result['cached'] for result in results)
+    for result in failed:
+        print(f"실패: {result['url']} ({result['error']})")
+    print(f"PDF {len(results) - len(failed)}개 생성 (캐시 사용 {cached}개, 실패 {len(failed)}개): {args.output_dir}")
+    if failed:
         sys.exit(1)
-    
-    url = sys.argv[1]
-    output_file = sys.argv[2]
-    
-    web_to_pdf(url, output_file)
+
+if __name__ == "__main__":
+    main()
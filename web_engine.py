@@ -0,0 +1,115 @@
+# 웹 페이지 엔진: 본문 HTML에서 블록(문단, 제목, 목록 항목, 표 칸 등)의 텍스트만 모아 배치로 번역하고
+# 원래 HTML 구조(제목 수준, 목록, 표, 이미지, 링크만 있는 항목의 링크)에 번역문을 넣어 렌더링할 문서를 만듦
+import html as html_module
+
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+
+from webToPdf import extract_main_content
+
+# 안쪽 내용을 별도의 번역 단위로 나누는 블록 요소
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'dd', 'details', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'section', 'summary', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+}
+
+# 번역하지 않고 그대로 두는 블록 요소 (코드 블록, 수식 등)
+SKIP_TAGS = {'math', 'pre', 'svg'}
+
+# 문장 안의 코드 요소 (문장과 함께 번역하되 코드만 있는 블록은 번역하지 않음)
+CODE_TAGS = {'code', 'kbd', 'samp', 'var'}
+
+# 렌더링할 문서에서 제거하는 요소
+REMOVE_TAGS = ['script', 'noscript', 'style', 'template', 'iframe', 'link', 'meta']
+
+
+def normalize_text(text):
+    return ' '.join(text.split())
+
+
+def _has_text(node):
+    if isinstance(node, NavigableString):
+        return not isinstance(node, Comment) and bool(node.strip())
+    return node.name not in SKIP_TAGS and bool(node.get_text().strip())
+
+
+def _run_text(nodes):
+    return normalize_text(''.join(node if isinstance(node, NavigableString) else node.get_text() for node in nodes))
+
+
+def _text_run(nodes):
+    # 인라인 노드 묶음에서 번역할 텍스트를 가진 노드 목록 (링크 하나만 있는 항목은 링크 안으로 들어가 링크를 보존)
+    text_nodes = [node for node in nodes if _has_text(node)]
+    while len(text_nodes) == 1 and isinstance(text_nodes[0], Tag) and text_nodes[0].name not in CODE_TAGS:
+        text_nodes = [node for node in text_nodes[0].children if _has_text(node)]
+    return text_nodes
+
+
+def iter_blocks(root):
+    # 문서 순서대로 (텍스트 노드 목록, 정규화한 텍스트)를 반환
+    # 블록 요소의 자식 중 연속된 인라인 노드들을 하나의 번역 단위로 묶음
+    run = []
+    for child in list(root.children):
+        if isinstance(child, Tag) and (child.name in BLOCK_TAGS or child.name in SKIP_TAGS):
+            if run:
+                yield from _flush_run(run)
+                run = []
+            if child.name in BLOCK_TAGS:
+                yield from iter_blocks(child)
+        elif not isinstance(child, Comment):
+            run.append(child)
+    if run:
+        yield from _flush_run(run)
+
+
+def _flush_run(run):
+    # 글자가 없는 블록(숫자, 기호)과 코드만 있는 블록은 건너뜀
+    text_nodes = _text_run(run)
+    if all(isinstance(node, Tag) and node.name in CODE_TAGS for node in text_nodes):
+        return
+    text = _run_text(text_nodes)
+    if any(ch.isalpha() for ch in text):
+        yield text_nodes, text
+
+
+class WebDocument:
+    # 본문 HTML과 번역할 블록 텍스트 목록만 보관하는 간단한 웹 페이지 표현
+    # (대상 언어별 렌더링이 서로의 트리를 바꾸지 않도록 렌더링할 때마다 본문 HTML을 다시 파싱)
+    def __init__(self, title, content_html, blocks):
+        self.title = title
+        self.content_html = content_html
+        self._blocks = blocks
+
+    @classmethod
+    def parse(cls, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        title = normalize_text(soup.title.get_text()) if soup.title else ''
+        # body가 없는 HTML 조각은 전체를 본문으로 사용
+        content = extract_main_content(soup) or soup
+        for tag in content.find_all(REMOVE_TAGS):
+            tag.decompose()
+        # WeasyPrint는 rel="attachment" 링크의 대상을 PDF에 첨부하므로 rel 속성을 모두 제거
+        for tag in content.find_all(rel=True):
+            del tag['rel']
+        if content.name == 'body':
+            # 렌더링할 문서의 body 안에 다시 넣으므로 본문 요소로 바꿈
+            content.name = 'div'
+        content_html = str(content)
+        blocks = [text for _, text in iter_blocks(BeautifulSoup(content_html, 'html.parser'))]
+        # 문서 제목(PDF 메타데이터)도 함께 번역
+        return cls(title, content_html, ([title] if title else []) + blocks)
+
+    def blocks(self):
+        return list(self._blocks)
+
+    def render(self, translations, target_language):
+        # 블록 텍스트만 번역문으로 바꾸고 나머지(이미지, 표 구조, 코드)는 원본 그대로 유지
+        root = BeautifulSoup(self.content_html, 'html.parser')
+        for text_nodes, text in iter_blocks(root):
+            translated = translations.get(text, text)
+            text_nodes[0].replace_with(NavigableString(translated))
+            for node in text_nodes[1:]:
+                node.extract()
+        title = html_module.escape(translations.get(self.title, self.title))
+        return (f'<html lang="{html_module.escape(target_language)}"><head><meta charset="utf-8">'
+                f'<title>{title}</title></head><body>{root}</body></html>')
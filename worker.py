@@ -0,0 +1,43 @@
+# 번역 작업 프로세스: 웹 프로세스와 같은 작업 데이터베이스에서 작업을 가져와 실행하고
+# 진행 상황은 메시지 큐(MESSAGE_QUEUE)를 통해 웹 프로세스에 접속한 브라우저로 전송
+# 사용법: JOB_RUNNER=worker MESSAGE_QUEUE=sqlite:///socketio_queue.sqlite3 python worker.py
+# (웹 프로세스도 같은 JOB_RUNNER, MESSAGE_QUEUE로 실행하고 업로드/결과 폴더와 데이터베이스를 공유해야 함)
+import eventlet
+eventlet.monkey_patch()
+import logging
+import os
+import signal
+
+# 파일 정리는 웹 프로세스가 담당하므로 작업 프로세스에서는 정리 작업을 시작하지 않음 (app을 불러오기 전에 설정)
+os.environ['FILE_SWEEPER'] = 'false'
+
+import app as web
+
+
+def main():
+    if not web.app.config['MESSAGE_QUEUE']:
+        logging.warning("MESSAGE_QUEUE is not set; progress from this worker will not reach browsers")
+
+    stopped = eventlet.Event()
+
+    def shutdown(signum, frame):
+        if not stopped.ready():
+            stopped.send(signum)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    web.job_scheduler.start()
+    logging.info(f"Worker {web.job_scheduler.worker_id} started "
+                 f"(max {web.app.config['MAX_CONCURRENT_JOBS']} concurrent jobs)")
+    signum = stopped.wait()
+
+    # 실행 중인 작업은 다시 큐에 넣어 다른 작업 프로세스가 이어서 처리
+    logging.info(f"Worker {web.job_scheduler.worker_id} stopping (signal {signum})")
+    web.job_scheduler.stop()
+    # 중단된 작업이 다시 큐에 들어갈 때까지 잠시 대기
+    eventlet.sleep(0.5)
+
+
+if __name__ == '__main__':
+    main()
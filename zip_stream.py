@@ -0,0 +1,76 @@
+# 스트리밍 ZIP: 여러 결과 파일을 디스크나 메모리에 ZIP을 만들지 않고 블록 단위로 압축하면서 바로 응답으로 내보냄
+# (되감을 수 없는 출력에 쓰면 zipfile이 항목마다 데이터 서술자를 붙이므로 크기를 미리 알 필요가 없음)
+import os
+import zipfile
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+# 이미 압축된 형식은 다시 압축하지 않고 그대로 저장
+STORED_EXTENSIONS = {'.pdf', '.zip', '.png', '.jpg', '.jpeg', '.gif', '.webp'}
+
+
+class _StreamBuffer:
+    # zipfile이 쓰는 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 출력 (seek을 지원하지 않음)
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def unique_names(names):
+    # ZIP 안에서 겹치는 이름은 "이름 (2).확장자"처럼 번호를 붙임
+    seen = set()
+    for name in names:
+        candidate = name
+        base, extension = os.path.splitext(name)
+        number = 2
+        while candidate in seen:
+            candidate = f'{base} ({number}){extension}'
+            number += 1
+        seen.add(candidate)
+        yield candidate
+
+
+def iter_zip(entries, block_size=READ_BLOCK_SIZE):
+    # entries: [(ZIP 안의 이름, 파일 경로)]; 원본을 block_size씩 읽어 압축한 ZIP 바이트를 차례로 반환
+    # 항목 하나를 쓰는 동안 모이는 데이터는 블록 하나 분량이므로 파일 수/크기와 관계없이 메모리 사용량이 일정
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, path in zip(unique_names([name for name, _ in entries]), [path for _, path in entries]):
+            info = zipfile.ZipInfo.from_file(path, name)
+            stored = os.path.splitext(name)[1].lower() in STORED_EXTENSIONS
+            info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            # 크기를 미리 알려서 4GB가 넘는 파일은 ZIP64 항목으로 씀
+            info.file_size = os.path.getsize(path)
+            with open(path, 'rb') as source, archive.open(info, 'w') as destination:
+                while True:
+                    block = source.read(block_size)
+                    if not block:
+                        break
+                    destination.write(block)
+                    yield from _drain(buffer)
+            yield from _drain(buffer)
+    # 중앙 디렉터리
+    yield from _drain(buffer)
+
+
+def _drain(buffer):
+    # 빈 조각은 청크 전송의 끝으로 해석될 수 있으므로 내보내지 않음
+    data = buffer.drain()
+    if data:
+        yield data